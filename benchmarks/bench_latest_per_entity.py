@@ -0,0 +1,83 @@
+"""
+Benchmark the latest-row-per-entity reduction used by materialization.
+
+Compares sort_values plus groupby.tail(1) with the hash-based kernel in
+ParquetOfflineStore on synthetic feature data.
+
+Usage:
+    python benchmarks/bench_latest_per_entity.py --rows 10000000 --entities 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from my_feast.offline_store.parquet_store import latest_row_positions
+
+
+def make_data(n_rows: int, n_entities: int, seed: int = 0) -> pd.DataFrame:
+    """Build unsorted feature rows with duplicate event timestamps"""
+    rng = np.random.default_rng(seed)
+    base = np.datetime64(datetime(2024, 1, 1), "ns")
+    return pd.DataFrame(
+        {
+            "driver_id": rng.integers(0, n_entities, n_rows),
+            "conv_rate": rng.random(n_rows).astype(np.float32),
+            "event_timestamp": base
+            + rng.integers(0, 30 * 24 * 3600, n_rows).astype("timedelta64[s]"),
+            "created": base + rng.integers(0, 3600, n_rows).astype("timedelta64[s]"),
+        }
+    )
+
+
+def sort_and_tail(df: pd.DataFrame) -> pd.DataFrame:
+    """The previous reduction"""
+    df = df.sort_values(["event_timestamp", "created"], kind="mergesort")
+    return df.groupby(["driver_id"]).tail(1)
+
+
+def hash_kernel(df: pd.DataFrame) -> pd.DataFrame:
+    """The hash-based reduction"""
+    return df.iloc[
+        latest_row_positions(df, ["driver_id"], "event_timestamp", "created")
+    ]
+
+
+def best_of(func, df: pd.DataFrame, repeat: int) -> float:
+    """Best wall time of several runs"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--entities", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_data(args.rows, args.entities)
+    expected = sort_and_tail(df).sort_index()
+    assert hash_kernel(df).index.equals(expected.index)
+
+    baseline = best_of(sort_and_tail, df, args.repeat)
+    kernel = best_of(hash_kernel, df, args.repeat)
+    print(f"rows={args.rows:,} entities={args.entities:,}")
+    print(f"sort_values + groupby.tail: {baseline:8.3f}s")
+    print(f"hash kernel:                {kernel:8.3f}s")
+    print(f"speedup:                    {baseline / kernel:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,10 +16,19 @@ class FeatureStoreConfig:
 
     project: str = "default_project"
     registry_path: str = "registry.db"
+    registry_cache_ttl_seconds: float = 10.0
     online_store_type: str = "memory"
     online_store_config: Optional[Dict[str, Any]] = None
     offline_store_type: str = "parquet"
     offline_store_config: Optional[Dict[str, Any]] = None
+    materialization_max_workers: Optional[int] = None
+    materialization_executor: str = "thread"
+    materialization_memory_budget_bytes: Optional[int] = None
+    serving_fan_out: str = "auto"
+    serving_max_workers: Optional[int] = None
+    # Opt-in micro-batching of concurrent online reads
+    serving_coalesce_window_us: Optional[float] = None
+    serving_coalesce_max_entities: int = 256
 
     def __post_init__(self):
         if self.online_store_config is None:
@@ -38,7 +47,15 @@ class FeatureStoreConfig:
 
         # Parse configuration
         project = config_data.get("project", "default_project")
-        registry_path = config_data.get("registry", "registry.db")
+
+        # Parse registry configuration (a path or a mapping with a path)
+        registry_config = config_data.get("registry", "registry.db")
+        if isinstance(registry_config, dict):
+            registry_path = registry_config.get("path", "registry.db")
+            registry_cache_ttl_seconds = registry_config.get("cache_ttl_seconds", 10.0)
+        else:
+            registry_path = registry_config
+            registry_cache_ttl_seconds = 10.0
 
         # Parse online store configuration
         online_store_config = config_data.get("online_store", {})
@@ -56,20 +73,41 @@ class FeatureStoreConfig:
             offline_store_type = "parquet"
             offline_store_config = {}
 
+        # Parse materialization configuration
+        materialization_config = config_data.get("materialization") or {}
+
+        # Parse online serving configuration
+        serving_config = config_data.get("serving") or {}
+
         return cls(
             project=project,
             registry_path=registry_path,
+            registry_cache_ttl_seconds=registry_cache_ttl_seconds,
             online_store_type=online_store_type,
             online_store_config=online_store_config,
             offline_store_type=offline_store_type,
             offline_store_config=offline_store_config,
+            materialization_max_workers=materialization_config.get("max_workers"),
+            materialization_executor=materialization_config.get("executor", "thread"),
+            materialization_memory_budget_bytes=materialization_config.get(
+                "memory_budget_bytes"
+            ),
+            serving_fan_out=serving_config.get("fan_out", "auto"),
+            serving_max_workers=serving_config.get("max_workers"),
+            serving_coalesce_window_us=serving_config.get("coalesce_window_us"),
+            serving_coalesce_max_entities=serving_config.get(
+                "coalesce_max_entities", 256
+            ),
         )
 
     def to_yaml(self, yaml_path: str) -> None:
         """Save configuration to YAML file"""
         config_data = {
             "project": self.project,
-            "registry": self.registry_path,
+            "registry": {
+                "path": self.registry_path,
+                "cache_ttl_seconds": self.registry_cache_ttl_seconds,
+            },
             "online_store": {
                 "type": self.online_store_type,
                 **self.online_store_config,
@@ -78,6 +116,17 @@ class FeatureStoreConfig:
                 "type": self.offline_store_type,
                 **self.offline_store_config,
             },
+            "materialization": {
+                "max_workers": self.materialization_max_workers,
+                "executor": self.materialization_executor,
+                "memory_budget_bytes": self.materialization_memory_budget_bytes,
+            },
+            "serving": {
+                "fan_out": self.serving_fan_out,
+                "max_workers": self.serving_max_workers,
+                "coalesce_window_us": self.serving_coalesce_window_us,
+                "coalesce_max_entities": self.serving_coalesce_max_entities,
+            },
         }
 
         with open(yaml_path, "w") as f:
@@ -88,10 +137,20 @@ class FeatureStoreConfig:
         return {
             "project": self.project,
             "registry_path": self.registry_path,
+            "registry_cache_ttl_seconds": self.registry_cache_ttl_seconds,
             "online_store_type": self.online_store_type,
             "online_store_config": self.online_store_config,
             "offline_store_type": self.offline_store_type,
             "offline_store_config": self.offline_store_config,
+            "materialization_max_workers": self.materialization_max_workers,
+            "materialization_executor": self.materialization_executor,
+            "materialization_memory_budget_bytes": (
+                self.materialization_memory_budget_bytes
+            ),
+            "serving_fan_out": self.serving_fan_out,
+            "serving_max_workers": self.serving_max_workers,
+            "serving_coalesce_window_us": self.serving_coalesce_window_us,
+            "serving_coalesce_max_entities": self.serving_coalesce_max_entities,
         }
 
     def validate(self) -> None:
@@ -102,16 +161,59 @@ class FeatureStoreConfig:
         if not self.registry_path:
             raise ValueError("Registry path cannot be empty")
 
-        supported_online_stores = ["memory", "redis", "sqlite"]
+        if self.registry_cache_ttl_seconds < 0:
+            raise ValueError("Registry cache TTL cannot be negative")
+
+        supported_online_stores = ["memory", "redis", "sqlite", "tiered"]
         if self.online_store_type not in supported_online_stores:
             raise ValueError(f"Unsupported online store type: {self.online_store_type}")
 
+        if self.online_store_type == "tiered":
+            l2_type = (self.online_store_config.get("l2") or {}).get("type", "sqlite")
+            if l2_type not in ("memory", "redis", "sqlite"):
+                raise ValueError(f"Unsupported tiered L2 store type: {l2_type}")
+            write_mode = self.online_store_config.get("write_mode", "through")
+            if write_mode not in ("through", "behind"):
+                raise ValueError(f"Unsupported tiered write mode: {write_mode}")
+
         supported_offline_stores = ["parquet", "bigquery", "spark"]
         if self.offline_store_type not in supported_offline_stores:
             raise ValueError(
                 f"Unsupported offline store type: {self.offline_store_type}"
             )
 
+        if self.materialization_executor not in ("thread", "process"):
+            raise ValueError(
+                f"Unsupported materialization executor: {self.materialization_executor}"
+            )
+
+        if (
+            self.materialization_max_workers is not None
+            and self.materialization_max_workers < 1
+        ):
+            raise ValueError("Materialization max_workers must be at least 1")
+
+        if (
+            self.materialization_memory_budget_bytes is not None
+            and self.materialization_memory_budget_bytes <= 0
+        ):
+            raise ValueError("Materialization memory budget must be positive")
+
+        if self.serving_fan_out not in ("auto", "thread", "sequential"):
+            raise ValueError(f"Unsupported serving fan-out: {self.serving_fan_out}")
+
+        if self.serving_max_workers is not None and self.serving_max_workers < 1:
+            raise ValueError("Serving max_workers must be at least 1")
+
+        if (
+            self.serving_coalesce_window_us is not None
+            and self.serving_coalesce_window_us < 0
+        ):
+            raise ValueError("Serving coalesce window cannot be negative")
+
+        if self.serving_coalesce_max_entities < 1:
+            raise ValueError("Serving coalesce_max_entities must be at least 1")
+
     def get_online_store_config(self, key: str, default: Any = None) -> Any:
         """Get online store configuration value"""
         return self.online_store_config.get(key, default)
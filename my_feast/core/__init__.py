@@ -7,6 +7,8 @@ from .feature import Feature
 from .feature_view import FeatureView
 from .feature_service import FeatureService
 from .feature_store import FeatureStore
+from .materialization import MaterializationError, MaterializationReport
+from .retrieval_plan import RetrievalPlan
 from .types import ValueType, FeatureReference
 
 __all__ = [
@@ -15,6 +17,9 @@ __all__ = [
     "FeatureView",
     "FeatureService",
     "FeatureStore",
+    "MaterializationError",
+    "MaterializationReport",
+    "RetrievalPlan",
     "ValueType",
     "FeatureReference",
 ]
@@ -0,0 +1,133 @@
+"""
+Micro-batching of concurrent online feature reads
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+from .retrieval_plan import RetrievalPlan
+
+ReadColumns = Callable[[RetrievalPlan, List[Dict[str, Any]]], Dict[str, np.ndarray]]
+
+
+def _validate_entity_rows(
+    plan: RetrievalPlan, entity_rows: List[Dict[str, Any]]
+) -> None:
+    """Check that every entity row has the join keys of the plan"""
+    for i, row in enumerate(entity_rows):
+        for join_key in plan.join_keys:
+            if join_key not in row:
+                raise ValueError(f"Entity row {i} missing join key '{join_key}'")
+
+
+class _Batch:
+    """Entity rows of the requests sharing one batched read"""
+
+    def __init__(self, plan: RetrievalPlan):
+        self.plan = plan
+        self.entity_rows: List[Dict[str, Any]] = []
+        self.requests = 0
+        # Set when the batch reaches the entity limit, to wake the leader early
+        self.full = threading.Event()
+        # Set once the values or the error are available
+        self.done = threading.Event()
+        self.values: Optional[Dict[str, np.ndarray]] = None
+        self.error: Optional[BaseException] = None
+
+
+class RequestCoalescer:
+    """
+    Coalesces concurrent online reads of the same retrieval plan.
+
+    The first request for a plan becomes the leader of a new batch: it waits
+    up to `window_seconds`, or until the batch holds `max_entities` entity
+    rows, while concurrent requests for the same plan append their rows.
+    The leader then reads the whole batch with one call to `read`, i.e. one
+    store read per feature view, and every request takes its own slice of
+    the columns. Requests of `max_entities` rows or more are read directly.
+    """
+
+    def __init__(self, read: ReadColumns, window_seconds: float, max_entities: int):
+        self._read = read
+        self.window_seconds = window_seconds
+        self.max_entities = max_entities
+        self._lock = threading.Lock()
+        # Open batches by plan identity; cached plans are shared by requests
+        self._open: Dict[int, _Batch] = {}
+        self._batches = 0
+        self._requests = 0
+        self._entities = 0
+
+    def read(
+        self, plan: RetrievalPlan, entity_rows: List[Dict[str, Any]]
+    ) -> Dict[str, np.ndarray]:
+        """Read the features of a plan for entity_rows, batched with others"""
+        # A malformed request must fail alone, not the batch it would join
+        _validate_entity_rows(plan, entity_rows)
+        if len(entity_rows) >= self.max_entities:
+            self._record(1, len(entity_rows))
+            return self._read(plan, entity_rows)
+
+        key = id(plan)
+        with self._lock:
+            # An open batch holds its plan, so the id cannot be reused
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = _Batch(plan)
+                self._open[key] = batch
+            start = len(batch.entity_rows)
+            batch.entity_rows.extend(entity_rows)
+            batch.requests += 1
+            if len(batch.entity_rows) >= self.max_entities:
+                # Later requests start a new batch
+                del self._open[key]
+                batch.full.set()
+
+        if leader:
+            self._lead(key, batch)
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        stop = start + len(entity_rows)
+        return {name: column[start:stop] for name, column in batch.values.items()}
+
+    def _lead(self, key: int, batch: _Batch) -> None:
+        """Close the batch after the window and read it for every request"""
+        batch.full.wait(self.window_seconds)
+        with self._lock:
+            if self._open.get(key) is batch:
+                del self._open[key]
+        # No request joins a closed batch, so its rows are final
+        try:
+            batch.values = self._read(batch.plan, batch.entity_rows)
+        except BaseException as e:
+            batch.error = e
+        finally:
+            self._record(batch.requests, len(batch.entity_rows))
+            batch.done.set()
+
+    def _record(self, requests: int, entities: int) -> None:
+        with self._lock:
+            self._batches += 1
+            self._requests += requests
+            self._entities += entities
+
+    def get_metadata(self) -> Dict[str, Any]:
+        """Batch counters and the mean number of requests per batch"""
+        with self._lock:
+            batches, requests, entities = (
+                self._batches,
+                self._requests,
+                self._entities,
+            )
+        return {
+            "window_us": self.window_seconds * 1e6,
+            "max_entities": self.max_entities,
+            "batches": batches,
+            "requests": requests,
+            "entities": entities,
+            "mean_requests_per_batch": requests / batches if batches else None,
+        }
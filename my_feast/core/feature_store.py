@@ -2,16 +2,33 @@
 FeatureStore class - Main API for the Feature Store
 """
 
+import asyncio
+import functools
 import os
-from typing import List, Optional, Dict, Any, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Dict, Any, Union
 from datetime import datetime
+import numpy as np
 import pandas as pd
 from .entity import Entity
 from .feature_view import FeatureView
 from .feature_service import FeatureService
 from .types import FeatureReference
+from .retrieval_plan import FeatureViewPlan, RetrievalPlan
+from .coalescing import RequestCoalescer
+from .materialization import (
+    MaterializationError,
+    MaterializationReport,
+    MaterializationScheduler,
+    pull_latest,
+    pull_latest_in_chunks,
+)
 from ..registry.sqlite_registry import SQLiteRegistry
 from ..online_store.memory_store import MemoryOnlineStore
+from ..online_store.sqlite_store import SqliteOnlineStore
+from ..online_store.redis_store import RedisOnlineStore
+from ..online_store.tiered_store import TieredOnlineStore
 from ..offline_store.parquet_store import ParquetOfflineStore
 from ..config.config import FeatureStoreConfig
 
@@ -21,6 +38,9 @@ class FeatureStore:
     Main Feature Store class that provides the primary API for feature operations.
     """
 
+    # Compiled retrieval plans kept before the cache is reset
+    MAX_RETRIEVAL_PLANS = 1024
+
     def __init__(
         self,
         repo_path: Optional[str] = None,
@@ -45,6 +65,22 @@ class FeatureStore:
             else:
                 self.config = FeatureStoreConfig()
 
+        # Feature views this instance has incrementally materialized
+        self._materialized_views: set = set()
+        # Retrieval plans by feature list or feature service
+        self._retrieval_plans: Dict[Any, RetrievalPlan] = {}
+        # Pool for concurrent feature view reads, created on first use
+        self._serving_pool: Optional[ThreadPoolExecutor] = None
+        self._serving_pool_lock = threading.Lock()
+        # Micro-batching of concurrent online reads, when configured
+        self._coalescer: Optional[RequestCoalescer] = None
+        if self.config.serving_coalesce_window_us is not None:
+            self._coalescer = RequestCoalescer(
+                self._read_online_columns,
+                window_seconds=self.config.serving_coalesce_window_us / 1e6,
+                max_entities=self.config.serving_coalesce_max_entities,
+            )
+
         # Initialize components
         self._init_registry()
         self._init_online_store()
@@ -53,16 +89,58 @@ class FeatureStore:
     def _init_registry(self):
         """Initialize the registry"""
         registry_path = os.path.join(self.repo_path, self.config.registry_path)
-        self.registry = SQLiteRegistry(registry_path)
+        self.registry = SQLiteRegistry(
+            registry_path, cache_ttl_seconds=self.config.registry_cache_ttl_seconds
+        )
 
     def _init_online_store(self):
         """Initialize the online store"""
-        if self.config.online_store_type == "memory":
-            self.online_store = MemoryOnlineStore()
-        else:
-            raise ValueError(
-                f"Unsupported online store type: {self.config.online_store_type}"
+        self.online_store = self._create_online_store(
+            self.config.online_store_type, self.config.online_store_config
+        )
+
+    def _create_online_store(self, store_type: str, options: Dict[str, Any]):
+        """Create an online store of a type from its configuration options"""
+        get = options.get
+        if store_type == "memory":
+            snapshot_path = get("snapshot_path")
+            if snapshot_path:
+                snapshot_path = os.path.join(self.repo_path, snapshot_path)
+            max_entities = get("max_entities_per_feature_view")
+            max_bytes = get("max_bytes_per_feature_view")
+            return MemoryOnlineStore(
+                snapshot_path=snapshot_path,
+                max_entities=int(max_entities) if max_entities else None,
+                max_bytes=int(max_bytes) if max_bytes else None,
+                eviction_policy=get("eviction_policy", "lru"),
+            )
+        elif store_type == "sqlite":
+            path = get("path", "online_store.db")
+            return SqliteOnlineStore(os.path.join(self.repo_path, path))
+        elif store_type == "redis":
+            return RedisOnlineStore(
+                host=get("host", "localhost"),
+                port=int(get("port", 6379)),
+                db=int(get("db", 0)),
+                password=get("password"),
+                key_prefix=get("key_prefix", self.config.project),
+                max_connections=int(get("max_connections", 16)),
+            )
+        elif store_type == "tiered":
+            l2_options = get("l2") or {}
+            negative_ttl = get("negative_cache_ttl_seconds", 60.0)
+            return TieredOnlineStore(
+                l1=self._create_online_store("memory", get("l1") or {}),
+                l2=self._create_online_store(
+                    l2_options.get("type", "sqlite"), l2_options
+                ),
+                write_mode=get("write_mode", "through"),
+                negative_cache_ttl_seconds=(
+                    float(negative_ttl) if negative_ttl else None
+                ),
             )
+        else:
+            raise ValueError(f"Unsupported online store type: {store_type}")
 
     def _init_offline_store(self):
         """Initialize the offline store"""
@@ -80,15 +158,89 @@ class FeatureStore:
         Args:
             objects: List of objects to apply
         """
-        for obj in objects:
-            if isinstance(obj, Entity):
-                self.registry.apply_entity(obj)
-            elif isinstance(obj, FeatureView):
-                self.registry.apply_feature_view(obj)
-            elif isinstance(obj, FeatureService):
-                self.registry.apply_feature_service(obj)
+        self.registry.apply_objects(objects)
+
+    def _get_feature_refs(
+        self, features: List[str], feature_service: Optional[FeatureService] = None
+    ) -> List[FeatureReference]:
+        """Resolve feature strings or a feature service into feature references"""
+        if feature_service:
+            # Use feature service to get features
+            return feature_service.get_feature_references()
+
+        # Parse feature references from strings
+        feature_refs = []
+        for feature_str in features:
+            if ":" in feature_str:
+                fv_name, f_name = feature_str.split(":", 1)
+                feature_refs.append(
+                    FeatureReference(feature_view_name=fv_name, feature_name=f_name)
+                )
             else:
-                raise ValueError(f"Unsupported object type: {type(obj)}")
+                raise ValueError(f"Invalid feature format: {feature_str}")
+        return feature_refs
+
+    def get_retrieval_plan(
+        self, features: List[str], feature_service: Optional[FeatureService] = None
+    ) -> RetrievalPlan:
+        """
+        Get the compiled plan for a feature list or feature service.
+
+        Plans are cached by the feature list, or by the feature service
+        name, and reused while the registry version is unchanged, so planning
+        a repeated request is a dictionary lookup. A feature service plan is
+        also checked against the features of the service passed in, so equal
+        services rebuilt per request share one plan.
+        """
+        key = _plan_key(features, feature_service)
+        plan = self._cached_plan(key, self.registry.get_version(), feature_service)
+        if plan is not None:
+            return plan
+
+        plan = RetrievalPlan.compile(
+            self._get_feature_refs(features, feature_service), self.registry
+        )
+        if len(self._retrieval_plans) >= self.MAX_RETRIEVAL_PLANS:
+            self._retrieval_plans.clear()
+        self._retrieval_plans[key] = plan
+        return plan
+
+    def _cached_plan(
+        self,
+        key: tuple,
+        version: int,
+        feature_service: Optional[FeatureService],
+    ) -> Optional[RetrievalPlan]:
+        """The cached plan for key if it was compiled at this registry version"""
+        plan = self._retrieval_plans.get(key)
+        if plan is None or plan.registry_version != version:
+            return None
+        # Services are cached by name; one with other features needs its own
+        if (
+            feature_service is not None
+            and plan.feature_refs != feature_service.get_feature_references()
+        ):
+            return None
+        return plan
+
+    async def _get_retrieval_plan_async(
+        self, features: List[str], feature_service: Optional[FeatureService]
+    ) -> RetrievalPlan:
+        """
+        Get the plan without registry I/O on the event loop.
+
+        A cached plan is reused when the registry knows its version without
+        I/O; otherwise the plan is resolved in a worker thread.
+        """
+        version = self.registry.get_cached_version()
+        if version is not None:
+            key = _plan_key(features, feature_service)
+            plan = self._cached_plan(key, version, feature_service)
+            if plan is not None:
+                return plan
+        return await asyncio.to_thread(
+            self.get_retrieval_plan, features, feature_service
+        )
 
     def get_online_features(
         self,
@@ -99,6 +251,9 @@ class FeatureStore:
         """
         Get online features for real-time inference.
 
+        Feature views are read as in `get_online_features_dict`, and their
+        columns are placed next to the entity rows by position.
+
         Args:
             features: List of feature references in format "feature_view:feature_name"
             entity_rows: List of entity key-value pairs
@@ -107,52 +262,172 @@ class FeatureStore:
         Returns:
             DataFrame with entity keys and feature values
         """
-        if feature_service:
-            # Use feature service to get features
-            feature_refs = feature_service.get_feature_references()
-        else:
-            # Parse feature references from strings
-            feature_refs = []
-            for feature_str in features:
-                if ":" in feature_str:
-                    fv_name, f_name = feature_str.split(":", 1)
-                    feature_refs.append(
-                        FeatureReference(feature_view_name=fv_name, feature_name=f_name)
-                    )
-                else:
-                    raise ValueError(f"Invalid feature format: {feature_str}")
-
-        # Group features by feature view
-        fv_features = {}
-        for ref in feature_refs:
-            if ref.feature_view_name not in fv_features:
-                fv_features[ref.feature_view_name] = []
-            fv_features[ref.feature_view_name].append(ref.feature_name)
-
-        # Get features from each feature view
-        result_df = pd.DataFrame(entity_rows)
-
-        for fv_name, feature_names in fv_features.items():
-            # Get feature view from registry
-            feature_view = self.registry.get_feature_view(fv_name)
-            if not feature_view:
-                raise ValueError(f"Feature view '{fv_name}' not found")
-
-            # Read features from online store
-            fv_df = self.online_store.read_features(
-                feature_view=feature_view,
+        plan = self.get_retrieval_plan(features, feature_service)
+        return _online_dataframe(
+            entity_rows, self._serve_online_columns(plan, entity_rows)
+        )
+
+    async def get_online_features_async(
+        self,
+        features: List[str],
+        entity_rows: List[Dict[str, Any]],
+        feature_service: Optional[FeatureService] = None,
+    ) -> pd.DataFrame:
+        """
+        Async variant of `get_online_features`.
+
+        Feature views are read concurrently on the running event loop with
+        OnlineStore.read_feature_columns_async, so concurrent requests share
+        the loop instead of each holding a thread.
+        """
+        plan = await self._get_retrieval_plan_async(features, feature_service)
+        values = await self._read_online_columns_async(plan, entity_rows)
+        return _online_dataframe(entity_rows, values)
+
+    def _fan_out_pool(self) -> Optional[ThreadPoolExecutor]:
+        """Thread pool for concurrent feature view reads, None to read in turn"""
+        fan_out = self.config.serving_fan_out
+        if fan_out == "sequential" or (
+            fan_out == "auto" and isinstance(self.online_store, MemoryOnlineStore)
+        ):
+            # In-process reads finish faster than a thread hand-off
+            return None
+        with self._serving_pool_lock:
+            if self._serving_pool is None:
+                self._serving_pool = ThreadPoolExecutor(
+                    max_workers=self.config.serving_max_workers
+                    or min(32, os.cpu_count() or 1),
+                    thread_name_prefix="online-fan-out",
+                )
+            return self._serving_pool
+
+    def _serve_online_columns(
+        self, plan: RetrievalPlan, entity_rows: List[Dict[str, Any]]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Read the features of a synchronous online request.
+
+        With ``serving.coalesce_window_us`` set, concurrent requests for the
+        same features are micro-batched into one read per feature view.
+        """
+        if self._coalescer is None:
+            return self._read_online_columns(plan, entity_rows)
+        return self._coalescer.read(plan, entity_rows)
+
+    def _read_online_columns(
+        self, plan: RetrievalPlan, entity_rows: List[Dict[str, Any]]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Read the features of a plan, one array per feature in entity row order.
+
+        With more than one feature view, reads are issued concurrently on the
+        fan-out pool, so a request to a remote or disk-backed store takes as
+        long as its slowest view rather than the sum of all views.
+        """
+
+        def read(view: FeatureViewPlan) -> Dict[str, np.ndarray]:
+            return self.online_store.read_feature_columns(
+                feature_view=view.feature_view,
                 entity_rows=entity_rows,
-                feature_names=feature_names,
+                feature_names=view.feature_names,
             )
 
-            # Merge with result
-            if not fv_df.empty:
-                join_keys = feature_view.get_join_keys()
-                result_df = result_df.merge(
-                    fv_df[join_keys + feature_names], on=join_keys, how="left"
+        pool = self._fan_out_pool() if len(plan.views) > 1 else None
+        if pool is None:
+            results = [read(view) for view in plan.views]
+        else:
+            futures = [pool.submit(read, view) for view in plan.views]
+            results = [future.result() for future in futures]
+
+        return _assemble_columns(plan, results)
+
+    async def _read_online_columns_async(
+        self, plan: RetrievalPlan, entity_rows: List[Dict[str, Any]]
+    ) -> Dict[str, np.ndarray]:
+        """Async variant of `_read_online_columns`, gathering the view reads"""
+        results = await asyncio.gather(
+            *(
+                self.online_store.read_feature_columns_async(
+                    feature_view=view.feature_view,
+                    entity_rows=entity_rows,
+                    feature_names=view.feature_names,
                 )
+                for view in plan.views
+            )
+        )
+        return _assemble_columns(plan, results)
+
+    def get_online_features_dict(
+        self,
+        features: List[str],
+        entity_rows: List[Dict[str, Any]],
+        feature_service: Optional[FeatureService] = None,
+        as_numpy: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Get online features as columns without building any DataFrame.
+
+        This is the low-latency path for small requests: every feature view is
+        read with OnlineStore.read_feature_columns and its arrays are placed
+        next to the entity key columns in entity row order.
 
-        return result_df
+        Args:
+            features: List of feature references in format "feature_view:feature_name"
+            entity_rows: List of entity key-value pairs
+            feature_service: Optional feature service to use
+            as_numpy: Return NumPy arrays instead of lists
+
+        Returns:
+            Dict mapping entity key and feature names to column values
+        """
+        plan = self.get_retrieval_plan(features, feature_service)
+        values = self._serve_online_columns(plan, entity_rows)
+        return _online_dict(entity_rows, values, as_numpy)
+
+    async def get_online_features_dict_async(
+        self,
+        features: List[str],
+        entity_rows: List[Dict[str, Any]],
+        feature_service: Optional[FeatureService] = None,
+        as_numpy: bool = False,
+    ) -> Dict[str, Any]:
+        """Async variant of `get_online_features_dict`"""
+        plan = await self._get_retrieval_plan_async(features, feature_service)
+        values = await self._read_online_columns_async(plan, entity_rows)
+        return _online_dict(entity_rows, values, as_numpy)
+
+    def _get_push_view(self, feature_view_name: str) -> FeatureView:
+        """Resolve the online feature view a push writes to"""
+        fv = self.registry.get_feature_view(feature_view_name)
+        if not fv:
+            raise ValueError(f"Feature view '{feature_view_name}' not found")
+        if not fv.online:
+            raise ValueError(f"Feature view '{feature_view_name}' is not online")
+        return fv
+
+    def push(self, feature_view_name: str, df: pd.DataFrame) -> None:
+        """
+        Write fresh feature rows straight to the online store.
+
+        Args:
+            feature_view_name: Name of an online feature view
+            df: Rows with the join keys, timestamp field and features of the view
+        """
+        fv = self._get_push_view(feature_view_name)
+        self.online_store.write_features(
+            feature_view=fv, df=df, timestamp=datetime.now()
+        )
+
+    async def push_async(self, feature_view_name: str, df: pd.DataFrame) -> None:
+        """Async variant of `push`, using OnlineStore.write_features_async"""
+        if self.registry.get_cached_version() is not None:
+            fv = self._get_push_view(feature_view_name)
+        else:
+            # The registry must be reloaded, which is blocking I/O
+            fv = await asyncio.to_thread(self._get_push_view, feature_view_name)
+        await self.online_store.write_features_async(
+            feature_view=fv, df=df, timestamp=datetime.now()
+        )
 
     def get_historical_features(
         self,
@@ -171,110 +446,196 @@ class FeatureStore:
         Returns:
             DataFrame with entity keys, timestamps, and feature values
         """
-        if feature_service:
-            # Use feature service to get features
-            feature_refs = feature_service.get_feature_references()
-        else:
-            # Parse feature references from strings
-            feature_refs = []
-            for feature_str in features:
-                if ":" in feature_str:
-                    fv_name, f_name = feature_str.split(":", 1)
-                    feature_refs.append(
-                        FeatureReference(feature_view_name=fv_name, feature_name=f_name)
-                    )
-                else:
-                    raise ValueError(f"Invalid feature format: {feature_str}")
-
-        # Get unique feature view names
-        fv_names = list(set(ref.feature_view_name for ref in feature_refs))
-
-        # Get feature views from registry
-        feature_views = []
-        for fv_name in fv_names:
-            fv = self.registry.get_feature_view(fv_name)
-            if not fv:
-                raise ValueError(f"Feature view '{fv_name}' not found")
-            feature_views.append(fv)
+        plan = self.get_retrieval_plan(features, feature_service)
 
         # Get historical features from offline store
         return self.offline_store.get_historical_features(
-            entity_df=entity_df, feature_views=feature_views, feature_refs=feature_refs
+            entity_df=entity_df,
+            feature_views=plan.feature_views,
+            feature_refs=plan.feature_refs,
+        )
+
+    def _get_feature_views_to_materialize(
+        self, feature_views: Optional[List[str]]
+    ) -> List[FeatureView]:
+        """Resolve feature view names, keeping only online feature views"""
+        if feature_views:
+            fvs = []
+            for fv_name in feature_views:
+                fv = self.registry.get_feature_view(fv_name)
+                if not fv:
+                    raise ValueError(f"Feature view '{fv_name}' not found")
+                fvs.append(fv)
+        else:
+            fvs = self.registry.list_feature_views()
+
+        # Only materialize online feature views
+        return [fv for fv in fvs if fv.online]
+
+    def _run_materialization(
+        self,
+        fvs: List[FeatureView],
+        pull: Callable[[FeatureView], Union[pd.DataFrame, Iterable[pd.DataFrame]]],
+        write: Callable[[FeatureView, Iterator[pd.DataFrame]], int],
+    ) -> MaterializationReport:
+        """Run materializations on the configured scheduler"""
+        scheduler = MaterializationScheduler(
+            max_workers=self.config.materialization_max_workers,
+            executor=self.config.materialization_executor,
+            memory_budget_bytes=self.config.materialization_memory_budget_bytes,
         )
+        report = scheduler.run(fvs, pull, write)
+        # Views that did materialize are kept even if others failed
+        self._save_online_snapshot()
+        if report.failed:
+            raise MaterializationError(report)
+        return report
+
+    def _save_online_snapshot(self) -> None:
+        """Save a memory online store that has a snapshot path configured"""
+        store = self.online_store
+        if isinstance(store, MemoryOnlineStore) and store.snapshot_path:
+            store.save_snapshot()
 
     def materialize_incremental(
         self, end_date: datetime, feature_views: Optional[List[str]] = None
-    ) -> None:
+    ) -> MaterializationReport:
         """
         Materialize incremental features to online store.
 
+        Each feature view only reads the rows after the watermark left by its
+        previous incremental run, i.e. ``(last_watermark, end_date]``; the
+        first run reads the full history. The watermark advances to
+        ``end_date`` once the view has been written to the online store.
+        Watermarks are ignored for an online store that does not persist
+        (the memory store) until this instance has materialized the view, as
+        the data they describe was lost with the previous process.
+
+        Feature views are materialized concurrently; a failing view does not
+        stop the others, and MaterializationError is raised at the end with
+        the report attached.
+
         Args:
             end_date: End date for materialization
             feature_views: List of feature view names to materialize (all if None)
+
+        Returns:
+            Report with the outcome and timings of each feature view
         """
-        # Get feature views to materialize
-        if feature_views:
-            fvs = []
-            for fv_name in feature_views:
-                fv = self.registry.get_feature_view(fv_name)
-                if not fv:
-                    raise ValueError(f"Feature view '{fv_name}' not found")
+        fvs = []
+        watermarks = {}
+        for fv in self._get_feature_views_to_materialize(feature_views):
+            watermark = self._get_watermark(fv)
+            if watermark is None or watermark < end_date:
                 fvs.append(fv)
-        else:
-            fvs = self.registry.list_feature_views()
+                watermarks[fv.name] = watermark
 
-        # Materialize each feature view
-        for fv in fvs:
-            if fv.online:  # Only materialize online feature views
-                # Get latest features from offline store
-                df = self.offline_store.pull_latest_from_table_or_query(
-                    feature_view=fv, end_date=end_date
-                )
+        def write(fv: FeatureView, chunks: Iterator[pd.DataFrame]) -> int:
+            rows_written = 0
+            for df in chunks:
+                if watermarks[fv.name] is not None:
+                    df = self._rows_after_watermark(fv, df, watermarks[fv.name])
 
                 # Write to online store
                 if not df.empty:
                     self.online_store.write_features(
                         feature_view=fv, df=df, timestamp=end_date
                     )
+                    rows_written += len(df)
+
+            # Queued writes must reach the persistent tier before the watermark moves
+            if isinstance(self.online_store, TieredOnlineStore):
+                self.online_store.flush()
+            self.registry.set_materialization_watermark(fv.name, end_date)
+            self._materialized_views.add(fv.name)
+            return rows_written
+
+        pull = _IncrementalPull(
+            self.offline_store,
+            watermarks,
+            end_date,
+            stream=self.config.materialization_executor == "thread",
+        )
+        return self._run_materialization(fvs, pull, write)
+
+    def _get_watermark(self, feature_view: FeatureView) -> Optional[datetime]:
+        """Watermark of a view, None if the online store lost the data behind it"""
+        if (
+            not self.online_store.persistent
+            and feature_view.name not in self._materialized_views
+        ):
+            return None
+        return self.registry.get_materialization_watermark(feature_view.name)
+
+    def _rows_after_watermark(
+        self, feature_view: FeatureView, df: pd.DataFrame, watermark: datetime
+    ) -> pd.DataFrame:
+        """
+        Drop rows at or before the watermark.
+
+        Source reads include their start date, so rows stamped exactly at the
+        watermark come back although the previous run already wrote them.
+        """
+        timestamp_field = feature_view.source.timestamp_field
+        if not timestamp_field or timestamp_field not in df.columns or df.empty:
+            return df
+
+        timestamps = pd.to_datetime(df[timestamp_field])
+        bound = pd.Timestamp(watermark)
+        if timestamps.dt.tz is not None:
+            if bound.tzinfo is None:
+                bound = bound.tz_localize("UTC")
+            bound = bound.tz_convert(timestamps.dt.tz)
+        elif bound.tzinfo is not None:
+            bound = bound.tz_convert("UTC").tz_localize(None)
+        return df[(timestamps > bound).to_numpy()]
 
     def materialize(
         self,
         start_date: datetime,
         end_date: datetime,
         feature_views: Optional[List[str]] = None,
-    ) -> None:
+    ) -> MaterializationReport:
         """
         Materialize features to online store for a date range.
 
+        Feature views are materialized concurrently; a failing view does not
+        stop the others, and MaterializationError is raised at the end with
+        the report attached.
+
         Args:
             start_date: Start date for materialization
             end_date: End date for materialization
             feature_views: List of feature view names to materialize (all if None)
-        """
-        # Get feature views to materialize
-        if feature_views:
-            fvs = []
-            for fv_name in feature_views:
-                fv = self.registry.get_feature_view(fv_name)
-                if not fv:
-                    raise ValueError(f"Feature view '{fv_name}' not found")
-                fvs.append(fv)
-        else:
-            fvs = self.registry.list_feature_views()
 
-        # Materialize each feature view
-        for fv in fvs:
-            if fv.online:  # Only materialize online feature views
-                # Get features from offline store
-                df = self.offline_store.pull_latest_from_table_or_query(
-                    feature_view=fv, start_date=start_date, end_date=end_date
-                )
+        Returns:
+            Report with the outcome and timings of each feature view
+        """
+        fvs = self._get_feature_views_to_materialize(feature_views)
 
+        def write(fv: FeatureView, chunks: Iterator[pd.DataFrame]) -> int:
+            rows_written = 0
+            for df in chunks:
                 # Write to online store
                 if not df.empty:
                     self.online_store.write_features(
                         feature_view=fv, df=df, timestamp=end_date
                     )
+                    rows_written += len(df)
+            return rows_written
+
+        # Stream chunks unless the read has to cross a process boundary
+        pull = functools.partial(
+            (
+                pull_latest_in_chunks
+                if self.config.materialization_executor == "thread"
+                else pull_latest
+            ),
+            self.offline_store,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return self._run_materialization(fvs, pull, write)
 
     def list_entities(self) -> List[Entity]:
         """List all entities in the registry"""
@@ -302,6 +663,10 @@ class FeatureStore:
 
     def teardown(self) -> None:
         """Clean up feature store resources"""
+        with self._serving_pool_lock:
+            if self._serving_pool is not None:
+                self._serving_pool.shutdown()
+                self._serving_pool = None
         self.registry.teardown()
         self.online_store.teardown()
 
@@ -312,4 +677,71 @@ class FeatureStore:
             "config": self.config.to_dict(),
             "registry": self.registry.get_metadata(),
             "online_store": self.online_store.get_metadata(),
+            "coalescer": self._coalescer.get_metadata() if self._coalescer else None,
         }
+
+
+def _plan_key(features: List[str], feature_service: Optional[FeatureService]) -> tuple:
+    """Key of the retrieval plan cache for a feature list or feature service"""
+    if feature_service:
+        return ("feature_service", feature_service.name)
+    return ("features", tuple(features))
+
+
+def _assemble_columns(
+    plan: RetrievalPlan, results: List[Dict[str, np.ndarray]]
+) -> Dict[str, np.ndarray]:
+    """Merge the columns read for each view of a plan, in plan order"""
+    values = {}
+    for view, view_values in zip(plan.views, results):
+        for feature_name, output_name in zip(view.feature_names, view.output_names):
+            values[output_name] = view_values[feature_name]
+    return values
+
+
+def _online_dataframe(
+    entity_rows: List[Dict[str, Any]], values: Dict[str, np.ndarray]
+) -> pd.DataFrame:
+    """Place feature columns next to the entity rows"""
+    # Store columns are aligned with entity_rows, so no join is needed
+    result_df = pd.DataFrame(entity_rows)
+    for feature_name, column in values.items():
+        result_df[feature_name] = column
+    return result_df
+
+
+def _online_dict(
+    entity_rows: List[Dict[str, Any]],
+    values: Dict[str, np.ndarray],
+    as_numpy: bool,
+) -> Dict[str, Any]:
+    """Entity key columns followed by feature columns, as lists or arrays"""
+    key_names = dict.fromkeys(key for row in entity_rows for key in row)
+    result = {}
+    for key_name in key_names:
+        column = [row.get(key_name) for row in entity_rows]
+        result[key_name] = np.asarray(column) if as_numpy else column
+
+    for feature_name, column in values.items():
+        result[feature_name] = column if as_numpy else column.tolist()
+    return result
+
+
+class _IncrementalPull:
+    """Pull step of an incremental materialization; picklable for process pools"""
+
+    def __init__(
+        self,
+        offline_store: Any,
+        watermarks: Dict[str, Optional[datetime]],
+        end_date: datetime,
+        stream: bool = True,
+    ):
+        self.offline_store = offline_store
+        self.watermarks = watermarks
+        self.end_date = end_date
+        self.stream = stream
+
+    def __call__(self, fv: FeatureView) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        pull = pull_latest_in_chunks if self.stream else pull_latest
+        return pull(self.offline_store, fv, self.watermarks[fv.name], self.end_date)
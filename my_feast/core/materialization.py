@@ -0,0 +1,251 @@
+"""
+Materialization scheduling for the Feature Store
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Union
+import pandas as pd
+from .feature_view import FeatureView
+from ..offline_store.base import OfflineStore
+
+
+def pull_latest(
+    offline_store: OfflineStore,
+    feature_view: FeatureView,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> pd.DataFrame:
+    """Pull the latest rows of a feature view; picklable for process pools"""
+    return offline_store.pull_latest_from_table_or_query(
+        feature_view=feature_view, start_date=start_date, end_date=end_date
+    )
+
+
+def pull_latest_in_chunks(
+    offline_store: OfflineStore,
+    feature_view: FeatureView,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    chunk_size: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """Stream the latest rows of a feature view in chunks"""
+    return offline_store.pull_latest_in_chunks(
+        feature_view, start_date=start_date, end_date=end_date, chunk_size=chunk_size
+    )
+
+
+def _timed(chunks: Iterable[pd.DataFrame], elapsed: List[float]):
+    """Iterate over chunks, adding the time spent producing them to elapsed[0]"""
+    iterator = iter(chunks)
+    while True:
+        start = time.perf_counter()
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            elapsed[0] += time.perf_counter() - start
+            return
+        elapsed[0] += time.perf_counter() - start
+        yield chunk
+
+
+@dataclass
+class FeatureViewMaterialization:
+    """Outcome of materializing one feature view"""
+
+    feature_view_name: str
+    status: str = "pending"
+    rows_written: int = 0
+    read_seconds: float = 0.0
+    write_seconds: float = 0.0
+    error: Optional[Exception] = None
+
+    @property
+    def total_seconds(self) -> float:
+        return self.read_seconds + self.write_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the outcome to a dictionary"""
+        return {
+            "feature_view_name": self.feature_view_name,
+            "status": self.status,
+            "rows_written": self.rows_written,
+            "read_seconds": self.read_seconds,
+            "write_seconds": self.write_seconds,
+            "error": repr(self.error) if self.error else None,
+        }
+
+
+@dataclass
+class MaterializationReport:
+    """Per-view outcomes of a materialization run"""
+
+    results: List[FeatureViewMaterialization] = field(default_factory=list)
+    total_seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> List[str]:
+        return [r.feature_view_name for r in self.results if r.status == "succeeded"]
+
+    @property
+    def failed(self) -> List[str]:
+        return [r.feature_view_name for r in self.results if r.status == "failed"]
+
+    def get(self, feature_view_name: str) -> Optional[FeatureViewMaterialization]:
+        """Get the outcome for a feature view"""
+        for result in self.results:
+            if result.feature_view_name == feature_view_name:
+                return result
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the report to a dictionary"""
+        return {
+            "total_seconds": self.total_seconds,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "feature_views": [r.to_dict() for r in self.results],
+        }
+
+
+class MaterializationError(Exception):
+    """Raised after a run in which at least one feature view failed"""
+
+    def __init__(self, report: MaterializationReport):
+        self.report = report
+        errors = ", ".join(
+            f"{r.feature_view_name}: {r.error!r}"
+            for r in report.results
+            if r.status == "failed"
+        )
+        super().__init__(f"Materialization failed for {errors}")
+
+
+class _MemoryBudget:
+    """Admits work while the estimated bytes in flight stay under a limit"""
+
+    def __init__(self, limit_bytes: Optional[int]):
+        self.limit_bytes = limit_bytes
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, nbytes: int) -> None:
+        if self.limit_bytes is None:
+            return
+        with self._condition:
+            # A view larger than the whole budget still runs, but alone
+            while self._in_flight and self._in_flight + nbytes > self.limit_bytes:
+                self._condition.wait()
+            self._in_flight += nbytes
+
+    def release(self, nbytes: int) -> None:
+        if self.limit_bytes is None:
+            return
+        with self._condition:
+            self._in_flight -= nbytes
+            self._condition.notify_all()
+
+
+class MaterializationScheduler:
+    """
+    Runs feature view materializations concurrently.
+
+    Every view is read and written by its own task on a pool of
+    `max_workers` threads. A pull may return a dataframe or an iterator of
+    chunks, which is streamed into the write step. With
+    ``executor="process"`` the read (source scan and latest-per-entity
+    reduction) runs in a process pool instead and must return a dataframe;
+    the result is written to the online store from the parent process. When
+    `memory_budget_bytes` is set, a view only starts while the on-disk size
+    estimates of the views in flight fit in the budget. A failing view is
+    recorded in the report and does not stop the others.
+    """
+
+    SUPPORTED_EXECUTORS = ("thread", "process")
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        executor: str = "thread",
+        memory_budget_bytes: Optional[int] = None,
+    ):
+        if executor not in self.SUPPORTED_EXECUTORS:
+            raise ValueError(f"Unsupported materialization executor: {executor}")
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers or min(32, os.cpu_count() or 1)
+        self.executor = executor
+        self.memory_budget_bytes = memory_budget_bytes
+
+    def run(
+        self,
+        feature_views: List[FeatureView],
+        pull: Callable[[FeatureView], Union[pd.DataFrame, Iterable[pd.DataFrame]]],
+        write: Callable[[FeatureView, Iterator[pd.DataFrame]], int],
+    ) -> MaterializationReport:
+        """
+        Materialize feature views.
+
+        Args:
+            feature_views: Feature views to materialize
+            pull: Reads the rows to materialize for a view; must be picklable
+                for the process executor
+            write: Writes the pulled chunks and returns the number of rows
+                written
+        """
+        start = time.perf_counter()
+        budget = _MemoryBudget(self.memory_budget_bytes)
+        results = [FeatureViewMaterialization(fv.name) for fv in feature_views]
+        workers = max(1, min(self.max_workers, len(feature_views)))
+
+        process_pool = (
+            ProcessPoolExecutor(max_workers=workers)
+            if self.executor == "process" and feature_views
+            else None
+        )
+
+        def materialize_one(fv: FeatureView, result: FeatureViewMaterialization):
+            reserved = 0
+            try:
+                # A failing size estimate fails this view only
+                nbytes = fv.source.estimate_size_bytes() or 0
+                budget.acquire(nbytes)
+                reserved = nbytes
+                read_start = time.perf_counter()
+                if process_pool is not None:
+                    pulled = process_pool.submit(pull, fv).result()
+                else:
+                    pulled = pull(fv)
+                if isinstance(pulled, pd.DataFrame):
+                    pulled = [pulled]
+                result.read_seconds = time.perf_counter() - read_start
+
+                # A stream is read while it is written; keep the two times apart
+                streamed_seconds = [0.0]
+                write_start = time.perf_counter()
+                result.rows_written = write(fv, _timed(pulled, streamed_seconds))
+                result.read_seconds += streamed_seconds[0]
+                result.write_seconds = (
+                    time.perf_counter() - write_start - streamed_seconds[0]
+                )
+                result.status = "succeeded"
+            except Exception as e:
+                result.status = "failed"
+                result.error = e
+            finally:
+                budget.release(reserved)
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(materialize_one, feature_views, results))
+        finally:
+            if process_pool is not None:
+                process_pool.shutdown()
+
+        return MaterializationReport(
+            results=results, total_seconds=time.perf_counter() - start
+        )
@@ -0,0 +1,123 @@
+"""
+Compiled feature retrieval plans for the Feature Store
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List
+from .feature_view import FeatureView
+from .types import FeatureReference, ValueType
+
+if TYPE_CHECKING:
+    from ..registry.base import Registry
+
+
+@dataclass(frozen=True)
+class FeatureViewPlan:
+    """The part of a retrieval plan served by one feature view"""
+
+    feature_view: FeatureView
+    # Requested features, in request order
+    feature_names: List[str]
+    # Positions of the requested features in feature_view.features
+    feature_indices: List[int]
+    join_keys: List[str]
+    # Output column of each requested feature
+    output_names: List[str]
+
+
+@dataclass(frozen=True)
+class RetrievalPlan:
+    """
+    Feature references resolved against the registry once.
+
+    A plan groups the requested features by feature view, in order of first
+    appearance, and records the join keys and output columns of the request,
+    so serving a request does not parse references or look up feature views.
+    Output columns are named after their feature, or "feature_view:feature"
+    when features of several views share a name.
+    A plan belongs to one registry version and is recompiled after the
+    registry changes.
+    """
+
+    feature_refs: List[FeatureReference]
+    views: List[FeatureViewPlan]
+    # Output feature columns and their types, in request order
+    output_schema: Dict[str, ValueType]
+    join_keys: List[str]
+    registry_version: int
+
+    @property
+    def feature_views(self) -> List[FeatureView]:
+        """Feature views read by the plan"""
+        return [view.feature_view for view in self.views]
+
+    @property
+    def output_columns(self) -> List[str]:
+        """Names of the output feature columns"""
+        return list(self.output_schema)
+
+    @classmethod
+    def compile(
+        cls,
+        feature_refs: List[FeatureReference],
+        registry: "Registry",
+    ) -> "RetrievalPlan":
+        """Resolve feature references against the registry"""
+        registry_version = registry.get_version()
+
+        grouped: Dict[str, List[str]] = {}
+        for ref in feature_refs:
+            grouped.setdefault(ref.feature_view_name, []).append(ref.feature_name)
+
+        # Feature names requested from more than one view
+        views_by_feature: Dict[str, set] = {}
+        for fv_name, feature_names in grouped.items():
+            for feature_name in feature_names:
+                views_by_feature.setdefault(feature_name, set()).add(fv_name)
+
+        views = []
+        join_keys: Dict[str, None] = {}
+        for fv_name, feature_names in grouped.items():
+            feature_view = registry.get_feature_view(fv_name)
+            if not feature_view:
+                raise ValueError(f"Feature view '{fv_name}' not found")
+
+            positions = {
+                feature.name: i for i, feature in enumerate(feature_view.features)
+            }
+            for feature_name in feature_names:
+                if feature_name not in positions:
+                    raise ValueError(
+                        f"Feature '{feature_name}' not found in feature view '{fv_name}'"
+                    )
+            fv_join_keys = feature_view.get_join_keys()
+            join_keys.update(dict.fromkeys(fv_join_keys))
+            views.append(
+                FeatureViewPlan(
+                    feature_view=feature_view,
+                    feature_names=feature_names,
+                    feature_indices=[positions[name] for name in feature_names],
+                    join_keys=fv_join_keys,
+                    output_names=[
+                        (
+                            f"{fv_name}:{name}"
+                            if len(views_by_feature[name]) > 1
+                            else name
+                        )
+                        for name in feature_names
+                    ],
+                )
+            )
+
+        output_schema = {}
+        for view in views:
+            for i, output_name in zip(view.feature_indices, view.output_names):
+                output_schema[output_name] = view.feature_view.features[i].dtype
+
+        return cls(
+            feature_refs=list(feature_refs),
+            views=views,
+            output_schema=output_schema,
+            join_keys=list(join_keys),
+            registry_version=registry_version,
+        )
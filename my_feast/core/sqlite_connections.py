@@ -0,0 +1,78 @@
+"""
+Per-thread SQLite connections shared by the SQLite registry and online store
+"""
+
+import sqlite3
+import threading
+import weakref
+from typing import Set
+
+
+def _close_connection(
+    conn: sqlite3.Connection,
+    connections: Set[sqlite3.Connection],
+    lock: threading.Lock,
+) -> None:
+    """Close a thread's connection unless the pool already closed it"""
+    with lock:
+        if conn in connections:
+            connections.discard(conn)
+            conn.close()
+
+
+class SqliteConnectionPool:
+    """
+    One connection per thread to a SQLite database in WAL mode.
+
+    A thread opens its connection on first use and keeps it until the thread
+    exits, so short-lived worker threads do not leave connections open.
+    `close` closes the connections of all threads; each thread opens a new
+    one on its next use.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connections: Set[sqlite3.Connection] = set()
+        self._lock = threading.Lock()
+        # Changes when the connections are closed
+        self._generation = 0
+
+    def connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.generation == self._generation:
+            return conn
+
+        # Closed from close() on another thread, hence check_same_thread=False
+        conn = sqlite3.connect(
+            self.path, timeout=30.0, cached_statements=256, check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+        with self._lock:
+            self._connections.add(conn)
+        self._local.conn = conn
+        self._local.generation = self._generation
+        weakref.finalize(
+            threading.current_thread(),
+            _close_connection,
+            conn,
+            self._connections,
+            self._lock,
+        )
+        return conn
+
+    def close(self) -> None:
+        """Close the connections of all threads"""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            self._generation += 1
+
+    @property
+    def open_connections(self) -> int:
+        with self._lock:
+            return len(self._connections)
@@ -3,7 +3,7 @@ Base data source class for the Feature Store
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List
 from datetime import datetime
 import pandas as pd
 
@@ -34,10 +34,36 @@ class DataSource(ABC):
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         columns: Optional[List[str]] = None,
+        entity_filters: Optional[Dict[str, List[Any]]] = None,
     ) -> pd.DataFrame:
-        """Read data from the source"""
+        """
+        Read data from the source.
+
+        Args:
+            start_date: Keep rows with timestamp_field >= start_date
+            end_date: Keep rows with timestamp_field <= end_date
+            columns: Columns to read (all if None)
+            entity_filters: Keep rows whose column value is in the given list
+        """
         pass
 
+    def iter_batches(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        columns: Optional[List[str]] = None,
+        batch_size: int = 100_000,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Read data from the source in batches of at most `batch_size` rows.
+
+        The default implementation reads everything and splits it; sources
+        able to stream should override this.
+        """
+        df = self.read(start_date=start_date, end_date=end_date, columns=columns)
+        for start in range(0, len(df), batch_size):
+            yield df.iloc[start : start + batch_size]
+
     @abstractmethod
     def get_schema(self) -> Dict[str, str]:
         """Get the schema of the data source"""
@@ -48,6 +74,10 @@ class DataSource(ABC):
         """Validate the data source configuration"""
         pass
 
+    def estimate_size_bytes(self) -> Optional[int]:
+        """Estimate the stored size of the source, or None if unknown"""
+        return None
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert data source to dictionary for serialization"""
         return {
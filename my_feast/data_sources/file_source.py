@@ -3,16 +3,54 @@ File-based data source for the Feature Store
 """
 
 import os
-from typing import Dict, Any, Optional, List
+import glob
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Iterator, Optional, List, Tuple
 from datetime import datetime
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 from .base import DataSource
 
 
+def _to_arrow_timestamp(value: datetime, arrow_type: pa.DataType) -> pa.Scalar:
+    """Convert a date bound to a scalar comparable with a timestamp column"""
+    timestamp = pd.Timestamp(value)
+    if arrow_type.tz is not None:
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.tz_localize("UTC")
+        timestamp = timestamp.tz_convert(arrow_type.tz)
+    elif timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+    return pa.scalar(timestamp, type=pa.timestamp("ns", tz=arrow_type.tz))
+
+
+def _has_glob_pattern(path: str) -> bool:
+    """Check whether a path contains glob wildcards"""
+    return any(char in path for char in "*?[")
+
+
+def _parse_partition_values(file_path: str, base_dir: str) -> Dict[str, str]:
+    """Parse hive-style ``key=value`` directory names between base_dir and the file"""
+    relative_dirs = os.path.relpath(os.path.dirname(file_path), base_dir)
+    values = {}
+    for segment in relative_dirs.split(os.sep):
+        if "=" in segment:
+            key, value = segment.split("=", 1)
+            values[key] = value
+    return values
+
+
 class FileSource(DataSource):
     """
     A data source that reads from files (Parquet, CSV, JSON).
+
+    ``path`` may be a single file, a directory or a glob pattern. Directories
+    may use hive partitioning (``dt=2024-01-01/part-0.parquet``); partition
+    values are exposed as string columns. When ``partition_date_column`` names
+    a date partition, reads bounded by ``start_date``/``end_date`` only open the
+    files of the matching partitions.
     """
 
     def __init__(
@@ -24,34 +62,321 @@ class FileSource(DataSource):
         file_format: str = "parquet",
         description: Optional[str] = None,
         tags: Optional[Dict[str, str]] = None,
+        partition_date_column: Optional[str] = None,
+        partition_date_format: str = "%Y-%m-%d",
     ):
         super().__init__(
             name, timestamp_field, created_timestamp_column, description, tags
         )
         self.path = path
         self.file_format = file_format.lower()
+        self.partition_date_column = partition_date_column
+        self.partition_date_format = partition_date_format
 
     def read(
         self,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         columns: Optional[List[str]] = None,
+        entity_filters: Optional[Dict[str, List[Any]]] = None,
     ) -> pd.DataFrame:
         """Read data from the file"""
         if self.file_format == "parquet":
-            df = pd.read_parquet(self.path)
-        elif self.file_format == "csv":
-            df = pd.read_csv(self.path)
-        elif self.file_format == "json":
-            df = pd.read_json(self.path)
+            return self._read_parquet(start_date, end_date, columns, entity_filters)
+        elif self.file_format in ["csv", "json"]:
+            df = self._read_text_files(start_date, end_date)
         else:
             raise ValueError(f"Unsupported file format: {self.file_format}")
 
-        # Filter by columns if specified
+        return self._filter_dataframe(df, start_date, end_date, columns, entity_filters)
+
+    def iter_batches(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        columns: Optional[List[str]] = None,
+        batch_size: int = 100_000,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Read data from the file in batches of at most `batch_size` rows.
+
+        Parquet sources stream record batches from the dataset scanner, so only
+        one batch is decoded at a time; csv and json files are read whole and
+        then split.
+        """
+        if self.file_format != "parquet":
+            yield from super().iter_batches(start_date, end_date, columns, batch_size)
+            return
+
+        scanner, finish = self._parquet_scanner(
+            start_date, end_date, columns, None, batch_size=batch_size
+        )
+        for batch in scanner.to_batches():
+            if batch.num_rows:
+                yield finish(batch.to_pandas())
+
+    def is_multi_file(self) -> bool:
+        """Check whether the path refers to a directory or a glob of files"""
+        return _has_glob_pattern(self.path) or os.path.isdir(self.path)
+
+    def estimate_size_bytes(self) -> Optional[int]:
+        """Estimate the stored size of the source from its files on disk"""
+        if self.is_multi_file():
+            files, _ = self._list_files()
+        elif os.path.exists(self.path):
+            files = [self.path]
+        else:
+            return None
+        return sum(os.path.getsize(f) for f in files)
+
+    def _list_files(self) -> Tuple[List[str], str]:
+        """List data files under the path together with the partition base directory"""
+        if _has_glob_pattern(self.path):
+            base_parts = []
+            for part in self.path.split(os.sep):
+                if _has_glob_pattern(part):
+                    break
+                base_parts.append(part)
+            base_dir = os.sep.join(base_parts) or "."
+            files = [
+                f for f in glob.glob(self.path, recursive=True) if os.path.isfile(f)
+            ]
+        else:
+            base_dir = self.path
+            files = []
+            for root, dirs, filenames in os.walk(self.path):
+                # Skip hidden and bookkeeping entries such as _SUCCESS or .crc files
+                dirs[:] = [d for d in dirs if not d.startswith((".", "_"))]
+                files.extend(
+                    os.path.join(root, f)
+                    for f in filenames
+                    if not f.startswith((".", "_"))
+                )
+
+        return sorted(files), base_dir
+
+    def _select_files(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Tuple[List[str], List[str], str]:
+        """
+        Get all data files and the files whose date partition overlaps the range.
+
+        Returns (all_files, selected_files, base_dir).
+        """
+        files, base_dir = self._list_files()
+        if not files:
+            raise ValueError(f"No files found for path: {self.path}")
+
+        if not self.partition_date_column or not (start_date or end_date):
+            return files, files, base_dir
+
+        start_day = pd.Timestamp(start_date).date() if start_date else None
+        end_day = pd.Timestamp(end_date).date() if end_date else None
+
+        selected = []
+        for file_path in files:
+            value = _parse_partition_values(file_path, base_dir).get(
+                self.partition_date_column
+            )
+            if value is None:
+                selected.append(file_path)
+                continue
+            day = datetime.strptime(value, self.partition_date_format).date()
+            if (start_day and day < start_day) or (end_day and day > end_day):
+                continue
+            selected.append(file_path)
+
+        return files, selected, base_dir
+
+    def _dataset(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> ds.Dataset:
+        """Build a pyarrow dataset over the files that may hold rows in the range"""
+        if not self.is_multi_file():
+            return ds.dataset(self.path, format=self.file_format)
+
+        files, selected, base_dir = self._select_files(start_date, end_date)
+        partition_keys = []
+        for file_path in files:
+            for key in _parse_partition_values(file_path, base_dir):
+                if key not in partition_keys:
+                    partition_keys.append(key)
+        partitioning = ds.partitioning(
+            pa.schema([(key, pa.string()) for key in partition_keys]), flavor="hive"
+        )
+
+        if not selected:
+            # Every partition was pruned; keep the schema for an empty result
+            schema = ds.dataset(
+                files[:1],
+                format=self.file_format,
+                partitioning=partitioning,
+                partition_base_dir=base_dir,
+            ).schema
+            return ds.dataset(schema.empty_table())
+
+        return ds.dataset(
+            selected,
+            format=self.file_format,
+            partitioning=partitioning,
+            partition_base_dir=base_dir,
+        )
+
+    def _read_text_files(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        """Read CSV or JSON files, fanning out over files in parallel"""
+        reader = pd.read_csv if self.file_format == "csv" else pd.read_json
+        if not self.is_multi_file():
+            return reader(self.path)
+
+        files, selected, base_dir = self._select_files(start_date, end_date)
+        if not selected:
+            return reader(files[0]).iloc[0:0]
+
+        def read_file(file_path: str) -> pd.DataFrame:
+            df = reader(file_path)
+            for key, value in _parse_partition_values(file_path, base_dir).items():
+                df[key] = value
+            return df
+
+        with ThreadPoolExecutor(max_workers=min(32, len(selected))) as executor:
+            frames = list(executor.map(read_file, selected))
+
+        return pd.concat(frames, ignore_index=True)
+
+    def _read_parquet(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        columns: Optional[List[str]],
+        entity_filters: Optional[Dict[str, List[Any]]],
+    ) -> pd.DataFrame:
+        """
+        Read parquet data through a pyarrow dataset scanner.
+
+        Column projection, timestamp bounds and join key filters are pushed into
+        the scan, so row groups ruled out by their min/max statistics are never
+        decoded. Multi-file sources are scanned in parallel across files.
+        Filters that cannot be expressed against the file schema are applied in
+        pandas after the scan.
+        """
+        scanner, finish = self._parquet_scanner(
+            start_date, end_date, columns, entity_filters
+        )
+        return finish(scanner.to_table().to_pandas())
+
+    def _parquet_scanner(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        columns: Optional[List[str]],
+        entity_filters: Optional[Dict[str, List[Any]]],
+        batch_size: Optional[int] = None,
+    ) -> Tuple[ds.Scanner, Callable[[pd.DataFrame], pd.DataFrame]]:
+        """
+        Build a dataset scanner with the pushed-down filters.
+
+        Returns the scanner and a function applying the remaining pandas
+        filters and projection to whatever the scanner produced.
+        """
+        dataset = self._dataset(start_date, end_date)
+        schema = dataset.schema
+
+        expressions = []
+        post_start_date, post_end_date = None, None
+        post_entity_filters = {}
+
+        if start_date or end_date:
+            if not self.timestamp_field:
+                raise ValueError("timestamp_field must be specified for date filtering")
+            if self.timestamp_field not in schema.names:
+                raise ValueError(
+                    f"timestamp_field '{self.timestamp_field}' not found in data"
+                )
+
+            timestamp_type = schema.field(self.timestamp_field).type
+            if pa.types.is_timestamp(timestamp_type):
+                timestamp_column = ds.field(self.timestamp_field)
+                if start_date:
+                    expressions.append(
+                        timestamp_column
+                        >= _to_arrow_timestamp(start_date, timestamp_type)
+                    )
+                if end_date:
+                    expressions.append(
+                        timestamp_column
+                        <= _to_arrow_timestamp(end_date, timestamp_type)
+                    )
+            else:
+                # e.g. timestamps stored as strings; parse and compare in pandas
+                post_start_date, post_end_date = start_date, end_date
+
+        for column, values in (entity_filters or {}).items():
+            if column not in schema.names:
+                continue
+            try:
+                value_set = pa.array(values, type=schema.field(column).type)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+                post_entity_filters[column] = values
+                continue
+            expressions.append(ds.field(column).isin(value_set))
+
+        # Project the requested columns plus whatever the pandas filters still need
+        selected_columns = None
+        scan_columns = None
         if columns:
-            available_columns = [col for col in columns if col in df.columns]
-            if available_columns:
-                df = df[available_columns]
+            selected_columns = [col for col in columns if col in schema.names] or None
+        if selected_columns:
+            scan_columns = list(selected_columns)
+            extra_columns = list(post_entity_filters)
+            if post_start_date or post_end_date:
+                extra_columns.append(self.timestamp_field)
+            for col in extra_columns:
+                if col not in scan_columns:
+                    scan_columns.append(col)
+
+        scan_filter = None
+        for expression in expressions:
+            scan_filter = (
+                expression if scan_filter is None else scan_filter & expression
+            )
+
+        scanner_options = {"columns": scan_columns, "filter": scan_filter}
+        if batch_size:
+            scanner_options["batch_size"] = batch_size
+        scanner = dataset.scanner(use_threads=True, **scanner_options)
+
+        def finish(df: pd.DataFrame) -> pd.DataFrame:
+            if post_start_date or post_end_date or post_entity_filters:
+                df = self._filter_dataframe(
+                    df, post_start_date, post_end_date, None, post_entity_filters
+                )
+            if selected_columns and len(scan_columns) != len(selected_columns):
+                df = df[selected_columns]
+            return df
+
+        return scanner, finish
+
+    def _filter_dataframe(
+        self,
+        df: pd.DataFrame,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        columns: Optional[List[str]],
+        entity_filters: Optional[Dict[str, List[Any]]],
+    ) -> pd.DataFrame:
+        """Apply read filters to an in-memory dataframe"""
+        # Filter by entity values if specified
+        for column, values in (entity_filters or {}).items():
+            if column in df.columns:
+                df = df[df[column].isin(values)]
 
         # Filter by date range if specified
         if start_date or end_date:
@@ -64,6 +389,7 @@ class FileSource(DataSource):
 
             # Convert timestamp column to datetime if it's not already
             if not pd.api.types.is_datetime64_any_dtype(df[self.timestamp_field]):
+                df = df.copy()
                 df[self.timestamp_field] = pd.to_datetime(df[self.timestamp_field])
 
             if start_date:
@@ -71,11 +397,19 @@ class FileSource(DataSource):
             if end_date:
                 df = df[df[self.timestamp_field] <= end_date]
 
+        # Filter by columns if specified
+        if columns:
+            available_columns = [col for col in columns if col in df.columns]
+            if available_columns:
+                df = df[available_columns]
+
         return df
 
     def get_schema(self) -> Dict[str, str]:
         """Get the schema of the data source"""
-        if self.file_format == "parquet":
+        if self.file_format == "parquet" and self.is_multi_file():
+            return {field.name: str(field.type) for field in self._dataset().schema}
+        elif self.file_format == "parquet":
             # Use pyarrow for more efficient schema reading
             try:
                 parquet_file = pq.ParquetFile(self.path)
@@ -87,10 +421,11 @@ class FileSource(DataSource):
                 return {col: str(dtype) for col, dtype in df.dtypes.items()}
         else:
             # For CSV and JSON, read a small sample
+            path = self._list_files()[0][0] if self.is_multi_file() else self.path
             if self.file_format == "csv":
-                df = pd.read_csv(self.path, nrows=1)
+                df = pd.read_csv(path, nrows=1)
             elif self.file_format == "json":
-                df = pd.read_json(self.path, nrows=1)
+                df = pd.read_json(path, nrows=1)
             else:
                 raise ValueError(f"Unsupported file format: {self.file_format}")
             return {col: str(dtype) for col, dtype in df.dtypes.items()}
@@ -99,7 +434,10 @@ class FileSource(DataSource):
         """Validate the data source configuration"""
         if not self.path:
             raise ValueError("File path cannot be empty")
-        if not os.path.exists(self.path):
+        if _has_glob_pattern(self.path):
+            if not glob.glob(self.path, recursive=True):
+                raise ValueError(f"No files match path: {self.path}")
+        elif not os.path.exists(self.path):
             raise ValueError(f"File does not exist: {self.path}")
         if self.file_format not in ["parquet", "csv", "json"]:
             raise ValueError(f"Unsupported file format: {self.file_format}")
@@ -108,7 +446,13 @@ class FileSource(DataSource):
         """Convert file source to dictionary for serialization"""
         data = super().to_dict()
         data.update(
-            {"path": self.path, "file_format": self.file_format, "type": "file"}
+            {
+                "path": self.path,
+                "file_format": self.file_format,
+                "partition_date_column": self.partition_date_column,
+                "partition_date_format": self.partition_date_format,
+                "type": "file",
+            }
         )
         return data
 
@@ -123,4 +467,6 @@ class FileSource(DataSource):
             file_format=data.get("file_format", "parquet"),
             description=data.get("description"),
             tags=data.get("tags", {}),
+            partition_date_column=data.get("partition_date_column"),
+            partition_date_format=data.get("partition_date_format", "%Y-%m-%d"),
         )
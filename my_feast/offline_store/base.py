@@ -3,8 +3,8 @@ Base offline store class for the Feature Store
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta
 import pandas as pd
 from ..core.feature_view import FeatureView
 from ..core.types import FeatureReference
@@ -39,6 +39,27 @@ class OfflineStore(ABC):
         """Pull latest features from data source"""
         pass
 
+    def pull_latest_in_chunks(
+        self,
+        feature_view: FeatureView,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        chunk_size: int = 100_000,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Pull latest features as a stream of chunks.
+
+        Writing the chunks in order leaves the latest row of every entity in
+        an online store. The default implementation splits the result of
+        pull_latest_from_table_or_query; stores able to stream should override
+        this to bound memory.
+        """
+        df = self.pull_latest_from_table_or_query(
+            feature_view=feature_view, start_date=start_date, end_date=end_date
+        )
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start : start + chunk_size]
+
     @abstractmethod
     def write_logged_features(
         self, feature_view: FeatureView, df: pd.DataFrame
@@ -99,7 +120,7 @@ class OfflineStore(ABC):
         for fv in feature_views:
             if fv.name in fv_refs:
                 feature_names = fv_refs[fv.name]
-                fv_df = self._get_feature_view_data(fv, entity_df)
+                fv_df = self._get_feature_view_data(fv, entity_df, feature_names)
 
                 if not fv_df.empty:
                     # Perform point-in-time join
@@ -110,26 +131,56 @@ class OfflineStore(ABC):
         return result_df
 
     def _get_feature_view_data(
-        self, feature_view: FeatureView, entity_df: pd.DataFrame
+        self,
+        feature_view: FeatureView,
+        entity_df: pd.DataFrame,
+        feature_names: Optional[List[str]] = None,
     ) -> pd.DataFrame:
         """Get feature view data for entities"""
-        # Read from data source
-        df = feature_view.source.read()
+        join_keys = feature_view.get_join_keys()
+        if feature_names is None:
+            feature_names = feature_view.get_feature_names()
+
+        # Only read the columns the join needs
+        columns = join_keys + feature_names
+        if feature_view.source.timestamp_field:
+            columns.append(feature_view.source.timestamp_field)
 
         # Filter by entity values if possible
-        join_keys = feature_view.get_join_keys()
         entity_values = {}
-
         for join_key in join_keys:
             if join_key in entity_df.columns:
                 entity_values[join_key] = entity_df[join_key].unique().tolist()
 
-        # Filter dataframe by entity values
-        for join_key, values in entity_values.items():
-            if join_key in df.columns:
-                df = df[df[join_key].isin(values)]
+        # Read only the time window reachable from the entity timestamps
+        start_date, end_date = self._get_entity_time_bounds(feature_view, entity_df)
+        return feature_view.source.read(
+            start_date=start_date,
+            end_date=end_date,
+            columns=columns,
+            entity_filters=entity_values,
+        )
 
-        return df
+    def _get_entity_time_bounds(
+        self, feature_view: FeatureView, entity_df: pd.DataFrame
+    ) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """
+        Get the source time window a point-in-time join can reach.
+
+        No feature row newer than the latest entity timestamp can be joined, and
+        with a TTL no row older than the earliest entity timestamp minus the TTL.
+        """
+        timestamp_field = feature_view.source.timestamp_field
+        if not timestamp_field or timestamp_field not in entity_df.columns:
+            return None, None
+
+        timestamps = pd.to_datetime(entity_df[timestamp_field]).dropna()
+        if timestamps.empty:
+            return None, None
+
+        end_date = timestamps.max()
+        start_date = timestamps.min() - feature_view.ttl if feature_view.ttl else None
+        return start_date, end_date
 
     def _join_feature_view(
         self,
@@ -150,21 +201,23 @@ class OfflineStore(ABC):
                     f"Join key '{join_key}' not found in feature dataframe"
                 )
 
-        # Select only required columns
+        timestamp_field = feature_view.source.timestamp_field
+        point_in_time = bool(timestamp_field) and timestamp_field in entity_df.columns
+
+        # Select only required columns (the timestamp is needed for the as-of match)
         columns_to_select = join_keys + feature_names
+        if point_in_time:
+            columns_to_select = columns_to_select + [timestamp_field]
         columns_to_select = [
             col for col in columns_to_select if col in feature_df.columns
         ]
         feature_df = feature_df[columns_to_select]
 
         # Perform join
-        if (
-            feature_view.source.timestamp_field
-            and feature_view.source.timestamp_field in entity_df.columns
-        ):
+        if point_in_time:
             # Point-in-time join with timestamp
             result_df = self._point_in_time_join_with_timestamp(
-                entity_df, feature_df, join_keys, feature_view.source.timestamp_field
+                entity_df, feature_df, join_keys, timestamp_field, feature_view.ttl
             )
         else:
             # Simple join
@@ -178,6 +231,7 @@ class OfflineStore(ABC):
         feature_df: pd.DataFrame,
         join_keys: List[str],
         timestamp_field: str,
+        ttl: Optional[timedelta] = None,
     ) -> pd.DataFrame:
         """Perform point-in-time join with timestamp"""
         # This is a simplified implementation
@@ -2,13 +2,126 @@
 Parquet offline store implementation for the Feature Store
 """
 
-from typing import List, Optional
-from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 from .base import OfflineStore
 from ..core.feature_view import FeatureView
 from ..core.types import FeatureReference
 
+# Positional column used to restore the entity row order after the as-of join
+_ROW_ID = "__entity_row_id"
+
+
+def _to_epoch_ns(values: pd.Series) -> np.ndarray:
+    """Convert timestamps to int64 nanoseconds; NaT becomes the smallest value"""
+    values = pd.to_datetime(values)
+    if values.dt.tz is not None:
+        values = values.dt.tz_convert("UTC").dt.tz_localize(None)
+    return values.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+
+def _entity_keys(df: pd.DataFrame, join_keys: List[str]) -> List[Any]:
+    """Build a hashable key per row from the join key columns"""
+    key_columns = [df[join_key].tolist() for join_key in join_keys]
+    if len(key_columns) == 1:
+        return key_columns[0]
+    return list(zip(*key_columns))
+
+
+def latest_row_positions(
+    df: pd.DataFrame,
+    join_keys: List[str],
+    timestamp_field: str,
+    created_timestamp_column: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Find the latest row of every entity without sorting.
+
+    Rows are hashed into entity groups, and the maximum event timestamp of
+    each group is found with one scatter-max. The created timestamp breaks
+    ties among the rows at that maximum, then the later row wins. This is
+    O(n), while sort_values plus groupby.tail(1) is O(n log n). Missing
+    timestamps count as the oldest. Returns the positions of the rows in
+    ascending order.
+    """
+    if len(df) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    if len(join_keys) == 1:
+        codes, _ = pd.factorize(df[join_keys[0]], use_na_sentinel=False)
+    else:
+        codes = df.groupby(join_keys, sort=False, dropna=False).ngroup().to_numpy()
+    n_groups = int(codes.max()) + 1
+
+    candidates = _rows_at_group_max(codes, _to_epoch_ns(df[timestamp_field]), n_groups)
+    if created_timestamp_column and created_timestamp_column in df.columns:
+        created = _to_epoch_ns(df[created_timestamp_column])
+        positions = np.flatnonzero(candidates)
+        at_max = _rows_at_group_max(codes[positions], created[positions], n_groups)
+        candidates[positions[~at_max]] = False
+
+    # The last remaining row of each group wins ties
+    positions = np.flatnonzero(candidates)
+    last = np.full(n_groups, -1, dtype=np.int64)
+    last[codes[positions]] = positions
+    return np.sort(last)
+
+
+def _rows_at_group_max(
+    codes: np.ndarray, values: np.ndarray, n_groups: int
+) -> np.ndarray:
+    """Mask of the rows holding the maximum value of their group"""
+    group_max = np.full(n_groups, np.iinfo(np.int64).min, dtype=np.int64)
+    np.maximum.at(group_max, codes, values)
+    return values == group_max[codes]
+
+
+class _LatestRowTracker:
+    """Event and created timestamps of the latest row seen for each entity"""
+
+    def __init__(self):
+        self._index: Dict[Any, int] = {}
+        self._event = np.empty(1024, dtype=np.int64)
+        self._created = np.empty(1024, dtype=np.int64)
+
+    def update(
+        self, keys: List[Any], event: np.ndarray, created: np.ndarray
+    ) -> np.ndarray:
+        """
+        Record rows with unique keys, returning a mask of the rows newer than
+        what was seen before. Ties go to the later row.
+        """
+        index = self._index
+        rows = np.fromiter(
+            (index.get(key, -1) for key in keys), dtype=np.int64, count=len(keys)
+        )
+        found = rows >= 0
+        newer = ~found
+
+        seen_rows = rows[found]
+        seen_event = self._event[seen_rows]
+        newer[found] = (event[found] > seen_event) | (
+            (event[found] == seen_event) & (created[found] >= self._created[seen_rows])
+        )
+        replaced = found & newer
+        self._event[rows[replaced]] = event[replaced]
+        self._created[rows[replaced]] = created[replaced]
+
+        new_positions = np.flatnonzero(~found)
+        size = len(index)
+        needed = size + len(new_positions)
+        if needed > len(self._event):
+            capacity = max(needed, 2 * len(self._event))
+            self._event = np.resize(self._event, capacity)
+            self._created = np.resize(self._created, capacity)
+        self._event[size:needed] = event[new_positions]
+        self._created[size:needed] = created[new_positions]
+        index.update(zip((keys[i] for i in new_positions), range(size, needed)))
+
+        return newer
+
 
 class ParquetOfflineStore(OfflineStore):
     """
@@ -39,19 +152,93 @@ class ParquetOfflineStore(OfflineStore):
         end_date: Optional[datetime] = None,
     ) -> pd.DataFrame:
         """Pull latest features from data source"""
-        # Read from the feature view's data source
-        df = feature_view.source.read(start_date=start_date, end_date=end_date)
+        chunks = list(
+            self.pull_latest_in_chunks(
+                feature_view, start_date=start_date, end_date=end_date
+            )
+        )
+        if not chunks:
+            return feature_view.source.read(
+                start_date=start_date,
+                end_date=end_date,
+                columns=self._materialization_columns(feature_view),
+            )
 
-        # If we have a timestamp field, get the latest records per entity
+        df = pd.concat(chunks, ignore_index=True)
         if feature_view.source.timestamp_field:
-            timestamp_field = feature_view.source.timestamp_field
-            join_keys = feature_view.get_join_keys()
+            # A later chunk only holds rows newer than earlier ones
+            df = df.drop_duplicates(subset=feature_view.get_join_keys(), keep="last")
+        return df
 
-            # Sort by timestamp and get the latest record for each entity
-            df = df.sort_values(timestamp_field)
-            df = df.groupby(join_keys).tail(1)
+    def pull_latest_in_chunks(
+        self,
+        feature_view: FeatureView,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        chunk_size: int = 100_000,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Pull latest features as a stream of chunks.
 
-        return df
+        The source is scanned batch by batch while a running reduction keeps
+        the timestamps of the latest row seen per entity. Rows that beat that
+        state are passed on right away, so memory holds one batch, the pending
+        output chunk and one timestamp pair per entity instead of the whole
+        source. An entity can appear in several chunks; later chunks always
+        hold newer rows, so writing the chunks in order is correct.
+        """
+        source = feature_view.source
+        timestamp_field = source.timestamp_field
+        created_field = source.created_timestamp_column
+        join_keys = feature_view.get_join_keys()
+
+        batches = source.iter_batches(
+            start_date=start_date,
+            end_date=end_date,
+            columns=self._materialization_columns(feature_view),
+            batch_size=chunk_size,
+        )
+
+        # Without event timestamps every row is passed on; the last one wins
+        if not timestamp_field:
+            yield from batches
+            return
+
+        latest = _LatestRowTracker()
+        pending, pending_rows = [], 0
+        for batch in batches:
+            batch = batch.iloc[
+                latest_row_positions(batch, join_keys, timestamp_field, created_field)
+            ]
+
+            event = _to_epoch_ns(batch[timestamp_field])
+            created = (
+                _to_epoch_ns(batch[created_field])
+                if created_field and created_field in batch.columns
+                else np.zeros(len(batch), dtype=np.int64)
+            )
+            newer = latest.update(_entity_keys(batch, join_keys), event, created)
+            if newer.any():
+                pending.append(batch[newer])
+                pending_rows += int(newer.sum())
+
+            if pending_rows >= chunk_size:
+                yield pd.concat(pending, ignore_index=True)
+                pending, pending_rows = [], 0
+
+        if pending:
+            yield pd.concat(pending, ignore_index=True)
+
+    def _materialization_columns(self, feature_view: FeatureView) -> List[str]:
+        """Columns the online store needs from the data source"""
+        columns = feature_view.get_join_keys() + feature_view.get_feature_names()
+        for field in (
+            feature_view.source.timestamp_field,
+            feature_view.source.created_timestamp_column,
+        ):
+            if field:
+                columns.append(field)
+        return columns
 
     def write_logged_features(
         self, feature_view: FeatureView, df: pd.DataFrame
@@ -110,56 +297,67 @@ class ParquetOfflineStore(OfflineStore):
         feature_df: pd.DataFrame,
         join_keys: List[str],
         timestamp_field: str,
+        ttl: Optional[timedelta] = None,
     ) -> pd.DataFrame:
-        """Perform point-in-time join with timestamp"""
-        # This is a more sophisticated implementation for parquet
-        result_rows = []
-
-        # Ensure timestamp columns are datetime
-        if timestamp_field in entity_df.columns:
-            entity_df[timestamp_field] = pd.to_datetime(entity_df[timestamp_field])
-        if timestamp_field in feature_df.columns:
-            feature_df[timestamp_field] = pd.to_datetime(feature_df[timestamp_field])
-
-        # For each entity row, find the latest features as of the timestamp
-        for _, entity_row in entity_df.iterrows():
-            # Filter feature data for this entity
-            entity_filter = True
-            for join_key in join_keys:
-                if join_key in feature_df.columns:
-                    entity_filter = entity_filter & (
-                        feature_df[join_key] == entity_row[join_key]
-                    )
-
-            entity_features = feature_df[entity_filter]
-
-            # Filter by timestamp if available
-            if timestamp_field in entity_row and timestamp_field in feature_df.columns:
-                entity_timestamp = entity_row[timestamp_field]
-                entity_features = entity_features[
-                    entity_features[timestamp_field] <= entity_timestamp
-                ]
-
-            # Get the latest feature values
-            if not entity_features.empty:
-                if timestamp_field in entity_features.columns:
-                    latest_features = entity_features.sort_values(timestamp_field).tail(
-                        1
-                    )
-                else:
-                    latest_features = entity_features.tail(1)
-
-                # Combine with entity data
-                result_row = entity_row.to_dict()
-                for col in latest_features.columns:
-                    if col not in join_keys and col != timestamp_field:
-                        result_row[col] = latest_features[col].iloc[0]
-                result_rows.append(result_row)
-            else:
-                # No features found, add entity row with null features
-                result_rows.append(entity_row.to_dict())
-
-        return pd.DataFrame(result_rows)
+        """
+        Perform point-in-time join with timestamp.
+
+        Both sides are sorted by timestamp once and joined with ``merge_asof``
+        grouped by the join keys, so every entity row picks up the latest
+        feature row at or before its own timestamp in O((N + M) log(N + M)).
+        With a TTL, feature rows older than ``entity_ts - ttl`` are not joined.
+        """
+        feature_columns = [
+            col
+            for col in feature_df.columns
+            if col not in join_keys and col != timestamp_field
+        ]
+
+        result_df = entity_df.copy()
+        result_df[timestamp_field] = pd.to_datetime(result_df[timestamp_field])
+        result_df[_ROW_ID] = np.arange(len(result_df))
+
+        if timestamp_field not in feature_df.columns:
+            # Without feature timestamps every row is eligible; keep the last one
+            latest = feature_df.drop_duplicates(subset=join_keys, keep="last")
+            result_df = result_df.merge(
+                latest[join_keys + feature_columns], on=join_keys, how="left"
+            )
+            return result_df.drop(columns=[_ROW_ID])
+
+        right = feature_df[join_keys + [timestamp_field] + feature_columns].copy()
+        right[timestamp_field] = pd.to_datetime(right[timestamp_field]).astype(
+            result_df[timestamp_field].dtype
+        )
+        right = right[right[timestamp_field].notna()]
+
+        has_timestamp = result_df[timestamp_field].notna()
+        if ttl and has_timestamp.any():
+            # Prune rows no entity row can reach before sorting and joining
+            lower_bound = result_df.loc[has_timestamp, timestamp_field].min() - ttl
+            right = right[right[timestamp_field] >= lower_bound]
+
+        # Stable sort so that equal timestamps resolve to the last row in the source
+        right = right.sort_values(timestamp_field, kind="mergesort")
+
+        left = result_df[has_timestamp].sort_values(timestamp_field, kind="mergesort")
+
+        joined = pd.merge_asof(
+            left,
+            right,
+            on=timestamp_field,
+            by=join_keys,
+            direction="backward",
+            allow_exact_matches=True,
+            tolerance=pd.Timedelta(ttl) if ttl else None,
+        )
+
+        # Rows without an entity timestamp can never match a feature row
+        if not has_timestamp.all():
+            joined = pd.concat([joined, result_df[~has_timestamp]], ignore_index=True)
+
+        joined = joined.sort_values(_ROW_ID, kind="mergesort")
+        return joined.drop(columns=[_ROW_ID]).reset_index(drop=True)
 
     def get_feature_data_for_materialization(
         self,
@@ -2,7 +2,19 @@
 Online store module for the Feature Store
 """
 
-from .base import OnlineStore
+from .base import EVENT_TIMESTAMP_COLUMN, OnlineStore
+from .entity_key import EntityKeySerializer
 from .memory_store import MemoryOnlineStore
+from .sqlite_store import SqliteOnlineStore
+from .redis_store import RedisOnlineStore
+from .tiered_store import TieredOnlineStore
 
-__all__ = ["OnlineStore", "MemoryOnlineStore"]
+__all__ = [
+    "OnlineStore",
+    "MemoryOnlineStore",
+    "SqliteOnlineStore",
+    "RedisOnlineStore",
+    "TieredOnlineStore",
+    "EntityKeySerializer",
+    "EVENT_TIMESTAMP_COLUMN",
+]
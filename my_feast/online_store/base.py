@@ -2,13 +2,19 @@
 Base online store class for the Feature Store
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+import numpy as np
 import pandas as pd
 from ..core.feature_view import FeatureView
 from ..core.types import FeatureReference
 
+# Pseudo feature name that lookup_feature_columns accepts to return the stored
+# event time of each entity, as datetime64[ns] with NaT where it is unknown
+EVENT_TIMESTAMP_COLUMN = "__event_timestamp"
+
 
 class OnlineStore(ABC):
     """
@@ -16,6 +22,10 @@ class OnlineStore(ABC):
     Online stores provide low-latency feature serving.
     """
 
+    # Whether written data outlives the process, so materialization
+    # watermarks recorded in the registry stay valid after a restart
+    persistent = True
+
     def __init__(self):
         pass
 
@@ -39,6 +49,97 @@ class OnlineStore(ABC):
         """Read features from the online store"""
         pass
 
+    def read_feature_columns(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Read features as one array per feature, aligned with entity_rows.
+
+        Stores should override this with a native implementation; the default
+        goes through read_features and converts its dataframe.
+        """
+        if feature_names is None:
+            feature_names = feature_view.get_feature_names()
+
+        df = self.read_features(feature_view, entity_rows, feature_names)
+        if df.empty:
+            return {
+                feature_name: np.full(len(entity_rows), None, dtype=object)
+                for feature_name in feature_names
+            }
+        return {
+            feature_name: df[feature_name].to_numpy() for feature_name in feature_names
+        }
+
+    def lookup_feature_columns(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """
+        Read features like read_feature_columns, plus a mask of found entities.
+
+        The default treats an entity as found when any requested feature is
+        not null, and does not know event times; stores that know which keys
+        they hold should override it.
+        """
+        if feature_names is None:
+            feature_names = feature_view.get_feature_names()
+        values = self.read_feature_columns(
+            feature_view,
+            entity_rows,
+            [name for name in feature_names if name != EVENT_TIMESTAMP_COLUMN],
+        )
+        found = np.zeros(len(entity_rows), dtype=bool)
+        for column in values.values():
+            found |= ~pd.isna(column)
+        if EVENT_TIMESTAMP_COLUMN in feature_names:
+            values[EVENT_TIMESTAMP_COLUMN] = np.full(
+                len(entity_rows), np.datetime64("NaT"), dtype="datetime64[ns]"
+            )
+        return values, found
+
+    async def write_features_async(
+        self,
+        feature_view: FeatureView,
+        df: pd.DataFrame,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        """
+        Async variant of write_features.
+
+        The default runs write_features in a worker thread so the event loop
+        is not blocked; stores with an asyncio client or non-blocking writes
+        should override it.
+        """
+        await asyncio.to_thread(self.write_features, feature_view, df, timestamp)
+
+    async def read_feature_columns_async(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Async variant of read_feature_columns, in a worker thread by default"""
+        return await asyncio.to_thread(
+            self.read_feature_columns, feature_view, entity_rows, feature_names
+        )
+
+    async def lookup_feature_columns_async(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Async variant of lookup_feature_columns, in a worker thread by default"""
+        return await asyncio.to_thread(
+            self.lookup_feature_columns, feature_view, entity_rows, feature_names
+        )
+
     @abstractmethod
     def delete_features(self, feature_view: FeatureView) -> None:
         """Delete all features for a feature view"""
@@ -91,6 +192,9 @@ class OnlineStore(ABC):
         for join_key in join_keys:
             if join_key not in df.columns:
                 raise ValueError(f"Join key '{join_key}' not found in data")
+            # A null key matches no entity, so its row could never be read
+            if df[join_key].isna().any():
+                raise ValueError(f"Join key '{join_key}' has null values")
 
         # Check if timestamp field is present if specified
         if feature_view.source.timestamp_field:
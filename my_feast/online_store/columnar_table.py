@@ -0,0 +1,592 @@
+"""
+Columnar in-memory table used by the memory online store
+"""
+
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from datetime import datetime
+import contextlib
+import sys
+import threading
+import time
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from ..core.feature import Feature
+from ..core.types import ValueType, NUMPY_TYPE_MAP
+from .base import EVENT_TIMESTAMP_COLUMN
+
+
+def storage_dtype(value_type: ValueType) -> np.dtype:
+    """Get the NumPy dtype used to store values of a feature type"""
+    # Fixed-width string dtypes would pad every value to the longest one
+    if value_type in (ValueType.STRING, ValueType.BYTES):
+        return np.dtype(object)
+    if value_type == ValueType.UNIX_TIMESTAMP:
+        return np.dtype("datetime64[ns]")
+    if value_type in NUMPY_TYPE_MAP:
+        return np.dtype(NUMPY_TYPE_MAP[value_type])
+    return np.dtype(object)
+
+
+def _coerce(values: np.ndarray, dtype: np.dtype) -> Optional[np.ndarray]:
+    """Cast values to dtype, or return None if that would lose information"""
+    if values.dtype == dtype or dtype == object:
+        return values
+    if dtype.kind in "iub" and values.dtype.kind == "f":
+        # NaN has no integer or boolean representation
+        if np.isnan(values).any():
+            return None
+    try:
+        return values.astype(dtype)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _promoted_dtype(dtype: np.dtype, values: np.ndarray) -> np.dtype:
+    """Get the narrowest dtype able to hold both existing and new values"""
+    if dtype.kind in "iu" and values.dtype.kind in "iuf":
+        return np.dtype(np.float64)
+    return np.dtype(object)
+
+
+def take_with_missing(
+    array: np.ndarray, rows: np.ndarray, found: np.ndarray
+) -> np.ndarray:
+    """
+    Gather values by row position, filling rows that were not found.
+
+    Missing values become NaN for numeric columns, NaT for datetimes and None
+    otherwise, which matches how pandas infers columns built from rows.
+    """
+    values = array[np.where(found, rows, 0)]
+    if found.all():
+        return values
+    if values.dtype.kind in "iu":
+        values = values.astype(np.float64)
+    if values.dtype.kind == "f":
+        values[~found] = np.nan
+    elif values.dtype.kind == "M":
+        values[~found] = np.datetime64("NaT")
+    else:
+        values = values.astype(object)
+        values[~found] = None
+    return values
+
+
+# Reserved snapshot column names
+_KEY_COLUMN = "__entity_key"
+_TIMESTAMP_COLUMN = "__write_timestamp"
+_EVENT_TIMESTAMP_COLUMN = EVENT_TIMESTAMP_COLUMN
+
+
+def _primitive_view(values: np.ndarray) -> np.ndarray:
+    """View booleans and datetimes as integers Arrow stores unpacked"""
+    if values.dtype == np.bool_:
+        return values.view(np.uint8)
+    if values.dtype.kind == "M":
+        return values.view(np.int64)
+    return values
+
+
+class ColumnarTable:
+    """
+    Column-oriented storage for the rows of one feature view.
+
+    Entity keys map to row positions through a hash index, and every feature is
+    held in one typed NumPy array whose dtype follows ``Feature.dtype``. An
+    entity therefore costs one index entry plus one array slot per feature,
+    instead of a key string and a dict of boxed Python values.
+
+    Writers are serialized by the table's own lock, so tables of different
+    feature views are written independently. Readers take no lock: every
+    change they could observe is made inside a short publish section that
+    bumps a version counter, and `read` retries when the version moved.
+    """
+
+    INITIAL_CAPACITY = 1024
+    DEFAULT_BATCH_SIZE = 100_000
+    # Candidate rows sampled per evicted entity
+    EVICTION_SAMPLES = 16
+    # Access counts are halved when one reaches this value, so LFU adapts
+    MAX_ACCESS_COUNT = 1 << 16
+    EVICTION_POLICIES = ("lru", "lfu")
+    # Lock-free read attempts before a read waits for the publish lock
+    MAX_OPTIMISTIC_READS = 4
+
+    def __init__(self, features: List[Feature]):
+        self._index: Dict[Any, int] = {}
+        self._size = 0
+        self._capacity = self.INITIAL_CAPACITY
+        self._row_keys = np.empty(self._capacity, dtype=object)
+        self._timestamps = np.empty(self._capacity, dtype="datetime64[ns]")
+        # Event time of each row, falling back to the write time; NaT marks free rows
+        self._event_timestamps = np.empty(self._capacity, dtype="datetime64[ns]")
+        # Rows released by expiry or eviction, reused before appending
+        self._free_rows: List[int] = []
+        # Read clock tick of the last access and access count of each row
+        self._access_clock = 0
+        self._last_access = np.zeros(self._capacity, dtype=np.int64)
+        self._access_counts = np.zeros(self._capacity, dtype=np.uint32)
+        self._rng = np.random.default_rng()
+        self._columns: Dict[str, np.ndarray] = {
+            feature.name: np.empty(self._capacity, dtype=storage_dtype(feature.dtype))
+            for feature in features
+        }
+        # Serializes writers
+        self._write_lock = threading.Lock()
+        # Held while changes are published; odd versions mark a publish in progress
+        self._publish_lock = threading.Lock()
+        self._version = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def feature_names(self) -> List[str]:
+        """Names of the stored feature columns"""
+        return list(self._columns.keys())
+
+    @contextlib.contextmanager
+    def _publishing(self):
+        """Make changes visible to readers; reads overlapping them are retried"""
+        with self._publish_lock:
+            self._version += 1
+            try:
+                yield
+            finally:
+                self._version += 1
+
+    def _resized(self, array: np.ndarray, capacity: int) -> np.ndarray:
+        """Copy the used rows of an array into a new array of `capacity` rows"""
+        new_array = np.empty(capacity, dtype=array.dtype)
+        new_array[: self._size] = array[: self._size]
+        return new_array
+
+    def _ensure_writable(self) -> None:
+        """Copy arrays mapped from a snapshot before writing into them"""
+        arrays = [
+            self._row_keys,
+            self._timestamps,
+            self._event_timestamps,
+            self._last_access,
+            self._access_counts,
+            *self._columns.values(),
+        ]
+        if all(array.flags.writeable for array in arrays):
+            return
+        row_keys = self._row_keys.copy()
+        timestamps = self._timestamps.copy()
+        event_timestamps = self._event_timestamps.copy()
+        last_access = self._last_access.copy()
+        access_counts = self._access_counts.copy()
+        columns = {name: column.copy() for name, column in self._columns.items()}
+        with self._publishing():
+            self._row_keys = row_keys
+            self._timestamps = timestamps
+            self._event_timestamps = event_timestamps
+            self._last_access = last_access
+            self._access_counts = access_counts
+            self._columns = columns
+
+    def lookup(self, keys: Sequence[Any]) -> np.ndarray:
+        """Get the row position of each key, -1 for unknown keys"""
+        index = self._index
+        return np.fromiter(
+            (index.get(key, -1) for key in keys), dtype=np.int64, count=len(keys)
+        )
+
+    def upsert(
+        self,
+        keys: Sequence[Any],
+        columns: Dict[str, Any],
+        timestamp: datetime,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        event_timestamps: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Insert or overwrite the rows for the given keys.
+
+        Keys must be unique. All copying happens outside publish sections:
+        rows for new keys are filled in free rows or spare capacity that no
+        index entry points to yet, and grown or widened arrays are built aside.
+        Publishing only swaps arrays in, overwrites existing rows and adds new
+        index entries, each in batches of at most `batch_size` rows.
+        `event_timestamps` default to `timestamp` where missing.
+        """
+        with self._write_lock:
+            self._ensure_writable()
+            rows = self.lookup(keys)
+            is_new = rows < 0
+            new_positions = np.flatnonzero(is_new)
+            old_positions = np.flatnonzero(~is_new)
+
+            # Reuse free rows first, then append
+            reused = min(len(self._free_rows), len(new_positions))
+            free_rows = self._free_rows[len(self._free_rows) - reused :]
+            del self._free_rows[len(self._free_rows) - reused :]
+            first_new_row = self._size
+            appended = len(new_positions) - reused
+            rows[new_positions] = np.concatenate(
+                [
+                    np.asarray(free_rows, dtype=np.int64),
+                    np.arange(first_new_row, first_new_row + appended),
+                ]
+            )
+
+            # Grow and widen arrays aside, then publish them with one swap
+            capacity = self._capacity
+            if first_new_row + appended > capacity:
+                capacity = max(capacity * 2, first_new_row + appended)
+            new_columns = {}
+            coerced = {}
+            for name, values in columns.items():
+                values = np.asarray(values)
+                column = self._columns.get(name)
+                if column is None:
+                    column = np.empty(capacity, dtype=values.dtype)
+                elif _coerce(values, column.dtype) is None:
+                    column = self._resized(column, capacity).astype(
+                        _promoted_dtype(column.dtype, values)
+                    )
+                elif capacity != self._capacity:
+                    column = self._resized(column, capacity)
+                else:
+                    column = None
+                if column is not None:
+                    new_columns[name] = column
+                coerced[name] = values
+
+            if capacity != self._capacity or new_columns:
+                grown = capacity != self._capacity
+                row_keys = self._resized(self._row_keys, capacity) if grown else None
+                timestamps = (
+                    self._resized(self._timestamps, capacity) if grown else None
+                )
+                grown_event_timestamps = (
+                    self._resized(self._event_timestamps, capacity) if grown else None
+                )
+                last_access = (
+                    self._resized(self._last_access, capacity) if grown else None
+                )
+                access_counts = (
+                    self._resized(self._access_counts, capacity) if grown else None
+                )
+                for name, column in self._columns.items():
+                    if grown and name not in new_columns:
+                        new_columns[name] = self._resized(column, capacity)
+                with self._publishing():
+                    if grown:
+                        self._row_keys = row_keys
+                        self._timestamps = timestamps
+                        self._event_timestamps = grown_event_timestamps
+                        self._last_access = last_access
+                        self._access_counts = access_counts
+                        self._capacity = capacity
+                    self._columns = {**self._columns, **new_columns}
+
+            for name, values in coerced.items():
+                coerced[name] = _coerce(values, self._columns[name].dtype)
+
+            write_timestamp = pd.Timestamp(timestamp).to_datetime64()
+            if event_timestamps is None:
+                event_times = np.full(
+                    len(keys), write_timestamp, dtype="datetime64[ns]"
+                )
+            else:
+                event_times = np.asarray(event_timestamps, dtype="datetime64[ns]")
+                event_times = np.where(
+                    np.isnat(event_times), write_timestamp, event_times
+                )
+
+            # Fill rows for new keys; nothing can read them before they are indexed
+            new_rows = rows[new_positions]
+            new_keys = np.fromiter(
+                (keys[i] for i in new_positions), dtype=object, count=len(new_positions)
+            )
+            for name, values in coerced.items():
+                self._columns[name][new_rows] = values[new_positions]
+            self._row_keys[new_rows] = new_keys
+            self._timestamps[new_rows] = write_timestamp
+            self._event_timestamps[new_rows] = event_times[new_positions]
+            # New rows count as just accessed, so they are not evicted first
+            self._last_access[new_rows] = self._access_clock
+            self._access_counts[new_rows] = 1
+            self._size = first_new_row + appended
+
+            # Overwrite existing rows in short published batches
+            for start in range(0, len(old_positions), batch_size):
+                batch = old_positions[start : start + batch_size]
+                batch_rows = rows[batch]
+                with self._publishing():
+                    for name, values in coerced.items():
+                        self._columns[name][batch_rows] = values[batch]
+                    self._timestamps[batch_rows] = write_timestamp
+                    self._event_timestamps[batch_rows] = event_times[batch]
+
+            # Publish the new keys
+            for start in range(0, len(new_positions), batch_size):
+                batch_keys = new_keys[start : start + batch_size].tolist()
+                batch_rows = new_rows[start : start + batch_size].tolist()
+                with self._publishing():
+                    self._index.update(zip(batch_keys, batch_rows))
+
+    def fresh(self, rows: np.ndarray, cutoff: np.datetime64) -> np.ndarray:
+        """Mark rows whose event time is before `cutoff` as not found"""
+        rows = rows.copy()
+        found = rows >= 0
+        stale = self._event_timestamps[rows[found]] < cutoff
+        rows[np.flatnonzero(found)[stale]] = -1
+        return rows
+
+    def expire(
+        self,
+        cutoff: np.datetime64,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        """
+        Remove the rows whose event time is before `cutoff`.
+
+        Expired rows are found with one vectorized comparison, then dropped
+        from the index in published batches of at most `batch_size` keys.
+        Their rows go to the free list. Returns the number of removed
+        entities.
+        """
+        with self._write_lock:
+            self._ensure_writable()
+            # Free rows hold NaT, which never compares as expired
+            expired = np.flatnonzero(self._event_timestamps[: self._size] < cutoff)
+            self._remove_rows(expired, batch_size)
+            return len(expired)
+
+    def touch(self, rows: np.ndarray) -> None:
+        """Record an access to the found rows of a `lookup`"""
+        rows = rows[rows >= 0]
+        self._access_clock += 1
+        if not len(rows):
+            return
+        self._last_access[rows] = self._access_clock
+        counts = self._access_counts
+        counts[rows] += 1
+        if counts[rows].max() >= self.MAX_ACCESS_COUNT:
+            counts[: self._size] >>= 1
+
+    def evict(
+        self,
+        count: int,
+        policy: str = "lru",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        """
+        Remove `count` entities, chosen by an approximate LRU or LFU policy.
+
+        As in Redis, victims are not kept in an exact order: `EVICTION_SAMPLES`
+        random rows are sampled per victim and the least recently (``"lru"``)
+        or least frequently (``"lfu"``) accessed of them are removed, so each
+        eviction costs a constant amount of work whatever the table size.
+        Returns the number of removed entities.
+        """
+        if policy not in self.EVICTION_POLICIES:
+            raise ValueError(f"Unsupported eviction policy: {policy}")
+        with self._write_lock:
+            count = min(count, len(self._index))
+            if count <= 0:
+                return 0
+            self._ensure_writable()
+            victims = self._eviction_victims(count, policy)
+            self._remove_rows(victims, batch_size)
+            return len(victims)
+
+    def _eviction_victims(self, count: int, policy: str) -> np.ndarray:
+        """Pick `count` live rows to evict from a random sample"""
+        live = ~np.isnat(self._event_timestamps[: self._size])
+        candidates = self._rng.integers(0, self._size, count * self.EVICTION_SAMPLES)
+        candidates = np.unique(candidates[live[candidates]])
+        if len(candidates) < count:
+            candidates = np.flatnonzero(live)
+        last_access = self._last_access[candidates]
+        if policy == "lfu":
+            # Least frequently used first, least recently used among equals
+            order = np.lexsort((last_access, self._access_counts[candidates]))
+        else:
+            order = np.argsort(last_access, kind="stable")
+        return candidates[order[:count]]
+
+    def _remove_rows(self, rows: np.ndarray, batch_size: int) -> None:
+        """Unpublish rows in batches and release them to the free list"""
+        keys = self._row_keys[rows].tolist()
+        index = self._index
+        for start in range(0, len(keys), batch_size):
+            with self._publishing():
+                for key in keys[start : start + batch_size]:
+                    del index[key]
+
+        self._row_keys[rows] = None
+        self._event_timestamps[rows] = np.datetime64("NaT")
+        self._free_rows.extend(rows.tolist())
+
+    def read(
+        self,
+        keys: Sequence[Any],
+        feature_names: List[str],
+        cutoff: Optional[np.datetime64] = None,
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """
+        Look up keys and gather their features without taking a lock.
+
+        Like a seqlock, the version is read before and after the lookup and
+        gather, and the read is retried if a publish overlapped it. After
+        `MAX_OPTIMISTIC_READS` attempts the read waits for the publish lock,
+        which writers only hold for one batch. Rows with an event time before
+        `cutoff` are not found. Returns the values and the row positions.
+        """
+        for _ in range(self.MAX_OPTIMISTIC_READS):
+            version = self._version
+            if version % 2 == 0:
+                try:
+                    result = self._read(keys, feature_names, cutoff)
+                except (IndexError, KeyError):
+                    # A torn read of arrays being swapped; only then is it expected
+                    if self._version == version:
+                        raise
+                else:
+                    if self._version == version:
+                        return result
+            # Let the writer finish its batch
+            time.sleep(0)
+        with self._publish_lock:
+            return self._read(keys, feature_names, cutoff)
+
+    def _read(
+        self,
+        keys: Sequence[Any],
+        feature_names: List[str],
+        cutoff: Optional[np.datetime64],
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """One attempt of `read`"""
+        rows = self.lookup(keys)
+        if cutoff is not None:
+            rows = self.fresh(rows, cutoff)
+        return self.gather(rows, feature_names), rows
+
+    def gather(
+        self, rows: np.ndarray, feature_names: List[str]
+    ) -> Dict[str, np.ndarray]:
+        """Gather feature values for row positions from `lookup`"""
+        found = rows >= 0
+        result = {}
+        for name in feature_names:
+            if name in self._columns:
+                result[name] = take_with_missing(self._columns[name], rows, found)
+            elif name == _EVENT_TIMESTAMP_COLUMN:
+                result[name] = take_with_missing(self._event_timestamps, rows, found)
+            else:
+                result[name] = np.full(len(rows), None, dtype=object)
+        return result
+
+    def to_arrow(self) -> pa.Table:
+        """
+        Export the table for a snapshot.
+
+        Numeric, boolean and datetime columns are stored as fixed-width
+        primitives so they can be mapped back without a copy; object columns
+        are stored as Arrow values.
+        """
+        with self._write_lock:
+            # Free rows are left out
+            live = np.fromiter(self._index.values(), dtype=np.int64)
+            live.sort()
+            size = len(live)
+            arrays, fields = [], []
+
+            def add(name: str, array: pa.Array, dtype: str) -> None:
+                arrays.append(array)
+                fields.append(pa.field(name, array.type, metadata={"dtype": dtype}))
+
+            add(_KEY_COLUMN, pa.array(self._row_keys[live].tolist()), "object")
+            add(
+                _TIMESTAMP_COLUMN,
+                pa.array(self._timestamps[live].view(np.int64)),
+                "datetime64[ns]",
+            )
+            add(
+                _EVENT_TIMESTAMP_COLUMN,
+                pa.array(self._event_timestamps[live].view(np.int64)),
+                "datetime64[ns]",
+            )
+            for name, column in self._columns.items():
+                values = column[live]
+                if values.dtype == object:
+                    add(name, pa.array(values.tolist(), from_pandas=True), "object")
+                else:
+                    add(name, pa.array(_primitive_view(values)), values.dtype.str)
+
+            schema = pa.schema(fields, metadata={"size": str(size)})
+            return pa.Table.from_arrays(arrays, schema=schema)
+
+    @classmethod
+    def from_arrow(cls, table: pa.Table) -> "ColumnarTable":
+        """
+        Rebuild a table from a snapshot.
+
+        Fixed-width columns are viewed without copying, so a table read from a
+        memory-mapped file keeps its values in the mapped pages; they are
+        copied on the first write. Only the key index is rebuilt in memory.
+        """
+        size = table.num_rows
+
+        result = cls([])
+        result._size = size
+        result._capacity = size
+
+        def column_values(name: str) -> np.ndarray:
+            column = table.column(name)
+            # A single chunk is used as is; combining would copy it
+            column = (
+                column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+            )
+            dtype = table.schema.field(name).metadata[b"dtype"].decode()
+            if dtype == "object":
+                values = np.empty(size, dtype=object)
+                values[:] = column.to_pylist()
+                return values
+            values = column.to_numpy(zero_copy_only=True)
+            return values.view(np.dtype(dtype))
+
+        keys = table.column(_KEY_COLUMN).to_pylist()
+        result._row_keys = np.empty(size, dtype=object)
+        result._row_keys[:] = keys
+        result._timestamps = column_values(_TIMESTAMP_COLUMN)
+        result._event_timestamps = column_values(_EVENT_TIMESTAMP_COLUMN)
+        result._last_access = np.zeros(size, dtype=np.int64)
+        result._access_counts = np.zeros(size, dtype=np.uint32)
+        result._columns = {
+            name: column_values(name)
+            for name in table.column_names
+            if name not in (_KEY_COLUMN, _TIMESTAMP_COLUMN, _EVENT_TIMESTAMP_COLUMN)
+        }
+        result._index = dict(zip(keys, range(size)))
+        return result
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the table"""
+        total = sys.getsizeof(self._index)
+        total += self._row_keys.nbytes + self._timestamps.nbytes
+        total += self._event_timestamps.nbytes
+        total += self._last_access.nbytes + self._access_counts.nbytes
+        total += sum(array.nbytes for array in self._columns.values())
+        return total
+
+    def row_nbytes(self) -> float:
+        """Approximate memory per entity: one slot in every array and in the index"""
+        arrays = [
+            self._row_keys,
+            self._timestamps,
+            self._event_timestamps,
+            self._last_access,
+            self._access_counts,
+            *self._columns.values(),
+        ]
+        total = sum(array.itemsize for array in arrays)
+        if self._index:
+            total += sys.getsizeof(self._index) / len(self._index)
+        return total
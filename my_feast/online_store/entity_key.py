@@ -0,0 +1,196 @@
+"""
+Binary entity key encoding shared by the online stores
+"""
+
+import struct
+from typing import Any, List, Mapping, Optional, Sequence
+import numpy as np
+import pandas as pd
+from ..core.feature_view import FeatureView
+from ..core.types import ValueType
+
+# Type tags of the untyped entity key encoding
+_KEY_NONE = 0
+_KEY_INT = 1
+_KEY_FLOAT = 2
+_KEY_STRING = 3
+_KEY_BYTES = 4
+_KEY_BOOL = 5
+
+# Fixed-width little-endian encodings of typed key values
+_FIXED_WIDTH_DTYPES = {
+    ValueType.INT32: np.dtype("<i4"),
+    ValueType.INT64: np.dtype("<i8"),
+    ValueType.FLOAT: np.dtype("<f4"),
+    ValueType.DOUBLE: np.dtype("<f8"),
+    ValueType.BOOL: np.dtype("u1"),
+    ValueType.UNIX_TIMESTAMP: np.dtype("<i8"),
+}
+
+
+def encode_entity_key(values: Sequence[Any]) -> bytes:
+    """
+    Encode join key values of unknown types into an unambiguous binary key.
+
+    Every value is a type tag followed by a fixed-width little-endian number
+    or a length-prefixed byte string. Integral floats are encoded as integers
+    so that keys read back from float columns still match.
+    """
+    parts = []
+    for value in values:
+        if value is None:
+            parts.append(bytes([_KEY_NONE]))
+        elif isinstance(value, (bool, np.bool_)):
+            parts.append(struct.pack("<B?", _KEY_BOOL, bool(value)))
+        elif isinstance(value, (int, np.integer)):
+            parts.append(struct.pack("<Bq", _KEY_INT, int(value)))
+        elif isinstance(value, (float, np.floating)):
+            if float(value).is_integer():
+                parts.append(struct.pack("<Bq", _KEY_INT, int(value)))
+            else:
+                parts.append(struct.pack("<Bd", _KEY_FLOAT, float(value)))
+        elif isinstance(value, str):
+            encoded = value.encode("utf-8")
+            parts.append(struct.pack("<BI", _KEY_STRING, len(encoded)) + encoded)
+        elif isinstance(value, bytes):
+            parts.append(struct.pack("<BI", _KEY_BYTES, len(value)) + value)
+        else:
+            raise ValueError(f"Unsupported entity key value: {value!r}")
+    return b"".join(parts)
+
+
+def _to_str(value: Any) -> str:
+    """String form of a key value; integral floats lose their ".0" """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _fixed_width(values: Any, value_type: ValueType, join_key: str) -> np.ndarray:
+    """Cast a key column to a fixed-width dtype, refusing lossy casts"""
+    dtype = _FIXED_WIDTH_DTYPES[value_type]
+    array = np.asarray(values)
+    try:
+        if value_type == ValueType.UNIX_TIMESTAMP and array.dtype.kind == "O":
+            # datetime objects or tz-aware timestamps; naive ones count as UTC
+            array = pd.to_datetime(array, utc=True).as_unit("ns").asi8
+        elif array.dtype.kind == "M":
+            array = array.astype("datetime64[ns]").view(np.int64)
+        elif array.dtype.kind == "f" and dtype.kind in "iu":
+            if not (np.isfinite(array) & (array == np.floor(array))).all():
+                raise ValueError("non-integral value")
+        elif array.dtype.kind in "OUT" and dtype.kind in "iu":
+            array = np.array([int(_to_str(value)) for value in array], dtype=np.int64)
+        return array.astype(dtype)
+    except (TypeError, ValueError, OverflowError) as e:
+        raise ValueError(f"Invalid values for entity key '{join_key}': {e}") from e
+
+
+def _length_prefixed(values: Any, value_type: ValueType) -> List[bytes]:
+    """Encode a key column as 4-byte lengths followed by the value bytes"""
+    if value_type == ValueType.BYTES:
+        encoded = [bytes(value) for value in values]
+    else:
+        encoded = [_to_str(value).encode("utf-8") for value in values]
+    return [struct.pack("<I", len(value)) + value for value in encoded]
+
+
+def _as_bytes(array: np.ndarray) -> List[bytes]:
+    """Turn the rows of a 2-d uint8 array into bytes objects"""
+    width = array.shape[1]
+    if width == 0:
+        return [b""] * len(array)
+    rows = np.ascontiguousarray(array).view(np.dtype((np.void, width)))
+    return rows.ravel().tolist()
+
+
+class EntityKeySerializer:
+    """
+    Encodes the join key values of a feature view into compact binary keys.
+
+    Values are encoded by their entity's ``value_type`` in sorted join key
+    order: integers, floats, booleans and timestamps as fixed-width
+    little-endian numbers, strings and bytes as length-prefixed bytes, and
+    other types with the tagged untyped encoding. Whole columns are encoded
+    at once; when every join key is fixed-width the keys are cut from one
+    packed NumPy buffer.
+
+    A row with a null join key (None, NaN, NaT) has no key: it is encoded as
+    None, which never matches a stored entity, so reading it is a miss.
+    """
+
+    def __init__(self, join_keys: Sequence[str], value_types: Mapping[str, ValueType]):
+        self.join_keys = sorted(join_keys)
+        self.value_types = [
+            value_types.get(join_key, ValueType.UNKNOWN) for join_key in self.join_keys
+        ]
+
+    @classmethod
+    def for_feature_view(cls, feature_view: FeatureView) -> "EntityKeySerializer":
+        """Create the serializer for the join keys of a feature view"""
+        value_types = {
+            join_key: entity.value_type
+            for entity in feature_view.entities
+            for join_key in entity.join_keys
+        }
+        return cls(feature_view.get_join_keys(), value_types)
+
+    def encode(self, row: Mapping[str, Any]) -> Optional[bytes]:
+        """Encode the key of one entity row"""
+        return self.encode_columns({key: [row[key]] for key in self.join_keys})[0]
+
+    def encode_rows(self, rows: Sequence[Mapping[str, Any]]) -> List[Optional[bytes]]:
+        """Encode the keys of entity rows"""
+        return self.encode_columns(
+            {key: [row[key] for row in rows] for key in self.join_keys}
+        )
+
+    def encode_columns(self, columns: Mapping[str, Any]) -> List[Optional[bytes]]:
+        """Encode the keys of a dataframe or of a mapping of key columns"""
+        nulls = None
+        for join_key in self.join_keys:
+            null = np.asarray(pd.isna(columns[join_key]), dtype=bool)
+            nulls = null if nulls is None else nulls | null
+        if nulls is None or not nulls.any():
+            return self._encode_columns(columns)
+
+        keep = ~nulls
+        encoded = iter(
+            self._encode_columns(
+                {
+                    join_key: np.asarray(columns[join_key], dtype=object)[keep]
+                    for join_key in self.join_keys
+                }
+            )
+        )
+        return [next(encoded) if kept else None for kept in keep]
+
+    def _encode_columns(self, columns: Mapping[str, Any]) -> List[bytes]:
+        """Encode key columns without nulls"""
+        fixed: List[np.ndarray] = []
+        parts: List[List[bytes]] = []
+        for join_key, value_type in zip(self.join_keys, self.value_types):
+            values = columns[join_key]
+            if value_type in _FIXED_WIDTH_DTYPES:
+                array = _fixed_width(values, value_type, join_key)
+                fixed.append(array.reshape(-1, 1).view(np.uint8))
+            else:
+                # Keep byte order: pack the fixed-width keys seen so far first
+                if fixed:
+                    parts.append(_as_bytes(np.hstack(fixed)))
+                    fixed = []
+                if value_type in (ValueType.STRING, ValueType.BYTES):
+                    parts.append(_length_prefixed(values, value_type))
+                else:
+                    parts.append([encode_entity_key([value]) for value in values])
+
+        if fixed:
+            packed = _as_bytes(np.hstack(fixed))
+            if not parts:
+                return packed
+            parts.append(packed)
+        if len(parts) == 1:
+            return parts[0]
+        return [b"".join(key_parts) for key_parts in zip(*parts)]
@@ -2,28 +2,209 @@
 Memory online store implementation for the Feature Store
 """
 
+import asyncio
+import json
+import os
 import threading
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+import time
+import uuid
+import weakref
+from typing import Dict, Any, List, Optional, Tuple, Union
+from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 from .base import OnlineStore
+from .columnar_table import ColumnarTable
+from .entity_key import EntityKeySerializer
 from ..core.feature_view import FeatureView
 
 
+def _to_local_datetime64(values: pd.Series) -> np.ndarray:
+    """Convert timestamps to naive local datetime64[ns], like datetime.now()"""
+    values = pd.to_datetime(values)
+    if values.dt.tz is not None:
+        local_tz = datetime.now().astimezone().tzinfo
+        values = values.dt.tz_convert(local_tz).dt.tz_localize(None)
+    return values.to_numpy(dtype="datetime64[ns]")
+
+
+def _ttl_cutoff(ttl: timedelta) -> np.datetime64:
+    """Oldest event time still within the TTL"""
+    return np.datetime64(datetime.now() - ttl, "ns")
+
+
+# File listing the feature view files of a snapshot directory
+SNAPSHOT_MANIFEST = "manifest.json"
+
+
+def _read_manifest(manifest_path: str) -> Optional[Dict[str, Any]]:
+    """Read a snapshot manifest, None if there is none"""
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _read_snapshot_table(file_path: str, memory_map: bool) -> ColumnarTable:
+    """Read the table of one feature view from a snapshot file"""
+    source = pa.memory_map(file_path) if memory_map else pa.OSFile(file_path)
+    with source:
+        arrow_table = pa.ipc.open_file(source).read_all()
+    return ColumnarTable.from_arrow(arrow_table)
+
+
+# Counters reported per feature view
+_COUNTER_NAMES = ("hits", "misses", "evictions")
+
+
+_Counts = Dict[Tuple[str, str], int]
+
+
+class _Stripe:
+    """Counts of one thread, held only by that thread's thread-local"""
+
+    def __init__(self):
+        self.counts: _Counts = {}
+
+
+def _retire_stripe(
+    counts: _Counts,
+    stripes: Dict[int, _Counts],
+    retired: _Counts,
+    lock: threading.Lock,
+) -> None:
+    """Fold the counts of an exited thread into the retired totals"""
+    with lock:
+        if stripes.pop(id(counts), None) is None:
+            return
+        for key, value in counts.items():
+            retired[key] = retired.get(key, 0) + value
+
+
+class _StripedCounters:
+    """
+    Per-thread counters, so readers never contend on a shared lock.
+
+    A stripe is folded into shared retired totals when its thread exits, so
+    short-lived threads do not leave one stripe each behind.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Live stripes by id of their counts, and counts of exited threads
+        self._stripes: Dict[int, _Counts] = {}
+        self._retired: _Counts = {}
+
+    def add(self, fv_name: str, name: str, value: int) -> None:
+        stripe = getattr(self._local, "stripe", None)
+        if stripe is None:
+            stripe = self._local.stripe = _Stripe()
+            with self._lock:
+                self._stripes[id(stripe.counts)] = stripe.counts
+            # The thread-local drops the stripe when its thread exits
+            weakref.finalize(
+                stripe,
+                _retire_stripe,
+                stripe.counts,
+                self._stripes,
+                self._retired,
+                self._lock,
+            )
+        key = (fv_name, name)
+        stripe.counts[key] = stripe.counts.get(key, 0) + value
+
+    def totals(self) -> Dict[str, Dict[str, int]]:
+        """Sum the stripes into {feature_view_name: {counter: value}}"""
+        result: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            # Copied together, so a stripe retiring meanwhile counts once
+            stripes = [dict(self._retired)] + list(self._stripes.values())
+        for stripe in stripes:
+            for (fv_name, name), value in dict(stripe).items():
+                counters = result.setdefault(fv_name, dict.fromkeys(_COUNTER_NAMES, 0))
+                counters[name] += value
+        return result
+
+    def discard(self, fv_name: Optional[str] = None) -> None:
+        """Reset the counters of a feature view, or all counters"""
+        with self._lock:
+            for stripe in [self._retired, *self._stripes.values()]:
+                for key in list(stripe):
+                    if fv_name is None or key[0] == fv_name:
+                        stripe.pop(key, None)
+
+
 class MemoryOnlineStore(OnlineStore):
     """
     Memory-based online store implementation.
-    Stores features in memory using dictionaries for fast access.
+    Stores features in memory using one columnar table per feature view:
+    a hash index from entity key to row position plus one typed NumPy array
+    per feature, so reads are a vectorized gather over the requested rows.
+
+    Every table has its own write lock, so feature views are written
+    independently, and reads take no lock at all: they never wait for a bulk
+    write, only retry a lookup that overlapped one of its short publish
+    batches.
+
+    With `max_entities` or `max_bytes` set, every feature view is bounded to
+    that many entities (or approximate bytes) and the store acts as a cache:
+    writes beyond the bound evict entities chosen by `eviction_policy`
+    (``"lru"`` or ``"lfu"``), and hits, misses and evictions are reported by
+    `get_metadata`.
+
+    With `snapshot_path` set, the store is restored from that snapshot
+    directory on start. FeatureStore saves it there after every
+    materialization; call `save_snapshot` to save it at other times, e.g.
+    after pushes.
     """
 
-    def __init__(self):
+    # Snapshots may predate the last materialization, so they do not count
+    persistent = False
+
+    def __init__(
+        self,
+        write_batch_size: int = ColumnarTable.DEFAULT_BATCH_SIZE,
+        snapshot_path: Optional[str] = None,
+        sweep_interval_seconds: Optional[float] = 60.0,
+        max_entities: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        eviction_policy: str = "lru",
+    ):
         super().__init__()
-        # Dictionary to store features: {feature_view_name: {entity_key: {feature_name: value}}}
-        self._features: Dict[str, Dict[str, Dict[str, Any]]] = {}
-        # Dictionary to store timestamps: {feature_view_name: {entity_key: timestamp}}
-        self._timestamps: Dict[str, Dict[str, datetime]] = {}
-        # Lock for thread safety
+        if max_entities is not None and max_entities < 1:
+            raise ValueError("max_entities must be at least 1")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        if eviction_policy not in ColumnarTable.EVICTION_POLICIES:
+            raise ValueError(f"Unsupported eviction policy: {eviction_policy}")
+        # Columnar tables: {feature_view_name: ColumnarTable}
+        self._tables: Dict[str, ColumnarTable] = {}
+        # Guards the set of tables; reads and table writes do not take it
         self._lock = threading.RLock()
+        # Maximum rows merged per lock acquisition during bulk writes
+        self._write_batch_size = write_batch_size
+        # TTL of each feature view as of its last write, used by the sweeper
+        self._ttls: Dict[str, timedelta] = {}
+        # Expired entities are swept on writes at most this often (never if None)
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._last_sweep = time.monotonic()
+        self._sweep_lock = threading.Lock()
+        self._expired_entities = 0
+        # Capacity bound per feature view; None leaves tables unbounded
+        self.max_entities = max_entities
+        self.max_bytes = max_bytes
+        self.eviction_policy = eviction_policy
+        # Hit, miss and eviction counters per feature view
+        self._counters = _StripedCounters()
+        # Directory the store is saved to and restored from
+        self.snapshot_path = snapshot_path
+        if snapshot_path and os.path.exists(
+            os.path.join(snapshot_path, SNAPSHOT_MANIFEST)
+        ):
+            self.load_snapshot(snapshot_path)
 
     def write_features(
         self,
@@ -31,36 +212,87 @@ class MemoryOnlineStore(OnlineStore):
         df: pd.DataFrame,
         timestamp: Optional[datetime] = None,
     ) -> None:
-        """Write features to the memory store"""
+        """
+        Write features to the memory store.
+
+        Keys and feature columns are built column at a time from the
+        dataframe; the table then merges them in batches, taking the store
+        lock only for short publish phases so readers are not blocked for the
+        duration of a bulk write.
+        """
         self.validate_feature_data(feature_view, df)
 
         if timestamp is None:
             timestamp = datetime.now()
 
         join_keys = feature_view.get_join_keys()
-        feature_names = feature_view.get_feature_names()
+
+        # The last row for an entity wins, as with row-by-row upserts
+        duplicated = df.duplicated(subset=join_keys, keep="last").to_numpy()
+        if duplicated.any():
+            df = df[~duplicated]
+
+        entity_keys = self._create_entity_keys(feature_view, df)
+        event_timestamps = None
+        timestamp_field = feature_view.source.timestamp_field
+        if timestamp_field:
+            event_timestamps = _to_local_datetime64(df[timestamp_field])
+        columns = {
+            feature_name: df[feature_name].to_numpy()
+            for feature_name in feature_view.get_feature_names()
+        }
 
         with self._lock:
             # Initialize feature view storage if not exists
-            if feature_view.name not in self._features:
-                self._features[feature_view.name] = {}
-                self._timestamps[feature_view.name] = {}
-
-            # Process each row
-            for _, row in df.iterrows():
-                # Create entity key from join keys
-                entity_key = self._create_entity_key(row, join_keys)
-
-                # Store features for this entity
-                self._features[feature_view.name][entity_key] = {}
-                for feature_name in feature_names:
-                    if feature_name in row:
-                        self._features[feature_view.name][entity_key][feature_name] = (
-                            row[feature_name]
-                        )
-
-                # Store timestamp
-                self._timestamps[feature_view.name][entity_key] = timestamp
+            table = self._tables.get(feature_view.name)
+            if table is None:
+                table = ColumnarTable(feature_view.features)
+                self._tables[feature_view.name] = table
+            if feature_view.ttl:
+                self._ttls[feature_view.name] = feature_view.ttl
+            else:
+                self._ttls.pop(feature_view.name, None)
+
+        # A bounded table is filled in chunks of at most its capacity, evicting
+        # after each one, so it never holds more than twice its bound
+        chunk_size = self._capacity(table) if self.is_bounded else len(entity_keys)
+        for start in range(0, len(entity_keys), max(chunk_size, 1)):
+            end = start + chunk_size
+            table.upsert(
+                entity_keys[start:end],
+                {name: values[start:end] for name, values in columns.items()},
+                timestamp,
+                batch_size=self._write_batch_size,
+                event_timestamps=(
+                    None if event_timestamps is None else event_timestamps[start:end]
+                ),
+            )
+            if self.is_bounded:
+                self._enforce_capacity(feature_view.name, table)
+
+        self._maybe_sweep()
+
+    @property
+    def is_bounded(self) -> bool:
+        """Whether feature views are bounded to a capacity"""
+        return self.max_entities is not None or self.max_bytes is not None
+
+    def _capacity(self, table: ColumnarTable) -> int:
+        """Maximum number of entities a table may hold"""
+        capacity = self.max_entities or np.iinfo(np.int64).max
+        if self.max_bytes is not None:
+            capacity = min(capacity, int(self.max_bytes // table.row_nbytes()))
+        return max(capacity, 1)
+
+    def _enforce_capacity(self, fv_name: str, table: ColumnarTable) -> None:
+        """Evict entities from a table until it fits its capacity"""
+        excess = len(table) - self._capacity(table)
+        if excess <= 0:
+            return
+        evicted = table.evict(
+            excess, policy=self.eviction_policy, batch_size=self._write_batch_size
+        )
+        self._counters.add(fv_name, "evictions", evicted)
 
     def read_features(
         self,
@@ -69,98 +301,318 @@ class MemoryOnlineStore(OnlineStore):
         feature_names: Optional[List[str]] = None,
     ) -> pd.DataFrame:
         """Read features from the memory store"""
+        if feature_names is None:
+            feature_names = feature_view.get_feature_names()
+
+        # Check if feature view exists
+        if feature_view.name not in self._tables:
+            self.validate_entity_rows(feature_view, entity_rows)
+            # Return empty dataframe with correct schema
+            columns = feature_view.get_join_keys() + feature_names
+            return pd.DataFrame(columns=columns)
+
+        values = self.read_feature_columns(feature_view, entity_rows, feature_names)
+
+        # Start with entity values; entities not found get null features
+        result_df = pd.DataFrame(entity_rows)
+        for feature_name in feature_names:
+            result_df[feature_name] = values[feature_name]
+
+        return result_df
+
+    def read_feature_columns(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Read features as one array per feature without building a dataframe"""
+        values, _ = self.lookup_feature_columns(
+            feature_view, entity_rows, feature_names
+        )
+        return values
+
+    def lookup_feature_columns(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Read features plus a mask of the entities held with fresh values"""
         self.validate_entity_rows(feature_view, entity_rows)
 
         if feature_names is None:
             feature_names = feature_view.get_feature_names()
 
-        join_keys = feature_view.get_join_keys()
+        entity_keys = self._create_entity_keys(feature_view, entity_rows)
+
+        # No lock: the table read retries if it overlaps a publish
+        table = self._tables.get(feature_view.name)
+        if table is None:
+            self._counters.add(feature_view.name, "misses", len(entity_rows))
+            values = {
+                feature_name: np.full(len(entity_rows), None, dtype=object)
+                for feature_name in feature_names
+            }
+            return values, np.zeros(len(entity_rows), dtype=bool)
+
+        # Values older than the TTL are served as missing
+        cutoff = _ttl_cutoff(feature_view.ttl) if feature_view.ttl else None
+        values, rows = table.read(entity_keys, feature_names, cutoff)
+        found = rows >= 0
+        hits = int(np.count_nonzero(found))
+        self._counters.add(feature_view.name, "hits", hits)
+        self._counters.add(feature_view.name, "misses", len(rows) - hits)
+        if self.is_bounded:
+            table.touch(rows)
+        return values, found
+
+    # Reads are lock-free and small writes only publish in-memory batches, so
+    # those run inline instead of hopping to a worker thread
+
+    # Async writes of more rows than this run in a worker thread
+    ASYNC_INLINE_MAX_ROWS = 1024
+
+    async def write_features_async(
+        self,
+        feature_view: FeatureView,
+        df: pd.DataFrame,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        """
+        Write features, on the calling event loop if the write is small.
+
+        Larger writes, and writes that would start an expiry sweep, run in a
+        worker thread so they do not stall the loop.
+        """
+        if len(df) > self.ASYNC_INLINE_MAX_ROWS or self._sweep_due():
+            await asyncio.to_thread(self.write_features, feature_view, df, timestamp)
+        else:
+            self.write_features(feature_view, df, timestamp)
+
+    async def read_feature_columns_async(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Read features on the calling event loop"""
+        return self.read_feature_columns(feature_view, entity_rows, feature_names)
+
+    async def lookup_feature_columns_async(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Look up features on the calling event loop"""
+        return self.lookup_feature_columns(feature_view, entity_rows, feature_names)
+
+    def sweep_expired(self) -> int:
+        """
+        Evict entities whose event time is older than their feature view TTL.
+
+        Each table finds its expired rows in bulk and unpublishes them in short
+        batches, so readers are never held up for long. Returns the number of
+        evicted entities.
+        """
+        with self._sweep_lock:
+            self._last_sweep = time.monotonic()
+            with self._lock:
+                targets = [
+                    (self._tables[name], ttl)
+                    for name, ttl in self._ttls.items()
+                    if name in self._tables
+                ]
+
+            expired = 0
+            for table, ttl in targets:
+                expired += table.expire(
+                    _ttl_cutoff(ttl), batch_size=self._write_batch_size
+                )
+            self._expired_entities += expired
+            return expired
+
+    def _sweep_due(self) -> bool:
+        """Whether the sweep interval has passed and no sweep is running"""
+        if self.sweep_interval_seconds is None:
+            return False
+        if time.monotonic() - self._last_sweep < self.sweep_interval_seconds:
+            return False
+        # Another writer is already sweeping
+        return not self._sweep_lock.locked()
+
+    def _maybe_sweep(self) -> None:
+        """Sweep expired entities if the sweep interval has passed"""
+        if self._sweep_due():
+            self.sweep_expired()
+
+    def save_snapshot(self, path: Optional[str] = None) -> None:
+        """
+        Save the store to a snapshot directory.
+
+        Every feature view is written to an Arrow IPC file next to a manifest.
+        Each save writes files under new names and replaces the manifest last,
+        so a process loading the snapshot sees either the old or the new
+        files, never a partial or reused one. Files the previous manifest
+        listed are removed once the new manifest is in place.
+        """
+        path = path or self.snapshot_path
+        if not path:
+            raise ValueError("No snapshot path given")
+        os.makedirs(path, exist_ok=True)
 
-        result_rows = []
+        with self._lock:
+            tables = dict(self._tables)
+
+        manifest_path = os.path.join(path, SNAPSHOT_MANIFEST)
+        previous = _read_manifest(manifest_path)
+        generation = uuid.uuid4().hex
+        manifest = {"feature_views": {}}
+        for i, (fv_name, table) in enumerate(tables.items()):
+            file_name = f"{generation}-{i}.arrow"
+            arrow_table = table.to_arrow()
+            tmp_path = os.path.join(path, f".{file_name}.tmp")
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, arrow_table.schema) as writer:
+                    writer.write_table(arrow_table)
+            os.replace(tmp_path, os.path.join(path, file_name))
+            manifest["feature_views"][fv_name] = file_name
+
+        tmp_path = os.path.join(path, f".{SNAPSHOT_MANIFEST}.{generation}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, manifest_path)
+
+        if previous:
+            for file_name in previous["feature_views"].values():
+                try:
+                    os.remove(os.path.join(path, file_name))
+                except OSError:
+                    # Already removed, or still mapped where that prevents it
+                    pass
+
+    def load_snapshot(
+        self, path: Optional[str] = None, memory_map: bool = True
+    ) -> None:
+        """
+        Replace the contents of the store with a snapshot.
+
+        With `memory_map`, fixed-width feature columns stay in the mapped files
+        instead of being read into memory, so loading is fast and processes
+        mapping the same snapshot share one copy of the pages. Only the key
+        index and object columns are rebuilt in memory.
+        """
+        path = path or self.snapshot_path
+        if not path:
+            raise ValueError("No snapshot path given")
+
+        manifest_path = os.path.join(path, SNAPSHOT_MANIFEST)
+        manifest = _read_manifest(manifest_path)
+        if manifest is None:
+            raise ValueError(f"No snapshot found in '{path}'")
+        while True:
+            try:
+                tables = {
+                    fv_name: _read_snapshot_table(
+                        os.path.join(path, file_name), memory_map
+                    )
+                    for fv_name, file_name in manifest["feature_views"].items()
+                }
+                break
+            except FileNotFoundError:
+                # A save replaced the manifest and removed these files meanwhile
+                latest = _read_manifest(manifest_path)
+                if latest is None or latest == manifest:
+                    raise
+                manifest = latest
 
         with self._lock:
-            # Check if feature view exists
-            if feature_view.name not in self._features:
-                # Return empty dataframe with correct schema
-                columns = join_keys + feature_names
-                return pd.DataFrame(columns=columns)
-
-            # Process each entity row
-            for entity_row in entity_rows:
-                entity_key = self._create_entity_key(entity_row, join_keys)
-
-                # Start with entity values
-                result_row = entity_row.copy()
-
-                # Add feature values if entity exists
-                if entity_key in self._features[feature_view.name]:
-                    features = self._features[feature_view.name][entity_key]
-                    for feature_name in feature_names:
-                        if feature_name in features:
-                            result_row[feature_name] = features[feature_name]
-                        else:
-                            result_row[feature_name] = None
-                else:
-                    # Entity not found, set all features to None
-                    for feature_name in feature_names:
-                        result_row[feature_name] = None
-
-                result_rows.append(result_row)
-
-        return pd.DataFrame(result_rows)
+            self._tables = tables
 
     def delete_features(self, feature_view: FeatureView) -> None:
         """Delete all features for a feature view"""
         with self._lock:
-            if feature_view.name in self._features:
-                del self._features[feature_view.name]
-            if feature_view.name in self._timestamps:
-                del self._timestamps[feature_view.name]
+            if feature_view.name in self._tables:
+                del self._tables[feature_view.name]
+        self._counters.discard(feature_view.name)
 
     def teardown(self) -> None:
         """Clean up memory store resources"""
         with self._lock:
-            self._features.clear()
-            self._timestamps.clear()
+            self._tables.clear()
+        self._counters.discard()
+
+    def _create_entity_keys(
+        self,
+        feature_view: FeatureView,
+        data: Union[pd.DataFrame, List[Dict[str, Any]]],
+    ) -> List[Any]:
+        """
+        Create the entity keys of a dataframe or of entity rows.
 
-    def _create_entity_key(self, row: Dict[str, Any], join_keys: List[str]) -> str:
-        """Create a unique entity key from join key values"""
-        key_values = []
-        for join_key in sorted(join_keys):  # Sort for consistent ordering
-            key_values.append(f"{join_key}={row[join_key]}")
-        return "|".join(key_values)
+        Keys are packed column at a time into compact bytes keys by
+        EntityKeySerializer, even for a single join key, so a value is
+        normalized by its entity's type ("1001" and 1001 are the same INT64
+        key) exactly as in the other online stores.
+        """
+        serializer = EntityKeySerializer.for_feature_view(feature_view)
+        if isinstance(data, pd.DataFrame):
+            return serializer.encode_columns(data)
+        return serializer.encode_rows(data)
 
     def get_feature_view_names(self) -> List[str]:
         """Get list of feature view names in the store"""
         with self._lock:
-            return list(self._features.keys())
+            return list(self._tables.keys())
 
     def get_entity_count(self, feature_view_name: str) -> int:
         """Get count of entities for a feature view"""
         with self._lock:
-            if feature_view_name in self._features:
-                return len(self._features[feature_view_name])
+            if feature_view_name in self._tables:
+                return len(self._tables[feature_view_name])
             return 0
 
     def get_metadata(self) -> Dict[str, Any]:
         """Get store metadata"""
+        counters = self._counters.totals()
         with self._lock:
-            metadata = {"type": "memory", "feature_views": {}, "total_entities": 0}
+            metadata = {
+                "type": "memory",
+                "feature_views": {},
+                "total_entities": 0,
+                "memory_bytes": 0,
+                "expired_entities": self._expired_entities,
+                "max_entities": self.max_entities,
+                "max_bytes": self.max_bytes,
+                "eviction_policy": self.eviction_policy,
+                "hits": 0,
+                "misses": 0,
+                "evictions": 0,
+            }
 
-            for fv_name, entities in self._features.items():
-                entity_count = len(entities)
+            for fv_name, table in self._tables.items():
+                entity_count = len(table)
+                memory_bytes = table.nbytes()
                 metadata["feature_views"][fv_name] = {
                     "entity_count": entity_count,
-                    "features": (
-                        list(list(entities.values())[0].keys()) if entities else []
-                    ),
+                    "features": table.feature_names,
+                    "memory_bytes": memory_bytes,
+                    **counters.get(fv_name, dict.fromkeys(_COUNTER_NAMES, 0)),
                 }
                 metadata["total_entities"] += entity_count
+                metadata["memory_bytes"] += memory_bytes
+
+            for fv_counters in counters.values():
+                for name, value in fv_counters.items():
+                    metadata[name] += value
+            lookups = metadata["hits"] + metadata["misses"]
+            metadata["hit_rate"] = metadata["hits"] / lookups if lookups else None
 
             return metadata
 
     def clear(self) -> None:
         """Clear all data from the store"""
         with self._lock:
-            self._features.clear()
-            self._timestamps.clear()
+            self._tables.clear()
+        self._counters.discard()
@@ -0,0 +1,730 @@
+"""
+Redis online store implementation for the Feature Store
+"""
+
+import asyncio
+import json
+import queue
+import socket
+import struct
+import threading
+import zlib
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Dict, Any, Iterator, List, Optional, Sequence, Tuple
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_list_like
+from .base import EVENT_TIMESTAMP_COLUMN, OnlineStore
+from .columnar_table import storage_dtype, take_with_missing
+from .entity_key import EntityKeySerializer
+from ..core.feature import Feature
+from ..core.feature_view import FeatureView
+from ..core.types import ValueType
+
+
+class RedisError(Exception):
+    """Error reply from the server"""
+
+
+def _encode_command(args: Sequence[Any]) -> bytes:
+    """Encode a command as a RESP array of bulk strings"""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode("utf-8")
+        elif isinstance(arg, int):
+            arg = str(arg).encode("ascii")
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+class RedisConnection:
+    """A single connection speaking the Redis serialization protocol (RESP2)"""
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        socket_timeout: Optional[float] = 5.0,
+    ):
+        self._sock = socket.create_connection((host, port), timeout=socket_timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        if password:
+            self.execute("AUTH", password)
+        if db:
+            self.execute("SELECT", db)
+
+    def execute(self, *args: Any) -> Any:
+        """Send one command and read its reply"""
+        return self.pipeline([args])[0]
+
+    def pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """
+        Send commands in one write and read all replies.
+
+        Error replies are raised after every reply has been read, so the
+        connection stays usable.
+        """
+        self._sock.sendall(b"".join(_encode_command(args) for args in commands))
+        replies = [self._read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            return RedisError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise ConnectionError(f"Unexpected reply from server: {line!r}")
+
+    def close(self) -> None:
+        try:
+            self._reader.close()
+        finally:
+            self._sock.close()
+
+
+class RedisConnectionPool:
+    """
+    Reuses open connections across threads.
+
+    At most `max_connections` are open at once; callers wait for a free one.
+    A connection that failed mid-command is closed instead of being returned.
+    """
+
+    def __init__(self, max_connections: int = 16, **connection_kwargs: Any):
+        self.max_connections = max_connections
+        self._connection_kwargs = connection_kwargs
+        self._idle: "queue.LifoQueue[RedisConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+        self._open = 0
+
+    @contextmanager
+    def connection(self) -> Iterator[RedisConnection]:
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = RedisConnection(**self._connection_kwargs)
+                with self._lock:
+                    self._open += 1
+            # Error replies leave the connection in a clean state; anything
+            # else may have left unread replies behind
+            reusable = False
+            try:
+                yield conn
+                reusable = True
+            except RedisError:
+                reusable = True
+                raise
+            finally:
+                if reusable:
+                    self._idle.put(conn)
+                else:
+                    conn.close()
+                    with self._lock:
+                        self._open -= 1
+        finally:
+            self._slots.release()
+
+    @property
+    def open_connections(self) -> int:
+        return self._open
+
+    def close(self) -> None:
+        """Close the idle connections"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._open -= 1
+
+
+class AsyncRedisConnection:
+    """A RESP2 connection on asyncio streams, for use on one event loop"""
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        socket_timeout: Optional[float] = 5.0,
+    ):
+        self._reader = reader
+        self._writer = writer
+        self._timeout = socket_timeout
+
+    @classmethod
+    async def open(
+        cls,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        socket_timeout: Optional[float] = 5.0,
+    ) -> "AsyncRedisConnection":
+        # asyncio turns on TCP_NODELAY for TCP streams
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), socket_timeout
+        )
+        conn = cls(reader, writer, socket_timeout)
+        if password:
+            await conn.execute("AUTH", password)
+        if db:
+            await conn.execute("SELECT", db)
+        return conn
+
+    async def execute(self, *args: Any) -> Any:
+        """Send one command and read its reply"""
+        return (await self.pipeline([args]))[0]
+
+    async def pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """Send commands in one write and read all replies, like RedisConnection"""
+        self._writer.write(b"".join(_encode_command(args) for args in commands))
+        await self._writer.drain()
+        replies = await asyncio.wait_for(
+            self._read_replies(len(commands)), self._timeout
+        )
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    async def _read_replies(self, count: int) -> List[Any]:
+        return [await self._read_reply() for _ in range(count)]
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            return RedisError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        raise ConnectionError(f"Unexpected reply from server: {line!r}")
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class AsyncRedisConnectionPool:
+    """
+    Reuses open asyncio connections across the tasks of one event loop.
+
+    Behaves like RedisConnectionPool: at most `max_connections` are open at
+    once and a connection that failed mid-command is closed.
+    """
+
+    def __init__(self, max_connections: int = 16, **connection_kwargs: Any):
+        self.max_connections = max_connections
+        self.loop = asyncio.get_running_loop()
+        self._connection_kwargs = connection_kwargs
+        self._idle: List[AsyncRedisConnection] = []
+        self._slots = asyncio.Semaphore(max_connections)
+        self._open = 0
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[AsyncRedisConnection]:
+        async with self._slots:
+            if self._idle:
+                conn = self._idle.pop()
+            else:
+                conn = await AsyncRedisConnection.open(**self._connection_kwargs)
+                self._open += 1
+            reusable = False
+            try:
+                yield conn
+                reusable = True
+            except RedisError:
+                reusable = True
+                raise
+            finally:
+                if reusable:
+                    self._idle.append(conn)
+                else:
+                    conn.close()
+                    self._open -= 1
+
+    @property
+    def open_connections(self) -> int:
+        return self._open
+
+    def close(self) -> None:
+        """Close the idle connections"""
+        while self._idle:
+            conn = self._idle.pop()
+            self._open -= 1
+            try:
+                conn.close()
+            except RuntimeError:
+                # The event loop of the connection is already closed
+                pass
+
+
+def _field_name(feature_view_name: str, feature_name: str) -> bytes:
+    """Short hashed hash-field name of a feature"""
+    return struct.pack(
+        ">I", zlib.crc32(f"{feature_view_name}:{feature_name}".encode("utf-8"))
+    )
+
+
+def _timestamp_field_name(feature_view_name: str) -> bytes:
+    return f"_ts:{feature_view_name}".encode("utf-8")
+
+
+def _encode_values(values: pd.Series, feature: Feature) -> List[Optional[bytes]]:
+    """Encode a feature column to bytes, None for missing values"""
+    if feature.dtype == ValueType.UNIX_TIMESTAMP:
+        timestamps = pd.to_datetime(values)
+        if timestamps.dt.tz is not None:
+            timestamps = timestamps.dt.tz_convert("UTC").dt.tz_localize(None)
+        nanos = timestamps.to_numpy(dtype="datetime64[ns]").view(np.int64).tolist()
+        return [
+            None if t is pd.NaT else str(n).encode("ascii")
+            for t, n in zip(timestamps, nanos)
+        ]
+    if storage_dtype(feature.dtype) == object and feature.dtype not in (
+        ValueType.STRING,
+        ValueType.BYTES,
+    ):
+        return [
+            (
+                json.dumps(np.asarray(value).tolist()).encode("utf-8")
+                if is_list_like(value)
+                else None
+            )
+            for value in values
+        ]
+
+    encoded = []
+    for value in values.astype(object).where(values.notna(), None).tolist():
+        if value is None:
+            encoded.append(None)
+        elif isinstance(value, bytes):
+            encoded.append(value)
+        elif isinstance(value, float):
+            encoded.append(repr(value).encode("ascii"))
+        elif isinstance(value, (bool, np.bool_)):
+            encoded.append(b"1" if value else b"0")
+        else:
+            encoded.append(str(value).encode("utf-8"))
+    return encoded
+
+
+def _decode_values(values: List[Optional[bytes]], feature: Feature) -> np.ndarray:
+    """Decode values read from Redis to an array in the storage dtype"""
+    dtype = storage_dtype(feature.dtype)
+    if feature.dtype == ValueType.BYTES:
+        decoded = values
+    elif feature.dtype == ValueType.STRING:
+        decoded = [None if v is None else v.decode("utf-8") for v in values]
+    elif feature.dtype == ValueType.BOOL:
+        decoded = [None if v is None else v == b"1" for v in values]
+    elif dtype.kind in "iuM":
+        decoded = [None if v is None else int(v) for v in values]
+    elif dtype.kind == "f":
+        decoded = [None if v is None else float(v) for v in values]
+    else:
+        decoded = [None if v is None else json.loads(v) for v in values]
+    try:
+        return np.array(decoded, dtype=dtype)
+    except (TypeError, ValueError):
+        # e.g. missing values in an integer column
+        return np.array(decoded, dtype=object)
+
+
+class RedisOnlineStore(OnlineStore):
+    """
+    Redis-based online store implementation.
+
+    Each entity is one Redis hash keyed by the project, the join key names and
+    the binary entity key, so feature views sharing an entity share a hash.
+    Features are stored under short hashed field names derived from the feature
+    view and feature name. Writes are pipelined HSET batches and reads are
+    pipelined HMGET batches over a pool of connections. The async methods send
+    the same pipelines over asyncio connections of the running event loop.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        key_prefix: str = "",
+        max_connections: int = 16,
+        pipeline_batch_size: int = 1000,
+        socket_timeout: Optional[float] = 5.0,
+    ):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.key_prefix = key_prefix
+        self._pipeline_batch_size = pipeline_batch_size
+        self._connection_kwargs = dict(
+            host=host,
+            port=port,
+            db=db,
+            password=password,
+            socket_timeout=socket_timeout,
+        )
+        self._max_connections = max_connections
+        self._pool = RedisConnectionPool(
+            max_connections=max_connections, **self._connection_kwargs
+        )
+        # asyncio connections belong to one event loop; the pool is replaced
+        # when the store is used from a different loop
+        self._async_pool: Optional[AsyncRedisConnectionPool] = None
+        self._async_pool_lock = threading.Lock()
+
+    def _key_namespace(self, feature_view: FeatureView) -> bytes:
+        join_keys = ",".join(sorted(feature_view.get_join_keys()))
+        return f"{self.key_prefix}:{join_keys}:".encode("utf-8")
+
+    def _redis_keys(
+        self, feature_view: FeatureView, entity_keys: List[Optional[bytes]]
+    ) -> List[Optional[bytes]]:
+        namespace = self._key_namespace(feature_view)
+        # Rows with a null join key have no key and are never fetched
+        return [
+            None if entity_key is None else namespace + entity_key
+            for entity_key in entity_keys
+        ]
+
+    def _pipeline(self, commands: List[List[Any]]) -> List[Any]:
+        """Run commands in pipelined batches"""
+        replies = []
+        with self._pool.connection() as conn:
+            for start in range(0, len(commands), self._pipeline_batch_size):
+                replies.extend(
+                    conn.pipeline(commands[start : start + self._pipeline_batch_size])
+                )
+        return replies
+
+    def _get_async_pool(self) -> AsyncRedisConnectionPool:
+        """Connection pool of the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._async_pool_lock:
+            if self._async_pool is None or self._async_pool.loop is not loop:
+                self._async_pool = AsyncRedisConnectionPool(
+                    max_connections=self._max_connections, **self._connection_kwargs
+                )
+            return self._async_pool
+
+    async def _pipeline_async(self, commands: List[List[Any]]) -> List[Any]:
+        """Run commands in pipelined batches without blocking the event loop"""
+        replies = []
+        async with self._get_async_pool().connection() as conn:
+            for start in range(0, len(commands), self._pipeline_batch_size):
+                replies.extend(
+                    await conn.pipeline(
+                        commands[start : start + self._pipeline_batch_size]
+                    )
+                )
+        return replies
+
+    def write_features(
+        self,
+        feature_view: FeatureView,
+        df: pd.DataFrame,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        """Write features to Redis with pipelined HSET commands"""
+        self._pipeline(self._write_commands(feature_view, df))
+
+    async def write_features_async(
+        self,
+        feature_view: FeatureView,
+        df: pd.DataFrame,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        """Write features over an asyncio connection"""
+        await self._pipeline_async(self._write_commands(feature_view, df))
+
+    def _write_commands(
+        self, feature_view: FeatureView, df: pd.DataFrame
+    ) -> List[List[Any]]:
+        """HSET and HDEL commands writing a dataframe of features"""
+        self.validate_feature_data(feature_view, df)
+
+        join_keys = feature_view.get_join_keys()
+
+        # The last row for an entity wins
+        duplicated = df.duplicated(subset=join_keys, keep="last").to_numpy()
+        if duplicated.any():
+            df = df[~duplicated]
+
+        serializer = EntityKeySerializer.for_feature_view(feature_view)
+        keys = self._redis_keys(feature_view, serializer.encode_columns(df))
+
+        fields = [
+            _field_name(feature_view.name, feature.name)
+            for feature in feature_view.features
+        ]
+        values = [
+            _encode_values(df[feature.name], feature)
+            for feature in feature_view.features
+        ]
+
+        timestamp_field = feature_view.source.timestamp_field
+        if timestamp_field:
+            fields.append(_timestamp_field_name(feature_view.name))
+            values.append(
+                _encode_values(
+                    df[timestamp_field],
+                    Feature(timestamp_field, ValueType.UNIX_TIMESTAMP),
+                )
+            )
+
+        commands = []
+        for i, key in enumerate(keys):
+            hset = [b"HSET", key]
+            hdel = [b"HDEL", key]
+            for field, column in zip(fields, values):
+                if column[i] is None:
+                    hdel.append(field)
+                else:
+                    hset.extend((field, column[i]))
+            if len(hset) > 2:
+                commands.append(hset)
+            if len(hdel) > 2:
+                commands.append(hdel)
+        return commands
+
+    def read_features(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """Read features from Redis"""
+        if feature_names is None:
+            feature_names = feature_view.get_feature_names()
+
+        values = self.read_feature_columns(feature_view, entity_rows, feature_names)
+
+        # Start with entity values; entities not found get null features
+        result_df = pd.DataFrame(entity_rows)
+        for feature_name in feature_names:
+            result_df[feature_name] = values[feature_name]
+
+        return result_df
+
+    def read_feature_columns(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Read features as one array per feature with pipelined HMGET commands"""
+        values, _ = self.lookup_feature_columns(
+            feature_view, entity_rows, feature_names
+        )
+        return values
+
+    def lookup_feature_columns(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Read features plus a mask of the entities with any requested feature"""
+        if feature_names is None:
+            feature_names = feature_view.get_feature_names()
+        read = self._hmget(feature_view, entity_rows, feature_names)
+        replies = self._pipeline(read.commands) if read.commands else []
+        return read.decode(replies)
+
+    async def read_feature_columns_async(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Read features over an asyncio connection"""
+        values, _ = await self.lookup_feature_columns_async(
+            feature_view, entity_rows, feature_names
+        )
+        return values
+
+    async def lookup_feature_columns_async(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Look up features over an asyncio connection"""
+        if feature_names is None:
+            feature_names = feature_view.get_feature_names()
+        read = self._hmget(feature_view, entity_rows, feature_names)
+        replies = await self._pipeline_async(read.commands) if read.commands else []
+        return read.decode(replies)
+
+    def _hmget(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: List[str],
+    ) -> "_HashRead":
+        """Plan the HMGET commands reading features of entity rows"""
+        self.validate_entity_rows(feature_view, entity_rows)
+        serializer = EntityKeySerializer.for_feature_view(feature_view)
+        return _HashRead(
+            feature_view,
+            feature_names,
+            self._redis_keys(feature_view, serializer.encode_rows(entity_rows)),
+        )
+
+    def _scan(self, pattern: bytes) -> Iterator[bytes]:
+        """Iterate over the keys matching a pattern"""
+        cursor = b"0"
+        with self._pool.connection() as conn:
+            while True:
+                cursor, keys = conn.execute(
+                    b"SCAN", cursor, b"MATCH", pattern, b"COUNT", 1000
+                )
+                yield from keys
+                if cursor == b"0":
+                    break
+
+    def delete_features(self, feature_view: FeatureView) -> None:
+        """Delete all features for a feature view"""
+        fields = [
+            _field_name(feature_view.name, feature.name)
+            for feature in feature_view.features
+        ] + [_timestamp_field_name(feature_view.name)]
+        pattern = _escape_pattern(self._key_namespace(feature_view)) + b"*"
+        keys = list(self._scan(pattern))
+        self._pipeline([[b"HDEL", key, *fields] for key in keys])
+
+    def teardown(self) -> None:
+        """Close connections; data in Redis is shared and left in place"""
+        self._pool.close()
+        with self._async_pool_lock:
+            if self._async_pool is not None:
+                self._async_pool.close()
+                self._async_pool = None
+
+    def get_metadata(self) -> Dict[str, Any]:
+        """Get store metadata"""
+        return {
+            "type": "redis",
+            "host": self.host,
+            "port": self.port,
+            "key_prefix": self.key_prefix,
+            "open_connections": self._pool.open_connections,
+            "open_async_connections": (
+                self._async_pool.open_connections if self._async_pool else 0
+            ),
+        }
+
+
+class _HashRead:
+    """HMGET commands for a batch of entity keys and the decoding of replies"""
+
+    def __init__(
+        self,
+        feature_view: FeatureView,
+        feature_names: List[str],
+        keys: List[Optional[bytes]],
+    ):
+        self.features_by_name = {
+            feature.name: feature for feature in feature_view.features
+        }
+        self.features_by_name[EVENT_TIMESTAMP_COLUMN] = Feature(
+            EVENT_TIMESTAMP_COLUMN, ValueType.UNIX_TIMESTAMP
+        )
+        self.feature_names = feature_names
+        self.known = [name for name in feature_names if name in self.features_by_name]
+        self.keys = keys
+        # Fetch every distinct key once
+        self.unique_keys = [key for key in dict.fromkeys(keys) if key is not None]
+        fields = [
+            (
+                _timestamp_field_name(feature_view.name)
+                if name == EVENT_TIMESTAMP_COLUMN
+                else _field_name(feature_view.name, name)
+            )
+            for name in self.known
+        ]
+        self.commands = (
+            [[b"HMGET", key, *fields] for key in self.unique_keys] if fields else []
+        )
+
+    def decode(self, replies: List[Any]) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Feature arrays aligned with the keys, and the mask of found keys"""
+        # An entity is found if any of the requested features is set
+        found_positions = {}
+        fetched = []
+        for key, reply in zip(self.unique_keys, replies):
+            if any(value is not None for value in reply):
+                found_positions[key] = len(fetched)
+                fetched.append(reply)
+
+        rows = np.fromiter(
+            (found_positions.get(key, -1) for key in self.keys),
+            dtype=np.int64,
+            count=len(self.keys),
+        )
+        found = rows >= 0
+
+        result = {}
+        for feature_name in self.feature_names:
+            if feature_name not in self.known or not fetched:
+                result[feature_name] = np.full(len(self.keys), None, dtype=object)
+                continue
+            column = self.known.index(feature_name)
+            decoded = _decode_values(
+                [reply[column] for reply in fetched],
+                self.features_by_name[feature_name],
+            )
+            result[feature_name] = take_with_missing(decoded, rows, found)
+        return result, found
+
+
+def _escape_pattern(value: bytes) -> bytes:
+    """Escape glob characters for SCAN MATCH"""
+    for char in (b"\\", b"*", b"?", b"[", b"]"):
+        value = value.replace(char, b"\\" + char)
+    return value
@@ -0,0 +1,474 @@
+"""
+SQLite online store implementation for the Feature Store
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_list_like
+from .base import EVENT_TIMESTAMP_COLUMN, OnlineStore
+from .columnar_table import storage_dtype, take_with_missing
+from .entity_key import EntityKeySerializer
+from ..core.feature import Feature
+from ..core.feature_view import FeatureView
+from ..core.sqlite_connections import SqliteConnectionPool
+from ..core.types import ValueType
+
+# Stay below SQLite's bound parameter limit in IN (...) lookups
+_MAX_KEYS_PER_QUERY = 900
+
+_LIST_TYPES = {
+    ValueType.BYTES_LIST,
+    ValueType.STRING_LIST,
+    ValueType.INT32_LIST,
+    ValueType.INT64_LIST,
+    ValueType.DOUBLE_LIST,
+    ValueType.FLOAT_LIST,
+    ValueType.BOOL_LIST,
+    ValueType.UNIX_TIMESTAMP_LIST,
+}
+
+
+def _quote(identifier: str) -> str:
+    """Quote an SQL identifier"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _sql_type(value_type: ValueType) -> str:
+    """Get the SQLite column type used to store a feature type"""
+    if value_type in (ValueType.INT32, ValueType.INT64, ValueType.BOOL):
+        return "INTEGER"
+    if value_type == ValueType.UNIX_TIMESTAMP:
+        return "INTEGER"
+    if value_type in (ValueType.FLOAT, ValueType.DOUBLE):
+        return "REAL"
+    if value_type == ValueType.BYTES:
+        return "BLOB"
+    return "TEXT"
+
+
+def _to_sql_values(values: pd.Series, feature: Feature) -> List[Any]:
+    """Convert a feature column to values SQLite can bind"""
+    if feature.dtype == ValueType.UNIX_TIMESTAMP:
+        timestamps = pd.to_datetime(values)
+        if timestamps.dt.tz is not None:
+            timestamps = timestamps.dt.tz_convert("UTC").dt.tz_localize(None)
+        nanos = timestamps.to_numpy(dtype="datetime64[ns]").view(np.int64).tolist()
+        return [None if t is pd.NaT else n for t, n in zip(timestamps, nanos)]
+    if feature.dtype in _LIST_TYPES:
+        return [
+            json.dumps(np.asarray(value).tolist()) if is_list_like(value) else None
+            for value in values
+        ]
+    # NaN and pandas' NA markers are stored as NULL
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def _from_sql_values(values: List[Any], feature: Feature) -> np.ndarray:
+    """Convert values read from SQLite to an array in the storage dtype"""
+    if feature.dtype in _LIST_TYPES:
+        values = [None if value is None else json.loads(value) for value in values]
+    dtype = storage_dtype(feature.dtype)
+    try:
+        return np.array(values, dtype=dtype)
+    except (TypeError, ValueError):
+        # e.g. NULLs in an integer column
+        return np.array(values, dtype=object)
+
+
+def _is_stale_schema_error(error: sqlite3.OperationalError) -> bool:
+    """Whether an error comes from a table or column missing from the cache"""
+    message = str(error)
+    return any(
+        text in message
+        for text in ("no such table", "no such column", "has no column named")
+    )
+
+
+class SqliteOnlineStore(OnlineStore):
+    """
+    SQLite-based online store implementation.
+
+    Every feature view is a table keyed by the binary entity key, with one
+    column per feature, so data survives restarts and can be shared by the
+    serving processes of one host. The database runs in WAL mode, each thread
+    keeps its own connection, writes are batched executemany upserts and reads
+    look up many keys per IN query.
+    """
+
+    def __init__(self, path: str = "online_store.db", write_batch_size: int = 10_000):
+        super().__init__()
+        self.path = path
+        self._write_batch_size = write_batch_size
+        # One connection per thread, closed when the thread exits
+        self._pool = SqliteConnectionPool(self.path)
+        # Columns known to exist per table, to skip schema checks on every write
+        self._known_columns: Dict[str, set] = {}
+        self._schema_lock = threading.Lock()
+
+        db_dir = os.path.dirname(self.path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection"""
+        return self._pool.connection()
+
+    def _table_name(self, feature_view_name: str) -> str:
+        return f"fv_{feature_view_name}"
+
+    def _table_columns(self, conn: sqlite3.Connection, table: str) -> set:
+        """Get the columns of a table, empty if it does not exist"""
+        cursor = conn.execute(f"PRAGMA table_info({_quote(table)})")
+        return {row[1] for row in cursor.fetchall()}
+
+    def _ensure_table(
+        self, conn: sqlite3.Connection, feature_view: FeatureView
+    ) -> None:
+        """Create the feature view table, adding columns for new features"""
+        table = self._table_name(feature_view.name)
+        with self._schema_lock:
+            known = self._known_columns.get(table, set())
+            if all(feature.name in known for feature in feature_view.features):
+                return
+
+            columns = self._table_columns(conn, table)
+            if not columns:
+                feature_columns = "".join(
+                    f", {_quote(feature.name)} {_sql_type(feature.dtype)}"
+                    for feature in feature_view.features
+                )
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {_quote(table)} ("
+                    "entity_key BLOB PRIMARY KEY, "
+                    "event_timestamp INTEGER, "
+                    f"write_timestamp INTEGER{feature_columns}"
+                    ") WITHOUT ROWID"
+                )
+            else:
+                for feature in feature_view.features:
+                    if feature.name not in columns:
+                        conn.execute(
+                            f"ALTER TABLE {_quote(table)} ADD COLUMN "
+                            f"{_quote(feature.name)} {_sql_type(feature.dtype)}"
+                        )
+            conn.commit()
+            self._known_columns[table] = self._table_columns(conn, table)
+
+    def write_features(
+        self,
+        feature_view: FeatureView,
+        df: pd.DataFrame,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        """Write features to the SQLite store in one transaction"""
+        self.validate_feature_data(feature_view, df)
+
+        if timestamp is None:
+            timestamp = datetime.now()
+
+        join_keys = feature_view.get_join_keys()
+
+        # The last row for an entity wins
+        duplicated = df.duplicated(subset=join_keys, keep="last").to_numpy()
+        if duplicated.any():
+            df = df[~duplicated]
+
+        conn = self._connect()
+        self._ensure_table(conn, feature_view)
+
+        entity_keys = EntityKeySerializer.for_feature_view(feature_view).encode_columns(
+            df
+        )
+
+        timestamp_field = feature_view.source.timestamp_field
+        if timestamp_field:
+            event_timestamps = _to_sql_values(
+                df[timestamp_field], Feature(timestamp_field, ValueType.UNIX_TIMESTAMP)
+            )
+        else:
+            event_timestamps = [None] * len(df)
+        write_timestamp = int(pd.Timestamp(timestamp).value)
+
+        feature_values = [
+            _to_sql_values(df[feature.name], feature)
+            for feature in feature_view.features
+        ]
+
+        columns = ["entity_key", "event_timestamp", "write_timestamp"] + [
+            feature.name for feature in feature_view.features
+        ]
+        sql = (
+            f"INSERT OR REPLACE INTO {_quote(self._table_name(feature_view.name))} "
+            f"({', '.join(_quote(column) for column in columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})"
+        )
+
+        def rows():
+            return zip(
+                entity_keys,
+                event_timestamps,
+                [write_timestamp] * len(df),
+                *feature_values,
+            )
+
+        try:
+            self._upsert(conn, sql, rows())
+        except sqlite3.OperationalError as e:
+            if not _is_stale_schema_error(e):
+                raise
+            # Another process or store dropped the table or altered it since
+            # its columns were cached; the failed transaction was rolled back
+            with self._schema_lock:
+                self._known_columns.pop(self._table_name(feature_view.name), None)
+            self._ensure_table(conn, feature_view)
+            self._upsert(conn, sql, rows())
+
+    def _upsert(
+        self, conn: sqlite3.Connection, sql: str, rows: Iterator[tuple]
+    ) -> None:
+        """Run an upsert over rows in batches, in one transaction"""
+        with conn:
+            while True:
+                batch = [row for _, row in zip(range(self._write_batch_size), rows)]
+                if not batch:
+                    break
+                conn.executemany(sql, batch)
+
+    def read_features(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """Read features from the SQLite store"""
+        if feature_names is None:
+            feature_names = feature_view.get_feature_names()
+
+        if not self._has_table(feature_view.name):
+            self.validate_entity_rows(feature_view, entity_rows)
+            # Return empty dataframe with correct schema
+            columns = feature_view.get_join_keys() + feature_names
+            return pd.DataFrame(columns=columns)
+
+        values = self.read_feature_columns(feature_view, entity_rows, feature_names)
+
+        # Start with entity values; entities not found get null features
+        result_df = pd.DataFrame(entity_rows)
+        for feature_name in feature_names:
+            result_df[feature_name] = values[feature_name]
+
+        return result_df
+
+    def read_feature_columns(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Read features as one array per feature with batched IN lookups"""
+        values, _ = self.lookup_feature_columns(
+            feature_view, entity_rows, feature_names
+        )
+        return values
+
+    def lookup_feature_columns(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Read features plus a mask of the entities that have a stored row"""
+        self.validate_entity_rows(feature_view, entity_rows)
+
+        if feature_names is None:
+            feature_names = feature_view.get_feature_names()
+
+        features_by_name = {feature.name: feature for feature in feature_view.features}
+        features_by_name[EVENT_TIMESTAMP_COLUMN] = Feature(
+            "event_timestamp", ValueType.UNIX_TIMESTAMP
+        )
+        missing = np.full(len(entity_rows), None, dtype=object)
+        conn = self._connect()
+        table = self._table_name(feature_view.name)
+        stored = self._stored_columns(
+            conn,
+            table,
+            [
+                features_by_name[name].name
+                for name in feature_names
+                if name in features_by_name
+            ],
+        )
+        if not stored:
+            values = {feature_name: missing.copy() for feature_name in feature_names}
+            return values, np.zeros(len(entity_rows), dtype=bool)
+
+        serializer = EntityKeySerializer.for_feature_view(feature_view)
+        entity_keys = serializer.encode_rows(entity_rows)
+
+        selected = [
+            name
+            for name in feature_names
+            if name in features_by_name and features_by_name[name].name in stored
+        ]
+        column_sql = ", ".join(
+            ["entity_key"] + [_quote(features_by_name[name].name) for name in selected]
+        )
+
+        # Fetch every distinct key once, many keys per query
+        unique_keys = list(dict.fromkeys(entity_keys))
+        fetched = []
+        try:
+            for start in range(0, len(unique_keys), _MAX_KEYS_PER_QUERY):
+                chunk = unique_keys[start : start + _MAX_KEYS_PER_QUERY]
+                cursor = conn.execute(
+                    f"SELECT {column_sql} FROM {_quote(table)} "
+                    f"WHERE entity_key IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                fetched.extend(cursor.fetchall())
+        except sqlite3.OperationalError:
+            # The table was dropped since its columns were looked up
+            if self._table_columns(conn, table):
+                raise
+            with self._schema_lock:
+                self._known_columns.pop(table, None)
+            values = {feature_name: missing.copy() for feature_name in feature_names}
+            return values, np.zeros(len(entity_rows), dtype=bool)
+
+        positions = {row[0]: i for i, row in enumerate(fetched)}
+        rows = np.fromiter(
+            (positions.get(key, -1) for key in entity_keys),
+            dtype=np.int64,
+            count=len(entity_keys),
+        )
+        found = rows >= 0
+
+        result = {}
+        for feature_name in feature_names:
+            if feature_name not in selected:
+                result[feature_name] = missing.copy()
+                continue
+            column = selected.index(feature_name) + 1
+            values = _from_sql_values(
+                [row[column] for row in fetched], features_by_name[feature_name]
+            )
+            if len(values) == 0:
+                result[feature_name] = missing.copy()
+            else:
+                result[feature_name] = take_with_missing(values, rows, found)
+        return result, found
+
+    def _stored_columns(
+        self, conn: sqlite3.Connection, table: str, columns: List[str]
+    ) -> set:
+        """
+        Get the columns of a table, empty if it does not exist.
+
+        The cached columns are used while they include every wanted column;
+        otherwise they are refreshed from the database, since another
+        process may have added the column.
+        """
+        with self._schema_lock:
+            known = self._known_columns.get(table)
+        if known and all(column in known for column in columns):
+            return known
+        stored = self._table_columns(conn, table)
+        with self._schema_lock:
+            if stored:
+                self._known_columns[table] = stored
+            else:
+                self._known_columns.pop(table, None)
+        return stored
+
+    def _has_table(self, feature_view_name: str) -> bool:
+        """Check whether a feature view has been written"""
+        table = self._table_name(feature_view_name)
+        with self._schema_lock:
+            if self._known_columns.get(table):
+                return True
+        columns = self._table_columns(self._connect(), table)
+        if columns:
+            with self._schema_lock:
+                self._known_columns.setdefault(table, columns)
+        return bool(columns)
+
+    def delete_features(self, feature_view: FeatureView) -> None:
+        """Delete all features for a feature view"""
+        table = self._table_name(feature_view.name)
+        with self._schema_lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+            self._known_columns.pop(table, None)
+
+    def teardown(self) -> None:
+        """Clean up SQLite store resources"""
+        self._pool.close()
+        self._known_columns.clear()
+        for path in (self.path, f"{self.path}-wal", f"{self.path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def get_feature_view_names(self) -> List[str]:
+        """Get list of feature view names in the store"""
+        cursor = self._connect().execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name"
+        )
+        return [
+            row[0][len("fv_") :]
+            for row in cursor.fetchall()
+            if row[0].startswith("fv_")
+        ]
+
+    def get_entity_count(self, feature_view_name: str) -> int:
+        """Get count of entities for a feature view"""
+        if not self._has_table(feature_view_name):
+            return 0
+        table = _quote(self._table_name(feature_view_name))
+        cursor = self._connect().execute(f"SELECT COUNT(*) FROM {table}")
+        return cursor.fetchone()[0]
+
+    def get_metadata(self) -> Dict[str, Any]:
+        """Get store metadata"""
+        metadata = {
+            "type": "sqlite",
+            "path": self.path,
+            "feature_views": {},
+            "total_entities": 0,
+        }
+
+        conn = self._connect()
+        for fv_name in self.get_feature_view_names():
+            table = self._table_name(fv_name)
+            entity_count = self.get_entity_count(fv_name)
+            features = [
+                column
+                for column in self._table_columns(conn, table)
+                if column not in ("entity_key", "event_timestamp", "write_timestamp")
+            ]
+            metadata["feature_views"][fv_name] = {
+                "entity_count": entity_count,
+                "features": sorted(features),
+            }
+            metadata["total_entities"] += entity_count
+
+        return metadata
+
+    def clear(self) -> None:
+        """Clear all data from the store"""
+        with self._schema_lock:
+            conn = self._connect()
+            tables = [
+                self._table_name(fv_name) for fv_name in self.get_feature_view_names()
+            ]
+            with conn:
+                for table in tables:
+                    conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+            self._known_columns.clear()
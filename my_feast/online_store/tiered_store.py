@@ -0,0 +1,570 @@
+"""
+Tiered online store implementation for the Feature Store
+"""
+
+import asyncio
+import contextlib
+import queue
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from .base import EVENT_TIMESTAMP_COLUMN, OnlineStore
+from .entity_key import EntityKeySerializer
+from .memory_store import MemoryOnlineStore
+from ..core.feature_view import FeatureView
+
+
+def _assign(target: np.ndarray, positions: np.ndarray, values: np.ndarray):
+    """Write values into target positions, widening target's dtype if needed"""
+    if values.dtype != target.dtype:
+        try:
+            dtype = np.result_type(target.dtype, values.dtype)
+        except TypeError:
+            dtype = np.dtype(object)
+        target = target.astype(dtype)
+    target[positions] = values
+    return target
+
+
+class _TierLatency:
+    """Call, row and time counters for the reads and writes of one tier"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {
+            "reads": 0,
+            "read_rows": 0,
+            "read_seconds": 0.0,
+            "writes": 0,
+            "write_rows": 0,
+            "write_seconds": 0.0,
+        }
+
+    @contextlib.contextmanager
+    def timed(self, operation: str, rows: int):
+        """Time a "read" or "write" of `rows` entities"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._counters[f"{operation}s"] += 1
+                self._counters[f"{operation}_rows"] += rows
+                self._counters[f"{operation}_seconds"] += elapsed
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Counters plus the mean latency per call in milliseconds"""
+        with self._lock:
+            result = dict(self._counters)
+        for operation in ("read", "write"):
+            calls = result[f"{operation}s"]
+            result[f"mean_{operation}_ms"] = (
+                1000 * result[f"{operation}_seconds"] / calls if calls else None
+            )
+        return result
+
+
+class TieredOnlineStore(OnlineStore):
+    """
+    Read-through cache of a persistent online store.
+
+    Reads are served from a MemoryOnlineStore (L1); the entities it misses are
+    fetched from the persistent store (L2) in one batched call and cached in
+    L1, while entities L2 does not hold either are remembered for
+    `negative_cache_ttl_seconds` so repeated lookups of unknown keys stay in
+    memory. Bound L1 with its `max_entities` or `max_bytes` to use it as a hot
+    cache. Cached rows keep their L2 event time, so feature view TTLs count
+    from the event, and a fetch that overlapped a write is not cached.
+
+    With ``write_mode="through"`` writes go to L2 and then L1 before
+    returning. With ``write_mode="behind"`` they go to L1 and are queued for a
+    background thread that writes them to L2; `flush` waits for the queue
+    and raises the first failed write.
+    """
+
+    WRITE_MODES = ("through", "behind")
+
+    def __init__(
+        self,
+        l2: OnlineStore,
+        l1: Optional[MemoryOnlineStore] = None,
+        write_mode: str = "through",
+        negative_cache_ttl_seconds: Optional[float] = 60.0,
+        negative_cache_max_entries: int = 100_000,
+        max_pending_writes: int = 16,
+    ):
+        super().__init__()
+        if write_mode not in self.WRITE_MODES:
+            raise ValueError(f"Unsupported write mode: {write_mode}")
+        self.l1 = l1 if l1 is not None else MemoryOnlineStore()
+        self.l2 = l2
+        self.write_mode = write_mode
+        # Unknown entities: {feature_view_name: {entity_key: expiry}}
+        self.negative_cache_ttl_seconds = negative_cache_ttl_seconds
+        self.negative_cache_max_entries = negative_cache_max_entries
+        self._negative: Dict[str, "OrderedDict[Any, float]"] = {}
+        self._negative_lock = threading.Lock()
+        self._negative_hits = 0
+        self._latency = {"l1": _TierLatency(), "l2": _TierLatency()}
+        # Write-behind queue, drained by a worker thread started on first use
+        self._pending: "queue.Queue" = queue.Queue(maxsize=max_pending_writes)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._write_error: Optional[Exception] = None
+        self._failed_writes = 0
+        # Writes started and in flight per feature view, None for all views.
+        # A read-through only fills L1 if no write overlapped its L2 read.
+        self._write_generations: Dict[Optional[str], int] = {}
+        self._writes_in_flight: Dict[Optional[str], int] = {}
+        self._generation_lock = threading.Lock()
+
+    @property
+    def persistent(self) -> bool:
+        return self.l2.persistent
+
+    def write_features(
+        self,
+        feature_view: FeatureView,
+        df: pd.DataFrame,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        """Write features through to L2 or queue them behind L1"""
+        self.validate_feature_data(feature_view, df)
+
+        if timestamp is None:
+            timestamp = datetime.now()
+
+        self._begin_write(feature_view.name)
+        if self.write_mode == "through":
+            try:
+                with self._latency["l2"].timed("write", len(df)):
+                    self.l2.write_features(feature_view, df, timestamp)
+                with self._latency["l1"].timed("write", len(df)):
+                    self.l1.write_features(feature_view, df, timestamp)
+                self._forget_missing(feature_view, df)
+            finally:
+                self._end_write(feature_view.name)
+            return
+
+        try:
+            with self._latency["l1"].timed("write", len(df)):
+                self.l1.write_features(feature_view, df, timestamp)
+            self._forget_missing(feature_view, df)
+            self._ensure_worker()
+            # Blocks while the queue is full, so writers cannot outrun L2
+            self._pending.put((feature_view, df.copy(), timestamp))
+        except BaseException:
+            self._end_write(feature_view.name)
+            raise
+
+    async def write_features_async(
+        self,
+        feature_view: FeatureView,
+        df: pd.DataFrame,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        """Async variant of write_features"""
+        self.validate_feature_data(feature_view, df)
+
+        if timestamp is None:
+            timestamp = datetime.now()
+
+        self._begin_write(feature_view.name)
+        if self.write_mode == "through":
+            try:
+                with self._latency["l2"].timed("write", len(df)):
+                    await self.l2.write_features_async(feature_view, df, timestamp)
+                with self._latency["l1"].timed("write", len(df)):
+                    await self.l1.write_features_async(feature_view, df, timestamp)
+                self._forget_missing(feature_view, df)
+            finally:
+                self._end_write(feature_view.name)
+            return
+
+        try:
+            with self._latency["l1"].timed("write", len(df)):
+                await self.l1.write_features_async(feature_view, df, timestamp)
+            self._forget_missing(feature_view, df)
+            self._ensure_worker()
+            item = (feature_view, df.copy(), timestamp)
+            try:
+                self._pending.put_nowait(item)
+            except queue.Full:
+                # Wait for the worker off the event loop
+                await asyncio.to_thread(self._pending.put, item)
+        except BaseException:
+            self._end_write(feature_view.name)
+            raise
+
+    def _ensure_worker(self) -> None:
+        """Start the write-behind thread if it is not running"""
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._write_behind, name="tiered-write-behind", daemon=True
+                )
+                self._worker.start()
+
+    def _write_behind(self) -> None:
+        """Write queued features to L2 until a None item arrives"""
+        while True:
+            item = self._pending.get()
+            try:
+                if item is None:
+                    return
+                feature_view, df, timestamp = item
+                try:
+                    with self._latency["l2"].timed("write", len(df)):
+                        self.l2.write_features(feature_view, df, timestamp)
+                    # Reads during the write may have cached these keys as unknown
+                    self._forget_missing(feature_view, df)
+                finally:
+                    self._end_write(feature_view.name)
+            except Exception as e:
+                self._failed_writes += 1
+                if self._write_error is None:
+                    self._write_error = e
+            finally:
+                self._pending.task_done()
+
+    def _begin_write(self, fv_name: Optional[str]) -> None:
+        """Record a write to a feature view, or to all views for None"""
+        with self._generation_lock:
+            self._write_generations[fv_name] = (
+                self._write_generations.get(fv_name, 0) + 1
+            )
+            self._writes_in_flight[fv_name] = self._writes_in_flight.get(fv_name, 0) + 1
+
+    def _end_write(self, fv_name: Optional[str]) -> None:
+        with self._generation_lock:
+            self._writes_in_flight[fv_name] -= 1
+
+    def _write_generation(self, fv_name: str) -> Optional[Tuple[int, int]]:
+        """Writes started so far for a feature view, None while one is in flight"""
+        with self._generation_lock:
+            if self._writes_in_flight.get(fv_name) or self._writes_in_flight.get(None):
+                return None
+            return (
+                self._write_generations.get(fv_name, 0),
+                self._write_generations.get(None, 0),
+            )
+
+    def _l2_feature_names(self, feature_view: FeatureView) -> List[str]:
+        """All features, plus the event time when the view has one"""
+        feature_names = feature_view.get_feature_names()
+        if feature_view.source.timestamp_field:
+            feature_names.append(EVENT_TIMESTAMP_COLUMN)
+        return feature_names
+
+    def flush(self) -> None:
+        """Wait for queued writes to reach L2; raise the first failed write"""
+        self._pending.join()
+        error, self._write_error = self._write_error, None
+        if error is not None:
+            raise error
+
+    def read_features(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """Read features from L1, falling back to L2 for misses"""
+        if feature_names is None:
+            feature_names = feature_view.get_feature_names()
+
+        values = self.read_feature_columns(feature_view, entity_rows, feature_names)
+
+        # Start with entity values; entities not found get null features
+        result_df = pd.DataFrame(entity_rows)
+        for feature_name in feature_names:
+            result_df[feature_name] = values[feature_name]
+
+        return result_df
+
+    def read_feature_columns(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Read features as one array per feature, falling back to L2 for misses"""
+        values, _ = self.lookup_feature_columns(
+            feature_view, entity_rows, feature_names
+        )
+        return values
+
+    def lookup_feature_columns(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Read features plus a mask of the entities found in either tier"""
+        self.validate_entity_rows(feature_view, entity_rows)
+
+        if feature_names is None:
+            feature_names = feature_view.get_feature_names()
+
+        with self._latency["l1"].timed("read", len(entity_rows)):
+            values, found = self.l1.lookup_feature_columns(
+                feature_view, entity_rows, feature_names
+            )
+        fetch, fetch_keys = self._l2_misses(feature_view, entity_rows, found)
+        if not len(fetch):
+            return values, found
+
+        # All features are fetched, so the cached rows are complete
+        fetch_rows = [entity_rows[i] for i in fetch]
+        generation = self._write_generation(feature_view.name)
+        with self._latency["l2"].timed("read", len(fetch_rows)):
+            fetched, fetched_found = self.l2.lookup_feature_columns(
+                feature_view, fetch_rows, self._l2_feature_names(feature_view)
+            )
+        self._merge_l2(
+            feature_view,
+            values,
+            found,
+            fetch,
+            fetch_rows,
+            fetch_keys,
+            fetched,
+            fetched_found,
+            generation,
+        )
+        return values, found
+
+    async def read_feature_columns_async(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Async variant of read_feature_columns"""
+        values, _ = await self.lookup_feature_columns_async(
+            feature_view, entity_rows, feature_names
+        )
+        return values
+
+    async def lookup_feature_columns_async(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        feature_names: Optional[List[str]] = None,
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Async lookup that only leaves the event loop for L2 misses"""
+        self.validate_entity_rows(feature_view, entity_rows)
+
+        if feature_names is None:
+            feature_names = feature_view.get_feature_names()
+
+        with self._latency["l1"].timed("read", len(entity_rows)):
+            values, found = await self.l1.lookup_feature_columns_async(
+                feature_view, entity_rows, feature_names
+            )
+        fetch, fetch_keys = self._l2_misses(feature_view, entity_rows, found)
+        if not len(fetch):
+            return values, found
+
+        fetch_rows = [entity_rows[i] for i in fetch]
+        generation = self._write_generation(feature_view.name)
+        with self._latency["l2"].timed("read", len(fetch_rows)):
+            fetched, fetched_found = await self.l2.lookup_feature_columns_async(
+                feature_view, fetch_rows, self._l2_feature_names(feature_view)
+            )
+        self._merge_l2(
+            feature_view,
+            values,
+            found,
+            fetch,
+            fetch_rows,
+            fetch_keys,
+            fetched,
+            fetched_found,
+            generation,
+        )
+        return values, found
+
+    def _l2_misses(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        found: np.ndarray,
+    ) -> Tuple[np.ndarray, List[Any]]:
+        """Positions and keys of the L1 misses not cached as unknown to L2"""
+        misses = np.flatnonzero(~found)
+        if not len(misses):
+            return misses, []
+        serializer = EntityKeySerializer.for_feature_view(feature_view)
+        miss_keys = serializer.encode_rows([entity_rows[i] for i in misses])
+        known_missing = self._known_missing(feature_view.name, miss_keys)
+        fetch_keys = [
+            key for key, missing in zip(miss_keys, known_missing) if not missing
+        ]
+        return misses[~known_missing], fetch_keys
+
+    def _merge_l2(
+        self,
+        feature_view: FeatureView,
+        values: Dict[str, np.ndarray],
+        found: np.ndarray,
+        fetch: np.ndarray,
+        fetch_rows: List[Dict[str, Any]],
+        fetch_keys: List[Any],
+        fetched: Dict[str, np.ndarray],
+        fetched_found: np.ndarray,
+        generation: Optional[Tuple[int, int]],
+    ) -> None:
+        """
+        Place rows fetched from L2 into the result and cache them in L1.
+
+        Nothing is cached if a write overlapped the L2 read, since the rows
+        read may be older than the ones the write put in L1.
+        """
+        for feature_name in values:
+            values[feature_name] = _assign(
+                values[feature_name], fetch, fetched[feature_name]
+            )
+        found[fetch] = fetched_found
+
+        # Writers only bump the generation under this lock, so no write can
+        # start between the check and the cache fill
+        with self._generation_lock:
+            if generation is None or generation != (
+                self._write_generations.get(feature_view.name, 0),
+                self._write_generations.get(None, 0),
+            ):
+                return
+            self._cache(feature_view, fetch_rows, fetched, fetched_found)
+            self._remember_missing(
+                feature_view.name,
+                [key for key, hit in zip(fetch_keys, fetched_found) if not hit],
+            )
+
+    def _cache(
+        self,
+        feature_view: FeatureView,
+        entity_rows: List[Dict[str, Any]],
+        values: Dict[str, np.ndarray],
+        found: np.ndarray,
+    ) -> None:
+        """Copy the rows fetched from L2 into L1"""
+        if not found.any():
+            return
+        df = pd.DataFrame([row for row, hit in zip(entity_rows, found) if hit])
+        for feature in feature_view.features:
+            df[feature.name] = values[feature.name][found]
+        # Keep the event time of L2 so the TTL still counts from the event;
+        # L1 falls back to the write time where it is unknown
+        timestamp_field = feature_view.source.timestamp_field
+        if timestamp_field:
+            df[timestamp_field] = values[EVENT_TIMESTAMP_COLUMN][found]
+        self.l1.write_features(feature_view, df)
+
+    def _known_missing(self, fv_name: str, keys: List[Any]) -> np.ndarray:
+        """Mask of keys cached as unknown to L2"""
+        result = np.zeros(len(keys), dtype=bool)
+        with self._negative_lock:
+            cache = self._negative.get(fv_name)
+            if not cache:
+                return result
+            now = time.monotonic()
+            for i, key in enumerate(keys):
+                expiry = cache.get(key)
+                if expiry is None:
+                    continue
+                if expiry > now:
+                    result[i] = True
+                else:
+                    del cache[key]
+            self._negative_hits += int(result.sum())
+        return result
+
+    def _remember_missing(self, fv_name: str, keys: List[Any]) -> None:
+        """Cache keys as unknown to L2, dropping the oldest entries when full"""
+        if not keys or not self.negative_cache_ttl_seconds:
+            return
+        expiry = time.monotonic() + self.negative_cache_ttl_seconds
+        with self._negative_lock:
+            cache = self._negative.setdefault(fv_name, OrderedDict())
+            for key in keys:
+                cache[key] = expiry
+                cache.move_to_end(key)
+            while len(cache) > self.negative_cache_max_entries:
+                cache.popitem(last=False)
+
+    def _forget_missing(self, feature_view: FeatureView, df: pd.DataFrame) -> None:
+        """Drop written keys from the negative cache"""
+        with self._negative_lock:
+            cache = self._negative.get(feature_view.name)
+            if not cache:
+                return
+            serializer = EntityKeySerializer.for_feature_view(feature_view)
+            for key in serializer.encode_columns(df):
+                cache.pop(key, None)
+
+    def delete_features(self, feature_view: FeatureView) -> None:
+        """Delete all features for a feature view from both tiers"""
+        self.flush()
+        self._begin_write(feature_view.name)
+        try:
+            self.l1.delete_features(feature_view)
+            self.l2.delete_features(feature_view)
+            with self._negative_lock:
+                self._negative.pop(feature_view.name, None)
+        finally:
+            self._end_write(feature_view.name)
+
+    def teardown(self) -> None:
+        """Write pending features, then clean up both tiers"""
+        try:
+            self.flush()
+        finally:
+            with self._worker_lock:
+                if self._worker is not None:
+                    self._pending.put(None)
+                    self._worker.join()
+                    self._worker = None
+            self.l1.teardown()
+            self.l2.teardown()
+
+    def get_feature_view_names(self) -> List[str]:
+        """Get list of feature view names in the persistent tier"""
+        return self.l2.get_feature_view_names()
+
+    def get_entity_count(self, feature_view_name: str) -> int:
+        """Get count of entities for a feature view in the persistent tier"""
+        return self.l2.get_entity_count(feature_view_name)
+
+    def get_metadata(self) -> Dict[str, Any]:
+        """Get store metadata, including per-tier latencies"""
+        with self._negative_lock:
+            negative_entries = sum(len(cache) for cache in self._negative.values())
+            negative_hits = self._negative_hits
+        return {
+            "type": "tiered",
+            "write_mode": self.write_mode,
+            "l1": {**self.l1.get_metadata(), "latency": self._latency["l1"].to_dict()},
+            "l2": {**self.l2.get_metadata(), "latency": self._latency["l2"].to_dict()},
+            "negative_cache_entries": negative_entries,
+            "negative_cache_hits": negative_hits,
+            "pending_writes": self._pending.qsize(),
+            "failed_writes": self._failed_writes,
+        }
+
+    def clear(self) -> None:
+        """Clear all data from both tiers"""
+        self.flush()
+        self._begin_write(None)
+        try:
+            self.l1.clear()
+            self.l2.clear()
+            with self._negative_lock:
+                self._negative.clear()
+        finally:
+            self._end_write(None)
@@ -4,6 +4,7 @@ Base registry class for the Feature Store
 
 from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any
+from datetime import datetime
 from ..core.entity import Entity
 from ..core.feature_view import FeatureView
 from ..core.feature_service import FeatureService
@@ -33,6 +34,20 @@ class Registry(ABC):
         """Apply a feature service to the registry"""
         pass
 
+    @abstractmethod
+    def get_version(self) -> int:
+        """Get a counter that changes whenever registry objects change"""
+        pass
+
+    def get_cached_version(self) -> Optional[int]:
+        """
+        Get the version if it is known without any I/O, else None.
+
+        Callers on an event loop use this to reuse cached state without
+        blocking; registries that cache their contents should override it.
+        """
+        return None
+
     @abstractmethod
     def get_entity(self, name: str) -> Optional[Entity]:
         """Get an entity by name"""
@@ -78,6 +93,20 @@ class Registry(ABC):
         """Delete a feature service by name"""
         pass
 
+    @abstractmethod
+    def get_materialization_watermark(
+        self, feature_view_name: str
+    ) -> Optional[datetime]:
+        """Get the end date of the last incremental materialization of a feature view"""
+        pass
+
+    @abstractmethod
+    def set_materialization_watermark(
+        self, feature_view_name: str, watermark: datetime
+    ) -> None:
+        """Record the end date of an incremental materialization of a feature view"""
+        pass
+
     @abstractmethod
     def teardown(self) -> None:
         """Clean up registry resources"""
@@ -5,25 +5,76 @@ SQLite registry implementation for the Feature Store
 import sqlite3
 import json
 import os
+import threading
+import time
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from .base import Registry
 from ..core.entity import Entity
 from ..core.feature_view import FeatureView
 from ..core.feature_service import FeatureService
+from ..core.sqlite_connections import SqliteConnectionPool
+
+_TABLES = ("entities", "feature_views", "feature_services")
+
+# Statements are kept constant so each connection's statement cache reuses them
+_UPSERT_SQL = {
+    table: f"""
+        INSERT OR REPLACE INTO {table} (name, data, updated_timestamp)
+        VALUES (?, ?, ?)
+    """
+    for table in _TABLES
+}
+_DELETE_SQL = {table: f"DELETE FROM {table} WHERE name = ?" for table in _TABLES}
+_GET_WATERMARK_SQL = """
+    SELECT watermark FROM materialization_watermarks WHERE feature_view = ?
+"""
+_SET_WATERMARK_SQL = """
+    INSERT OR REPLACE INTO materialization_watermarks
+    (feature_view, watermark, updated_timestamp) VALUES (?, ?, ?)
+"""
+_DELETE_WATERMARK_SQL = "DELETE FROM materialization_watermarks WHERE feature_view = ?"
+_SELECT_ALL_SQL = {
+    table: f"SELECT name, data FROM {table} ORDER BY name" for table in _TABLES
+}
 
 
 class SQLiteRegistry(Registry):
     """
     SQLite-based registry implementation.
     Stores feature metadata in a SQLite database.
+
+    Deserialized objects are cached in memory. Every write bumps a version
+    counter stored in the database; the cache is trusted for
+    `cache_ttl_seconds` and then revalidated against that counter, so reads
+    within the refresh interval do no SQLite I/O while changes made by other
+    processes are still picked up. Writes through this instance invalidate
+    the cache immediately.
+
+    Each thread keeps one open connection until the thread exits or the
+    registry is torn down, and the database runs in WAL mode so readers and
+    the writer do not block each other.
     """
 
-    def __init__(self, db_path: str = "registry.db"):
+    def __init__(
+        self, db_path: str = "registry.db", cache_ttl_seconds: float = 10.0
+    ):
         super().__init__()
         self.db_path = db_path
+        self.cache_ttl_seconds = cache_ttl_seconds
+        # Cached objects by table: {table_name: {name: obj}}
+        self._cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._cache_version: Optional[int] = None
+        self._cache_checked_at = 0.0
+        self._cache_lock = threading.Lock()
+        # One connection per thread, closed when the thread exits
+        self._pool = SqliteConnectionPool(self.db_path)
         self._init_database()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection"""
+        return self._pool.connection()
+
     def _init_database(self) -> None:
         """Initialize the SQLite database with required tables"""
         # Create directory if it doesn't exist
@@ -31,7 +82,7 @@ class SQLiteRegistry(Registry):
         if db_dir and not os.path.exists(db_dir):
             os.makedirs(db_dir)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
 
             # Create entities table
@@ -70,159 +121,257 @@ class SQLiteRegistry(Registry):
             """
             )
 
-            conn.commit()
-
-    def apply_entity(self, entity: Entity) -> None:
-        """Apply an entity to the registry"""
-        entity.validate()
+            # Create version table; bumped on every change to detect stale caches
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS registry_version (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    version INTEGER NOT NULL
+                )
+            """
+            )
+            cursor.execute(
+                "INSERT OR IGNORE INTO registry_version (id, version) VALUES (0, 0)"
+            )
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+            # Create materialization watermark table; not part of the object cache
             cursor.execute(
                 """
-                INSERT OR REPLACE INTO entities (name, data, updated_timestamp)
-                VALUES (?, ?, ?)
-            """,
-                (entity.name, json.dumps(entity.to_dict()), datetime.now()),
+                CREATE TABLE IF NOT EXISTS materialization_watermarks (
+                    feature_view TEXT PRIMARY KEY,
+                    watermark TEXT NOT NULL,
+                    updated_timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """
             )
+
             conn.commit()
 
-    def apply_feature_view(self, feature_view: FeatureView) -> None:
-        """Apply a feature view to the registry"""
-        feature_view.validate()
+    def _bump_version(self, cursor: sqlite3.Cursor) -> None:
+        """Record a change in the same transaction as the change itself"""
+        cursor.execute("UPDATE registry_version SET version = version + 1")
+
+    def _invalidate_cache(self) -> None:
+        """Force the next read to reload from the database"""
+        with self._cache_lock:
+            self._cache = None
+            self._cache_version = None
+
+    def _read_version(self, cursor: sqlite3.Cursor) -> int:
+        """Read the registry version counter"""
+        cursor.execute("SELECT version FROM registry_version WHERE id = 0")
+        result = cursor.fetchone()
+        return result[0] if result else 0
+
+    def _get_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Get the cached registry objects, reloading them if they changed"""
+        with self._cache_lock:
+            now = time.monotonic()
+            if (
+                self._cache is not None
+                and now - self._cache_checked_at < self.cache_ttl_seconds
+            ):
+                return self._cache
+
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                version = self._read_version(cursor)
+                if self._cache is None or version != self._cache_version:
+                    cache = {}
+                    for table, loader in (
+                        ("entities", Entity.from_dict),
+                        ("feature_views", FeatureView.from_dict),
+                        ("feature_services", FeatureService.from_dict),
+                    ):
+                        cursor.execute(_SELECT_ALL_SQL[table])
+                        cache[table] = {
+                            name: loader(json.loads(data))
+                            for name, data in cursor.fetchall()
+                        }
+                    self._cache = cache
+                    self._cache_version = version
+
+            self._cache_checked_at = now
+            return self._cache
+
+    def get_version(self) -> int:
+        """Get the version of the cached registry contents"""
+        while True:
+            self._get_cache()
+            with self._cache_lock:
+                # None if a write invalidated the cache in between
+                if self._cache_version is not None:
+                    return self._cache_version
+
+    def get_cached_version(self) -> Optional[int]:
+        """Get the version of a cache that needs no reload, without any I/O"""
+        # A reload holds the lock while it queries SQLite, so do not wait
+        if not self._cache_lock.acquire(blocking=False):
+            return None
+        try:
+            if (
+                self._cache is None
+                or time.monotonic() - self._cache_checked_at >= self.cache_ttl_seconds
+            ):
+                return None
+            return self._cache_version
+        finally:
+            self._cache_lock.release()
+
+    def _upsert(self, table: str, rows: List[tuple]) -> None:
+        """Insert or replace serialized objects and bump the version atomically"""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(_UPSERT_SQL[table], rows)
+            self._bump_version(cursor)
+            conn.commit()
+        self._invalidate_cache()
 
-        with sqlite3.connect(self.db_path) as conn:
+    def _delete(self, table: str, name: str) -> None:
+        """Delete an object by name and bump the version, in one transaction"""
+        with self._connect() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO feature_views (name, data, updated_timestamp)
-                VALUES (?, ?, ?)
-            """,
-                (feature_view.name, json.dumps(feature_view.to_dict()), datetime.now()),
-            )
+            cursor.execute(_DELETE_SQL[table], (name,))
+            if table == "feature_views":
+                cursor.execute(_DELETE_WATERMARK_SQL, (name,))
+            self._bump_version(cursor)
             conn.commit()
+        self._invalidate_cache()
+
+    def apply_entity(self, entity: Entity) -> None:
+        """Apply an entity to the registry"""
+        entity.validate()
+        self._upsert(
+            "entities", [(entity.name, json.dumps(entity.to_dict()), datetime.now())]
+        )
+
+    def apply_feature_view(self, feature_view: FeatureView) -> None:
+        """Apply a feature view to the registry"""
+        feature_view.validate()
+        self._upsert(
+            "feature_views",
+            [(feature_view.name, json.dumps(feature_view.to_dict()), datetime.now())],
+        )
 
     def apply_feature_service(self, feature_service: FeatureService) -> None:
         """Apply a feature service to the registry"""
         feature_service.validate()
-
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO feature_services (name, data, updated_timestamp)
-                VALUES (?, ?, ?)
-            """,
+        self._upsert(
+            "feature_services",
+            [
                 (
                     feature_service.name,
                     json.dumps(feature_service.to_dict()),
                     datetime.now(),
-                ),
-            )
+                )
+            ],
+        )
+
+    def apply_objects(self, objects: List[Any]) -> None:
+        """
+        Apply multiple objects to the registry.
+
+        All objects are validated first and then written in a single
+        transaction, so either every object is applied or none is.
+        """
+        rows = {table: [] for table in _TABLES}
+        now = datetime.now()
+        for obj in objects:
+            if isinstance(obj, Entity):
+                table = "entities"
+            elif isinstance(obj, FeatureView):
+                table = "feature_views"
+            elif isinstance(obj, FeatureService):
+                table = "feature_services"
+            else:
+                raise ValueError(f"Unsupported object type: {type(obj)}")
+            obj.validate()
+            rows[table].append((obj.name, json.dumps(obj.to_dict()), now))
+
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            for table, table_rows in rows.items():
+                if table_rows:
+                    cursor.executemany(_UPSERT_SQL[table], table_rows)
+            self._bump_version(cursor)
             conn.commit()
+        self._invalidate_cache()
 
     def get_entity(self, name: str) -> Optional[Entity]:
         """Get an entity by name"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT data FROM entities WHERE name = ?", (name,))
-            result = cursor.fetchone()
-
-            if result:
-                return Entity.from_dict(json.loads(result[0]))
-            return None
+        return self._get_cache()["entities"].get(name)
 
     def get_feature_view(self, name: str) -> Optional[FeatureView]:
         """Get a feature view by name"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT data FROM feature_views WHERE name = ?", (name,))
-            result = cursor.fetchone()
-
-            if result:
-                return FeatureView.from_dict(json.loads(result[0]))
-            return None
+        return self._get_cache()["feature_views"].get(name)
 
     def get_feature_service(self, name: str) -> Optional[FeatureService]:
         """Get a feature service by name"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT data FROM feature_services WHERE name = ?", (name,))
-            result = cursor.fetchone()
-
-            if result:
-                return FeatureService.from_dict(json.loads(result[0]))
-            return None
+        return self._get_cache()["feature_services"].get(name)
 
     def list_entities(self) -> List[Entity]:
         """List all entities"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT data FROM entities ORDER BY name")
-            results = cursor.fetchall()
-
-            return [Entity.from_dict(json.loads(row[0])) for row in results]
+        return list(self._get_cache()["entities"].values())
 
     def list_feature_views(self) -> List[FeatureView]:
         """List all feature views"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT data FROM feature_views ORDER BY name")
-            results = cursor.fetchall()
-
-            return [FeatureView.from_dict(json.loads(row[0])) for row in results]
+        return list(self._get_cache()["feature_views"].values())
 
     def list_feature_services(self) -> List[FeatureService]:
         """List all feature services"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT data FROM feature_services ORDER BY name")
-            results = cursor.fetchall()
-
-            return [FeatureService.from_dict(json.loads(row[0])) for row in results]
+        return list(self._get_cache()["feature_services"].values())
 
     def delete_entity(self, name: str) -> None:
         """Delete an entity by name"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM entities WHERE name = ?", (name,))
-            conn.commit()
+        self._delete("entities", name)
 
     def delete_feature_view(self, name: str) -> None:
         """Delete a feature view by name"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM feature_views WHERE name = ?", (name,))
-            conn.commit()
+        self._delete("feature_views", name)
 
     def delete_feature_service(self, name: str) -> None:
         """Delete a feature service by name"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM feature_services WHERE name = ?", (name,))
-            conn.commit()
+        self._delete("feature_services", name)
+
+    def get_materialization_watermark(
+        self, feature_view_name: str
+    ) -> Optional[datetime]:
+        """Get the end date of the last incremental materialization of a feature view"""
+        cursor = self._connect().execute(_GET_WATERMARK_SQL, (feature_view_name,))
+        result = cursor.fetchone()
+        return datetime.fromisoformat(result[0]) if result else None
+
+    def set_materialization_watermark(
+        self, feature_view_name: str, watermark: datetime
+    ) -> None:
+        """Record the end date of an incremental materialization of a feature view"""
+        with self._connect() as conn:
+            conn.execute(
+                _SET_WATERMARK_SQL,
+                (feature_view_name, watermark.isoformat(), datetime.now()),
+            )
 
     def teardown(self) -> None:
         """Clean up registry resources"""
-        if os.path.exists(self.db_path):
-            os.remove(self.db_path)
+        self._invalidate_cache()
+        self._pool.close()
+        for path in (self.db_path, f"{self.db_path}-wal", f"{self.db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
 
     def get_metadata(self) -> Dict[str, Any]:
         """Get registry metadata"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
-
-            # Count entities
-            cursor.execute("SELECT COUNT(*) FROM entities")
-            entity_count = cursor.fetchone()[0]
-
-            # Count feature views
-            cursor.execute("SELECT COUNT(*) FROM feature_views")
-            feature_view_count = cursor.fetchone()[0]
-
-            # Count feature services
-            cursor.execute("SELECT COUNT(*) FROM feature_services")
-            feature_service_count = cursor.fetchone()[0]
+            cursor.execute(
+                """
+                SELECT
+                    (SELECT COUNT(*) FROM entities),
+                    (SELECT COUNT(*) FROM feature_views),
+                    (SELECT COUNT(*) FROM feature_services)
+            """
+            )
+            entity_count, feature_view_count, feature_service_count = cursor.fetchone()
 
             return {
                 "db_path": self.db_path,
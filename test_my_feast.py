@@ -4,12 +4,23 @@ Test script for My Feast Feature Store implementation
 
 import pandas as pd
 from datetime import datetime, timedelta
+import asyncio
+import gc
+import json
 import os
 import sys
+import tempfile
+import fnmatch
+import socketserver
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the current directory to the path
 sys.path.insert(0, ".")
 
+import numpy as np
+
 from my_feast import (
     Entity,
     Feature,
@@ -19,6 +30,8 @@ from my_feast import (
     ValueType,
     FileSource,
 )
+from my_feast.core.types import FeatureReference
+from my_feast.offline_store import ParquetOfflineStore
 
 
 def test_basic_functionality():
@@ -111,6 +124,15 @@ def test_basic_functionality():
     print(f"✓ Online features retrieved: {len(online_features)} rows")
     print(online_features)
 
+    # Test the DataFrame-free retrieval path
+    online_dict = store.get_online_features_dict(
+        features=["driver_stats:conv_rate", "driver_stats:acc_rate"],
+        entity_rows=entity_rows,
+    )
+    assert online_dict["driver_id"] == [1001, 1002, 1003]
+    assert online_dict["conv_rate"] == online_features["conv_rate"].tolist()
+    print(f"✓ Online feature dict retrieved: {sorted(online_dict)}")
+
     # Test historical features
     entity_df = pd.DataFrame(
         {
@@ -168,5 +190,1576 @@ def test_basic_functionality():
     print("All tests passed! 🎉")
 
 
+def _reference_point_in_time_join(entity_df, feature_df, join_keys, timestamp_field):
+    """Row-by-row point-in-time join the vectorized engine must reproduce"""
+    result_rows = []
+    for _, entity_row in entity_df.iterrows():
+        entity_filter = True
+        for join_key in join_keys:
+            entity_filter = entity_filter & (
+                feature_df[join_key] == entity_row[join_key]
+            )
+        entity_features = feature_df[entity_filter]
+        entity_features = entity_features[
+            entity_features[timestamp_field] <= entity_row[timestamp_field]
+        ]
+
+        result_row = entity_row.to_dict()
+        if not entity_features.empty:
+            latest = entity_features.sort_values(timestamp_field).tail(1)
+            for col in latest.columns:
+                if col not in join_keys and col != timestamp_field:
+                    result_row[col] = latest[col].iloc[0]
+        result_rows.append(result_row)
+
+    return pd.DataFrame(result_rows)
+
+
+def test_point_in_time_join_matches_reference():
+    """Test the vectorized point-in-time join against the row-by-row join"""
+    print("Testing vectorized point-in-time join...")
+
+    rng = np.random.default_rng(7)
+    base = datetime(2024, 1, 1)
+    n_features, n_entities = 2000, 500
+
+    # Unique (driver, customer, timestamp) triples keep "latest" unambiguous
+    feature_df = pd.DataFrame(
+        {
+            "driver_id": rng.integers(0, 20, n_features),
+            "customer_id": rng.integers(0, 5, n_features),
+            "event_timestamp": base
+            + pd.to_timedelta(rng.permutation(n_features) * 60, unit="s"),
+            "conv_rate": rng.random(n_features),
+            "avg_daily_trips": rng.integers(0, 300, n_features),
+        }
+    )
+    entity_df = pd.DataFrame(
+        {
+            "driver_id": rng.integers(0, 25, n_entities),
+            "customer_id": rng.integers(0, 5, n_entities),
+            "event_timestamp": base
+            + pd.to_timedelta(
+                rng.integers(-600, n_features * 60, n_entities), unit="s"
+            ),
+            "label": rng.integers(0, 2, n_entities),
+        }
+    )
+    join_keys = ["driver_id", "customer_id"]
+
+    expected = _reference_point_in_time_join(
+        entity_df, feature_df, join_keys, "event_timestamp"
+    )
+    actual = ParquetOfflineStore()._point_in_time_join_with_timestamp(
+        entity_df, feature_df, join_keys, "event_timestamp"
+    )
+
+    assert list(actual.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    print(f"✓ Vectorized join matches reference on {len(expected)} rows")
+
+
+def test_historical_features_respect_ttl():
+    """Test that point-in-time joins ignore feature rows older than the TTL"""
+    print("Testing TTL-aware historical retrieval...")
+
+    base = datetime(2024, 1, 10)
+    feature_data = pd.DataFrame(
+        {
+            "driver_id": [1001, 1001, 1002],
+            "conv_rate": [0.1, 0.2, 0.3],
+            "event_timestamp": [
+                base - timedelta(days=5),
+                base - timedelta(hours=2),
+                base - timedelta(days=3),
+            ],
+        }
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "driver_stats.parquet")
+        feature_data.to_parquet(path)
+
+        driver = Entity(name="driver_id", value_type=ValueType.INT64)
+        source = FileSource(
+            name="driver_stats_source", path=path, timestamp_field="event_timestamp"
+        )
+        conv_rate = Feature(name="conv_rate", dtype=ValueType.FLOAT)
+        ttl_fv = FeatureView(
+            name="driver_stats",
+            entities=[driver],
+            features=[conv_rate],
+            source=source,
+            ttl=timedelta(days=1),
+        )
+        no_ttl_fv = FeatureView(
+            name="driver_stats",
+            entities=[driver],
+            features=[conv_rate],
+            source=source,
+        )
+
+        entity_df = pd.DataFrame(
+            {
+                "driver_id": [1001, 1001, 1002],
+                "event_timestamp": [base, base - timedelta(hours=3), base],
+            }
+        )
+        store = ParquetOfflineStore()
+        feature_refs = [FeatureReference("driver_stats", "conv_rate")]
+        with_ttl = store.get_historical_features(entity_df, [ttl_fv], feature_refs)
+        without_ttl = store.get_historical_features(
+            entity_df, [no_ttl_fv], feature_refs
+        )
+
+    assert with_ttl["conv_rate"].iloc[0] == 0.2
+    assert pd.isna(with_ttl["conv_rate"].iloc[1])
+    assert pd.isna(with_ttl["conv_rate"].iloc[2])
+    assert without_ttl["conv_rate"].tolist() == [0.2, 0.1, 0.3]
+    print("✓ Rows outside the TTL window are not joined")
+
+
+def test_file_source_read_pushdown():
+    """Test projection, date and entity filters on FileSource.read"""
+    print("Testing FileSource read pushdown...")
+
+    base = datetime(2024, 1, 1)
+    data = pd.DataFrame(
+        {
+            "driver_id": np.repeat(np.arange(1000, 1010), 10),
+            "conv_rate": np.linspace(0, 1, 100),
+            "unused": ["x"] * 100,
+            "event_timestamp": [base + timedelta(hours=i) for i in range(100)],
+        }
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "driver_stats.parquet")
+        data.to_parquet(path, row_group_size=10)
+        string_ts_path = os.path.join(tmp_dir, "driver_stats_str.parquet")
+        data.assign(event_timestamp=data["event_timestamp"].astype(str)).to_parquet(
+            string_ts_path
+        )
+
+        for source_path in (path, string_ts_path):
+            source = FileSource(
+                name="driver_stats_source",
+                path=source_path,
+                timestamp_field="event_timestamp",
+            )
+            df = source.read(
+                start_date=base + timedelta(hours=15),
+                end_date=base + timedelta(hours=34),
+                columns=["driver_id", "conv_rate"],
+                entity_filters={"driver_id": [1001, 1003]},
+            )
+            assert list(df.columns) == ["driver_id", "conv_rate"]
+            assert sorted(df["driver_id"].unique().tolist()) == [1001, 1003]
+            assert len(df) == 10
+
+    print("✓ Filters and projection applied")
+
+
+def test_file_source_partitioned_directory():
+    """Test reading hive-partitioned directories and globs with partition pruning"""
+    print("Testing partitioned FileSource...")
+
+    base = datetime(2024, 1, 1)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = os.path.join(tmp_dir, "driver_stats")
+        for day in range(3):
+            day_start = base + timedelta(days=day)
+            partition_dir = os.path.join(root, f"dt={day_start:%Y-%m-%d}")
+            os.makedirs(partition_dir)
+            for part in range(2):
+                pd.DataFrame(
+                    {
+                        "driver_id": [1001 + part],
+                        "conv_rate": [day + part / 10],
+                        "event_timestamp": [day_start + timedelta(hours=part)],
+                    }
+                ).to_parquet(os.path.join(partition_dir, f"part-{part}.parquet"))
+        open(os.path.join(root, "_SUCCESS"), "w").close()
+
+        source = FileSource(
+            name="driver_stats_source",
+            path=root,
+            timestamp_field="event_timestamp",
+            partition_date_column="dt",
+        )
+        source.validate()
+        assert len(source.read()) == 6
+
+        # Corrupt a partition outside the range: pruning must never open it
+        with open(os.path.join(root, "dt=2024-01-01", "part-0.parquet"), "wb") as f:
+            f.write(b"not parquet")
+
+        df = source.read(
+            start_date=base + timedelta(days=1),
+            end_date=base + timedelta(days=1, hours=12),
+        )
+        assert sorted(df["dt"].unique().tolist()) == ["2024-01-02"]
+        assert len(df) == 2
+
+        glob_source = FileSource(
+            name="driver_stats_source",
+            path=os.path.join(root, "dt=2024-01-03", "*.parquet"),
+            timestamp_field="event_timestamp",
+        )
+        assert len(glob_source.read()) == 2
+
+        restored = FileSource.from_dict(source.to_dict())
+        assert restored.partition_date_column == "dt"
+
+    print("✓ Partitions pruned and files read")
+
+
+def _driver_feature_view(path="unused.parquet", ttl=None):
+    """Build a driver feature view for online store tests"""
+    return FeatureView(
+        name="driver_stats",
+        entities=[Entity(name="driver_id", value_type=ValueType.INT64)],
+        features=[
+            Feature(name="conv_rate", dtype=ValueType.FLOAT),
+            Feature(name="avg_daily_trips", dtype=ValueType.INT64),
+            Feature(name="city", dtype=ValueType.STRING),
+        ],
+        source=FileSource(
+            name="driver_stats_source", path=path, timestamp_field="event_timestamp"
+        ),
+        ttl=ttl,
+    )
+
+
+def test_memory_online_store_columnar_layout():
+    """Test upserts and gathers on the columnar memory online store"""
+    print("Testing columnar memory online store...")
+
+    from my_feast.online_store import MemoryOnlineStore
+
+    fv = _driver_feature_view()
+    store = MemoryOnlineStore()
+    now = datetime.now()
+    store.write_features(
+        fv,
+        pd.DataFrame(
+            {
+                "driver_id": [1001, 1002, 1003],
+                "conv_rate": [0.5, 0.6, 0.7],
+                "avg_daily_trips": [10, 20, 30],
+                "city": ["seoul", "busan", "incheon"],
+                "event_timestamp": [now] * 3,
+            }
+        ),
+    )
+    # Overwrite one entity and add another
+    store.write_features(
+        fv,
+        pd.DataFrame(
+            {
+                "driver_id": [1002, 1004],
+                "conv_rate": [0.9, 0.1],
+                "avg_daily_trips": [25, 40],
+                "city": ["daegu", "ulsan"],
+                "event_timestamp": [now] * 2,
+            }
+        ),
+    )
+
+    df = store.read_features(
+        fv, [{"driver_id": 1002}, {"driver_id": 9999}, {"driver_id": 1004}]
+    )
+    assert df["conv_rate"].iloc[0] == np.float32(0.9)
+    assert pd.isna(df["conv_rate"].iloc[1])
+    assert df["city"].iloc[0] == "daegu" and pd.isna(df["city"].iloc[1])
+
+    all_found = store.read_features(fv, [{"driver_id": 1001}], ["avg_daily_trips"])
+    assert all_found["avg_daily_trips"].dtype == np.int64
+    assert store.get_entity_count("driver_stats") == 4
+
+    metadata = store.get_metadata()
+    assert metadata["feature_views"]["driver_stats"]["memory_bytes"] > 0
+    print("✓ Columnar upserts and reads work")
+
+    # Bulk writes merge in small batches and keep the last row per entity
+    batched_store = MemoryOnlineStore(write_batch_size=7)
+    n_rows = 5000
+    bulk_df = pd.DataFrame(
+        {
+            "driver_id": np.arange(n_rows) % 2000,
+            "conv_rate": np.arange(n_rows, dtype=np.float32),
+            "avg_daily_trips": np.arange(n_rows),
+            "city": ["seoul"] * n_rows,
+            "event_timestamp": [now] * n_rows,
+        }
+    )
+    batched_store.write_features(fv, bulk_df)
+    batched_store.write_features(fv, bulk_df.iloc[:100])
+    df = batched_store.read_features(fv, [{"driver_id": 5}, {"driver_id": 1999}])
+    assert df["avg_daily_trips"].tolist() == [5, 3999]
+    assert batched_store.get_entity_count("driver_stats") == 2000
+    print("✓ Batched bulk writes keep the last row per entity")
+
+
+def test_registry_cache_detects_changes():
+    """Test the registry cache against local and external writes"""
+    print("Testing registry cache...")
+
+    from my_feast.registry import SQLiteRegistry
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "registry.db")
+        writer = SQLiteRegistry(db_path)
+        cached = SQLiteRegistry(db_path, cache_ttl_seconds=3600)
+        revalidated = SQLiteRegistry(db_path, cache_ttl_seconds=0)
+
+        writer.apply_entity(Entity(name="driver_id", value_type=ValueType.INT64))
+        assert cached.get_entity("driver_id") is not None
+        assert revalidated.get_entity("driver_id") is not None
+
+        # Cached objects are reused until something changes
+        assert cached.get_entity("driver_id") is cached.get_entity("driver_id")
+
+        writer.apply_entity(Entity(name="customer_id"))
+        assert cached.get_entity("customer_id") is None
+        assert revalidated.get_entity("customer_id") is not None
+
+        # Local writes invalidate immediately
+        cached.delete_entity("driver_id")
+        assert [e.name for e in cached.list_entities()] == ["customer_id"]
+
+        # Batched applies are all-or-nothing
+        try:
+            writer.apply_objects([Entity(name="store_id"), "not an object"])
+            assert False, "Expected ValueError"
+        except ValueError:
+            pass
+        assert revalidated.get_entity("store_id") is None
+        writer.apply_objects([Entity(name="store_id"), Entity(name="rider_id")])
+        assert revalidated.get_metadata()["entity_count"] == 3
+
+        # Each thread reads through its own connection
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            counts = list(
+                executor.map(lambda _: len(revalidated.list_entities()), range(8))
+            )
+        assert counts == [3] * 8
+
+        for registry in (writer, cached, revalidated):
+            registry.teardown()
+        assert not os.path.exists(db_path)
+
+    print("✓ Registry cache refreshes on version changes")
+
+
+def test_materialize_incremental_uses_watermarks():
+    """Test that incremental materialization only reads rows after the watermark"""
+    print("Testing incremental materialization watermarks...")
+
+    from my_feast.core.sqlite_connections import SqliteConnectionPool
+
+    base = datetime(2024, 1, 1)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "driver_stats.parquet")
+        rows = {
+            "driver_id": [1001, 1002],
+            "conv_rate": [0.1, 0.2],
+            "avg_daily_trips": [10, 20],
+            "city": ["seoul", "busan"],
+            "event_timestamp": [base, base + timedelta(hours=1)],
+        }
+        pd.DataFrame(rows).to_parquet(path)
+
+        fv = _driver_feature_view(path)
+        store = FeatureStore(repo_path=os.path.join(tmp_dir, "repo"))
+        store.apply([fv.entities[0], fv])
+        first_end = base + timedelta(hours=1)
+        store.materialize_incremental(end_date=first_end)
+        assert store.registry.get_materialization_watermark(fv.name) == first_end
+
+        # Rows at or before the watermark must not be written again
+        late = pd.DataFrame(
+            {
+                "driver_id": [1001, 1002, 1003],
+                "conv_rate": [0.9, 0.8, 0.3],
+                "avg_daily_trips": [90, 80, 30],
+                "city": ["daegu", "ulsan", "incheon"],
+                "event_timestamp": [
+                    base + timedelta(minutes=30),
+                    first_end,
+                    base + timedelta(hours=2),
+                ],
+            }
+        )
+        pd.concat([pd.DataFrame(rows), late]).to_parquet(path)
+        store.materialize_incremental(end_date=base + timedelta(hours=3))
+
+        online = store.get_online_features_dict(
+            features=["driver_stats:avg_daily_trips"],
+            entity_rows=[{"driver_id": i} for i in (1001, 1002, 1003)],
+        )
+        assert online["avg_daily_trips"] == [10, 20, 30]
+        assert store.registry.get_materialization_watermark(
+            fv.name
+        ) == base + timedelta(hours=3)
+
+        # Watermarks are written from scheduler threads; a thread's registry
+        # connection is closed once the thread is gone
+        pool = SqliteConnectionPool(os.path.join(tmp_dir, "pool.db"))
+        connections = []
+        for _ in range(3):
+            thread = threading.Thread(
+                target=lambda: connections.append(pool.connection())
+            )
+            thread.start()
+            thread.join()
+        del thread
+        gc.collect()
+        assert pool.open_connections == 0
+        for conn in connections:
+            try:
+                conn.execute("SELECT 1")
+                assert False, "connection of an exited thread is open"
+            except sqlite3.ProgrammingError:
+                pass
+
+        # After a restart the memory store is empty, so the watermark is
+        # ignored and the full history is reloaded
+        restarted = FeatureStore(repo_path=os.path.join(tmp_dir, "repo"))
+        restarted.materialize_incremental(end_date=base + timedelta(hours=3))
+        online = restarted.get_online_features_dict(
+            features=["driver_stats:avg_daily_trips"],
+            entity_rows=[{"driver_id": i} for i in (1001, 1003)],
+        )
+        assert online["avg_daily_trips"] == [90, 30]
+        restarted.online_store.teardown()
+        store.teardown()
+
+    print("✓ Incremental materialization reads only new rows")
+
+
+def test_materialization_isolates_failures():
+    """Test that one failing feature view does not abort the others"""
+    print("Testing parallel materialization...")
+
+    import shutil
+    from my_feast.config import FeatureStoreConfig
+    from my_feast.core import MaterializationError
+    from my_feast.core.materialization import MaterializationScheduler
+    from my_feast.online_store import MemoryOnlineStore
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "driver_stats.parquet")
+        pd.DataFrame(
+            {
+                "driver_id": [1001, 1002],
+                "conv_rate": [0.1, 0.2],
+                "avg_daily_trips": [10, 20],
+                "city": ["seoul", "busan"],
+                "event_timestamp": [datetime(2024, 1, 1)] * 2,
+            }
+        ).to_parquet(path)
+
+        good = _driver_feature_view(path)
+        broken_path = os.path.join(tmp_dir, "broken_stats.parquet")
+        broken = _driver_feature_view(broken_path)
+        broken.name = "broken_stats"
+
+        for executor in ("thread", "process"):
+            config = FeatureStoreConfig(
+                online_store_config={"snapshot_path": "snapshot"},
+                materialization_max_workers=2,
+                materialization_executor=executor,
+            )
+            store = FeatureStore(
+                repo_path=os.path.join(tmp_dir, executor), config=config
+            )
+            shutil.copy(path, broken_path)
+            store.apply([good.entities[0], good, broken])
+            os.remove(broken_path)
+            try:
+                store.materialize_incremental(end_date=datetime(2024, 1, 2))
+                assert False, "Expected MaterializationError"
+            except MaterializationError as e:
+                report = e.report
+
+            assert report.failed == ["broken_stats"]
+            assert report.succeeded == ["driver_stats"]
+            assert report.get("driver_stats").rows_written == 2
+            assert store.registry.get_materialization_watermark("broken_stats") is None
+            assert store.online_store.get_entity_count("driver_stats") == 2
+            # The views that materialized are saved to the configured snapshot
+            snapshot = MemoryOnlineStore(snapshot_path=store.online_store.snapshot_path)
+            assert snapshot.get_entity_count("driver_stats") == 2
+            store.teardown()
+
+        # A failing size estimate is reported for its view like any failure
+        def unreadable():
+            raise OSError("stat failed")
+
+        broken.source.estimate_size_bytes = unreadable
+        report = MaterializationScheduler(
+            max_workers=2, memory_budget_bytes=1 << 30
+        ).run(
+            [good, broken],
+            lambda fv: pd.read_parquet(path),
+            lambda fv, chunks: sum(len(chunk) for chunk in chunks),
+        )
+        assert report.failed == ["broken_stats"]
+        assert isinstance(report.get("broken_stats").error, OSError)
+        assert report.get("driver_stats").rows_written == 2
+
+    print("✓ Materialization reports per-view outcomes")
+
+
+def test_streaming_materialization_keeps_latest_rows():
+    """Test the chunked latest-row reduction against a full sort"""
+    print("Testing streaming materialization...")
+
+    rng = np.random.default_rng(11)
+    n_rows = 1000
+    df = pd.DataFrame(
+        {
+            "driver_id": rng.integers(0, 40, n_rows),
+            "conv_rate": rng.random(n_rows),
+            "avg_daily_trips": np.arange(n_rows),
+            "city": ["seoul"] * n_rows,
+            "event_timestamp": datetime(2024, 1, 1)
+            + pd.to_timedelta(rng.integers(0, 50, n_rows), unit="h"),
+        }
+    )
+    expected = (
+        df.sort_values("event_timestamp", kind="mergesort")
+        .groupby("driver_id")
+        .tail(1)
+        .set_index("driver_id")["avg_daily_trips"]
+        .sort_index()
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "driver_stats.parquet")
+        df.to_parquet(path, row_group_size=64)
+        fv = _driver_feature_view(path)
+        store = ParquetOfflineStore()
+
+        # Applying the chunks in order must leave the latest row per entity
+        online = {}
+        chunks = list(store.pull_latest_in_chunks(fv, chunk_size=50))
+        assert len(chunks) > 1
+        for chunk in chunks:
+            online.update(zip(chunk["driver_id"], chunk["avg_daily_trips"]))
+        assert pd.Series(online).sort_index().equals(expected.rename(None))
+
+        latest = store.pull_latest_from_table_or_query(fv)
+        assert len(latest) == len(expected)
+        assert (
+            latest.set_index("driver_id")["avg_daily_trips"]
+            .sort_index()
+            .equals(expected)
+        )
+
+    print("✓ Streaming reduction matches the full sort")
+
+
+def test_latest_row_positions_breaks_ties():
+    """Test the latest-row kernel against sort_values plus groupby.tail"""
+    print("Testing latest-row kernel...")
+
+    from my_feast.offline_store.parquet_store import latest_row_positions
+
+    rng = np.random.default_rng(3)
+    n_rows = 5000
+    df = pd.DataFrame(
+        {
+            "driver_id": rng.integers(0, 30, n_rows),
+            "customer_id": rng.integers(0, 4, n_rows),
+            "event_timestamp": datetime(2024, 1, 1)
+            + pd.to_timedelta(rng.integers(0, 10, n_rows), unit="D"),
+            "created": datetime(2024, 1, 1)
+            + pd.to_timedelta(rng.integers(0, 3, n_rows), unit="h"),
+        }
+    )
+    join_keys = ["driver_id", "customer_id"]
+    expected = (
+        df.sort_values(["event_timestamp", "created"], kind="mergesort")
+        .groupby(join_keys)
+        .tail(1)
+        .sort_index()
+    )
+
+    positions = latest_row_positions(df, join_keys, "event_timestamp", "created")
+    assert np.array_equal(positions, expected.index.to_numpy())
+
+    print("✓ Latest-row kernel matches the full sort")
+
+
+def test_sqlite_online_store_survives_restart():
+    """Test that the SQLite online store serves the same values after reopening"""
+    print("Testing SQLite online store...")
+
+    from my_feast.online_store import MemoryOnlineStore, SqliteOnlineStore
+
+    fv = _driver_feature_view()
+    df = pd.DataFrame(
+        {
+            "driver_id": [1001, 1002, 1003, 1001],
+            "conv_rate": [0.5, 0.6, np.nan, 0.9],
+            "avg_daily_trips": [10, 20, 30, 40],
+            "city": ["seoul", "busan", None, "daegu"],
+            "event_timestamp": [datetime(2024, 1, 1)] * 4,
+        }
+    )
+    entity_rows = [{"driver_id": i} for i in (1003, 1001, 9999, 1002)]
+
+    memory = MemoryOnlineStore()
+    memory.write_features(fv, df)
+    expected = memory.read_features(fv, entity_rows)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "online", "store.db")
+        SqliteOnlineStore(path, write_batch_size=2).write_features(fv, df)
+
+        # A new instance, as after a restart, reads what was written
+        store = SqliteOnlineStore(path)
+        result = store.read_features(fv, entity_rows)
+        assert result["avg_daily_trips"].tolist()[:2] == [30, 40]
+        for column in ("conv_rate", "avg_daily_trips", "city"):
+            assert result[column].isna().tolist() == expected[column].isna().tolist()
+        assert result["city"].tolist()[1] == "daegu"
+        assert np.allclose(result["conv_rate"].dropna(), expected["conv_rate"].dropna())
+        assert store.get_entity_count("driver_stats") == 3
+
+        # A feature added by another process is seen without a restart
+        other = SqliteOnlineStore(path)
+        fv.features.append(Feature(name="rating", dtype=ValueType.INT64))
+        other.write_features(fv, df.assign(rating=[1, 2, 3, 4]))
+        result = store.read_features(fv, entity_rows)
+        assert result["rating"].tolist()[:2] == [3, 4]
+        other.delete_features(fv)
+        assert not store.lookup_feature_columns(fv, entity_rows)[1].any()
+
+        # A write after another store dropped the table recreates it
+        store.write_features(fv, df.assign(rating=[1, 2, 3, 4]))
+        other.delete_features(fv)
+        store.write_features(fv, df.assign(rating=[5, 6, 7, 8]))
+        assert store.read_features(fv, entity_rows)["rating"].tolist()[:2] == [7, 8]
+
+        store.delete_features(fv)
+        assert store.read_features(fv, entity_rows).empty
+        store.teardown()
+        assert not os.path.exists(path)
+
+    print("✓ SQLite online store survives restarts")
+
+
+class _FakeRedisHandler(socketserver.StreamRequestHandler):
+    """Serves the few Redis commands the online store uses from a dict"""
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def _reply(self, value):
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, list):
+            return b"*%d\r\n" % len(value) + b"".join(self._reply(v) for v in value)
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def handle(self):
+        data = self.server.data
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            command, key = args[0].upper(), args[1] if len(args) > 1 else None
+            with self.server.lock:
+                if command == b"HSET":
+                    fields = data.setdefault(key, {})
+                    new = sum(f not in fields for f in args[2::2])
+                    fields.update(zip(args[2::2], args[3::2]))
+                    reply = self._reply(new)
+                elif command == b"HMGET":
+                    fields = data.get(key, {})
+                    reply = self._reply([fields.get(f) for f in args[2:]])
+                elif command == b"HDEL":
+                    fields = data.get(key, {})
+                    reply = self._reply(
+                        sum(fields.pop(f, None) is not None for f in args[2:])
+                    )
+                    if not fields:
+                        data.pop(key, None)
+                elif command == b"SCAN":
+                    keys = [k for k in data if fnmatch.fnmatchcase(k, args[3])]
+                    reply = self._reply([b"0", keys])
+                else:
+                    reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+def test_redis_online_store_against_fake_server():
+    """Test the Redis online store against an in-process RESP server"""
+    print("Testing Redis online store...")
+
+    from my_feast.online_store import RedisOnlineStore
+
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _FakeRedisHandler)
+    server.daemon_threads = True
+    server.data, server.lock = {}, threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        store = RedisOnlineStore(
+            port=server.server_address[1], key_prefix="test", pipeline_batch_size=2
+        )
+        fv = _driver_feature_view()
+        store.write_features(
+            fv,
+            pd.DataFrame(
+                {
+                    "driver_id": [1001, 1002, 1003],
+                    "conv_rate": [0.5, np.nan, 0.75],
+                    "avg_daily_trips": [10, 20, 30],
+                    "city": ["seoul", "busan", None],
+                    "event_timestamp": [datetime(2024, 1, 1)] * 3,
+                }
+            ),
+        )
+        # One hash per entity
+        assert len(server.data) == 3
+
+        entity_rows = [{"driver_id": i} for i in (1003, 9999, 1001, 1002)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(lambda _: store.read_features(fv, entity_rows), range(8))
+            )
+        result = results[0]
+        assert result["avg_daily_trips"].tolist()[::2] == [30, 10]
+        assert result["conv_rate"].isna().tolist() == [False, True, False, True]
+        assert result["city"].isna().tolist() == [True, True, False, False]
+        assert result["city"].tolist()[2:] == ["seoul", "busan"]
+        assert store.get_metadata()["open_connections"] <= 4
+
+        store.delete_features(fv)
+        assert server.data == {}
+        store.teardown()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("✓ Redis online store works against a fake server")
+
+
+def test_memory_online_store_snapshot_roundtrip():
+    """Test saving the memory store and reopening it memory-mapped"""
+    print("Testing memory store snapshots...")
+
+    from my_feast.online_store import MemoryOnlineStore
+
+    fv = _driver_feature_view()
+    store = MemoryOnlineStore()
+    store.write_features(
+        fv,
+        pd.DataFrame(
+            {
+                "driver_id": [1001, 1002, 1003],
+                "conv_rate": [0.5, np.nan, 0.7],
+                "avg_daily_trips": [10, 20, 30],
+                "city": ["seoul", None, "incheon"],
+                "event_timestamp": [datetime(2024, 1, 1)] * 3,
+            }
+        ),
+    )
+    entity_rows = [{"driver_id": i} for i in (1003, 9999, 1001, 1002)]
+    expected = store.read_features(fv, entity_rows)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store.save_snapshot(tmp_dir)
+
+        restored = MemoryOnlineStore(snapshot_path=tmp_dir)
+        pd.testing.assert_frame_equal(restored.read_features(fv, entity_rows), expected)
+
+        # Numeric columns stay in the mapped file until the first write
+        column = restored._tables["driver_stats"]._columns["avg_daily_trips"]
+        assert not column.flags.writeable
+        restored.write_features(
+            fv,
+            pd.DataFrame(
+                {
+                    "driver_id": [1001, 1004],
+                    "conv_rate": [0.1, 0.2],
+                    "avg_daily_trips": [11, 40],
+                    "city": ["daegu", "ulsan"],
+                    "event_timestamp": [datetime(2024, 1, 2)] * 2,
+                }
+            ),
+        )
+        result = restored.read_features(fv, [{"driver_id": 1001}, {"driver_id": 1004}])
+        assert result["avg_daily_trips"].tolist() == [11, 40]
+        assert restored.get_entity_count("driver_stats") == 4
+
+        # Every save writes new files, so a loader holding the old manifest
+        # never finds another view's data under a listed name, and the files
+        # of the previous save are removed once the new manifest is in place
+        copy = _driver_feature_view()
+        copy.name = "driver_copy"
+        restored.write_features(
+            copy,
+            pd.DataFrame(
+                {
+                    "driver_id": [2001],
+                    "conv_rate": [0.3],
+                    "avg_daily_trips": [50],
+                    "city": ["jeju"],
+                    "event_timestamp": [datetime(2024, 1, 3)],
+                }
+            ),
+        )
+        restored.save_snapshot(tmp_dir)
+        previous_files = set(os.listdir(tmp_dir))
+        restored.delete_features(fv)
+        restored.save_snapshot(tmp_dir)
+        with open(os.path.join(tmp_dir, "manifest.json")) as f:
+            files = json.load(f)["feature_views"]
+        assert list(files) == ["driver_copy"]
+        assert set(os.listdir(tmp_dir)) == {"manifest.json", *files.values()}
+        assert not set(files.values()) & previous_files
+        reloaded = MemoryOnlineStore(snapshot_path=tmp_dir)
+        assert reloaded.get_feature_view_names() == ["driver_copy"]
+
+    print("✓ Memory store snapshots round-trip")
+
+
+def test_memory_online_store_ttl_expiry():
+    """Test read-time TTL filtering and sweeping of expired entities"""
+    print("Testing online TTL expiry...")
+
+    from my_feast.online_store import MemoryOnlineStore
+
+    fv = _driver_feature_view(ttl=timedelta(hours=1))
+    store = MemoryOnlineStore(sweep_interval_seconds=None)
+    now = datetime.now()
+
+    def rows(driver_ids, ages):
+        return pd.DataFrame(
+            {
+                "driver_id": driver_ids,
+                "conv_rate": [0.5] * len(driver_ids),
+                "avg_daily_trips": list(range(len(driver_ids))),
+                "city": ["seoul"] * len(driver_ids),
+                "event_timestamp": [now - age for age in ages],
+            }
+        )
+
+    store.write_features(
+        fv,
+        rows([1001, 1002, 1003], [timedelta(hours=2), timedelta(0), timedelta(days=1)]),
+    )
+    result = store.read_features(fv, [{"driver_id": i} for i in (1001, 1002, 1003)])
+    assert result["avg_daily_trips"].isna().tolist() == [True, False, True]
+
+    assert store.sweep_expired() == 2
+    assert store.get_entity_count("driver_stats") == 1
+    assert store.get_metadata()["expired_entities"] == 2
+
+    # Freed rows are reused before the table grows
+    table = store._tables["driver_stats"]
+    size = table._size
+    store.write_features(fv, rows([2001, 2002], [timedelta(0), timedelta(0)]))
+    assert table._size == size
+    result = store.read_features(fv, [{"driver_id": i} for i in (2001, 1002, 1001)])
+    assert result["avg_daily_trips"].tolist()[:2] == [0, 1]
+    assert pd.isna(result["avg_daily_trips"].iloc[2])
+
+    print("✓ Online store honors feature view TTLs")
+
+
+def test_memory_online_store_bounded_capacity():
+    """Test that a bounded memory store evicts cold entities first"""
+    print("Testing bounded memory online store...")
+
+    from my_feast.online_store import MemoryOnlineStore
+
+    fv = _driver_feature_view()
+
+    def rows(driver_ids):
+        return pd.DataFrame(
+            {
+                "driver_id": driver_ids,
+                "conv_rate": [0.5] * len(driver_ids),
+                "avg_daily_trips": driver_ids,
+                "city": ["seoul"] * len(driver_ids),
+                "event_timestamp": [datetime.now()] * len(driver_ids),
+            }
+        )
+
+    for policy in ("lru", "lfu"):
+        store = MemoryOnlineStore(max_entities=100, eviction_policy=policy)
+        store.write_features(fv, rows(list(range(100))))
+        hot = [{"driver_id": i} for i in range(10)]
+        for _ in range(5):
+            store.read_features(fv, hot)
+
+        store.write_features(fv, rows(list(range(1000, 1050))))
+        assert store.get_entity_count("driver_stats") == 100
+        result = store.read_features(fv, hot + [{"driver_id": 1049}])
+        assert result["avg_daily_trips"].tolist() == list(range(10)) + [1049]
+
+        metadata = store.get_metadata()
+        assert metadata["evictions"] == 50
+        assert metadata["hits"] == 61 and metadata["misses"] == 0
+        store.read_features(fv, [{"driver_id": -1}])
+        assert store.get_metadata()["feature_views"]["driver_stats"]["misses"] == 1
+
+    # Counters of exited threads are kept, without one stripe per thread
+    for _ in range(20):
+        thread = threading.Thread(
+            target=store.read_features, args=(fv, [{"driver_id": -1}])
+        )
+        thread.start()
+        thread.join()
+    assert store.get_metadata()["feature_views"]["driver_stats"]["misses"] == 21
+    assert len(store._counters._stripes) == 1
+
+    # A byte bound is turned into an entity bound per table
+    store = MemoryOnlineStore(max_bytes=64 * 1024)
+    store.write_features(fv, rows(list(range(5000))))
+    assert 0 < store.get_entity_count("driver_stats") < 5000
+
+    print("✓ Bounded memory store evicts cold entities")
+
+
+def test_tiered_online_store_reads_through():
+    """Test that the tiered store serves misses from L2 and caches them"""
+    print("Testing tiered online store...")
+
+    from my_feast.config import FeatureStoreConfig
+    from my_feast.online_store import SqliteOnlineStore, TieredOnlineStore
+
+    fv = _driver_feature_view()
+    df = pd.DataFrame(
+        {
+            "driver_id": [1001, 1002],
+            "conv_rate": [0.5, 0.6],
+            "avg_daily_trips": [10, 20],
+            "city": ["seoul", "busan"],
+            "event_timestamp": [datetime(2024, 1, 1)] * 2,
+        }
+    )
+    entity_rows = [{"driver_id": i} for i in (1002, 9999, 1001)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "store.db")
+        TieredOnlineStore(SqliteOnlineStore(path)).write_features(fv, df)
+
+        # A cold L1 goes to L2 once; the unknown entity is cached as missing
+        store = TieredOnlineStore(SqliteOnlineStore(path))
+        for _ in range(3):
+            result = store.read_features(fv, entity_rows)
+            assert result["avg_daily_trips"].tolist()[::2] == [20, 10]
+            assert pd.isna(result["avg_daily_trips"].iloc[1])
+        metadata = store.get_metadata()
+        assert metadata["l2"]["latency"]["reads"] == 1
+        assert metadata["l1"]["latency"]["reads"] == 3
+        assert metadata["negative_cache_hits"] == 2
+
+        # Writing an entity makes it visible despite the negative cache
+        store.write_features(fv, df.assign(driver_id=[9999, 1001]))
+        result = store.read_features(fv, entity_rows)
+        assert result["avg_daily_trips"].tolist() == [20, 10, 20]
+        store.teardown()
+
+        # Teardown removed the database; write-behind reaches L2 once flushed
+        store = TieredOnlineStore(SqliteOnlineStore(path), write_mode="behind")
+        store.write_features(fv, df.assign(driver_id=[2001, 2002]))
+        store.flush()
+        assert SqliteOnlineStore(path).get_entity_count("driver_stats") == 2
+        store.teardown()
+
+        config = FeatureStoreConfig(
+            project="tiered",
+            online_store_type="tiered",
+            online_store_config={
+                "write_mode": "behind",
+                "l1": {"max_entities_per_feature_view": 10},
+                "l2": {"type": "sqlite", "path": "online.db"},
+            },
+        )
+        config.validate()
+        feature_store = FeatureStore(repo_path=tmp_dir, config=config)
+        assert isinstance(feature_store.online_store, TieredOnlineStore)
+        assert feature_store.online_store.l1.max_entities == 10
+        feature_store.teardown()
+
+    print("✓ Tiered online store reads through to L2")
+
+
+def test_tiered_online_store_read_through_races_write():
+    """Test that a read-through overlapping a write does not cache stale rows"""
+    print("Testing tiered read-through racing a write...")
+
+    from my_feast.online_store import (
+        EVENT_TIMESTAMP_COLUMN,
+        MemoryOnlineStore,
+        TieredOnlineStore,
+    )
+
+    class PausingStore(MemoryOnlineStore):
+        """Pauses lookups after reading until resumed"""
+
+        def __init__(self):
+            super().__init__()
+            self.read_done, self.resume = threading.Event(), threading.Event()
+
+        def lookup_feature_columns(self, *args, **kwargs):
+            result = super().lookup_feature_columns(*args, **kwargs)
+            self.read_done.set()
+            self.resume.wait()
+            return result
+
+    fv = _driver_feature_view()
+    event_time = datetime(2024, 1, 1)
+
+    def rows(trips):
+        return pd.DataFrame(
+            {
+                "driver_id": [1001],
+                "conv_rate": [0.5],
+                "avg_daily_trips": [trips],
+                "city": ["seoul"],
+                "event_timestamp": [event_time],
+            }
+        )
+
+    l2 = PausingStore()
+    l2.write_features(fv, rows(10))
+    store = TieredOnlineStore(l2)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # The reader has read 10 from L2 when the write of 99 lands
+        reader = executor.submit(store.read_features, fv, [{"driver_id": 1001}])
+        assert l2.read_done.wait(5)
+        store.write_features(fv, rows(99))
+        l2.resume.set()
+        assert reader.result()["avg_daily_trips"].tolist() == [10]
+    assert store.read_features(fv, [{"driver_id": 1001}])[
+        "avg_daily_trips"
+    ].tolist() == [99]
+
+    # An undisturbed read-through keeps the event time of L2
+    store = TieredOnlineStore(l2)
+    store.read_features(fv, [{"driver_id": 1001}])
+    values, found = store.l1.lookup_feature_columns(
+        fv, [{"driver_id": 1001}], ["avg_daily_trips", EVENT_TIMESTAMP_COLUMN]
+    )
+    assert found.tolist() == [True]
+    assert values[EVENT_TIMESTAMP_COLUMN][0] == np.datetime64(event_time)
+
+    print("✓ Read-throughs never cache rows older than a concurrent write")
+
+
+def test_memory_online_store_lock_free_reads():
+    """Test that reads neither block on writers nor see torn rows"""
+    print("Testing lock-free memory store reads...")
+
+    from my_feast.online_store import MemoryOnlineStore
+
+    fv = _driver_feature_view()
+    store = MemoryOnlineStore(write_batch_size=64)
+    driver_ids = list(range(2000))
+
+    def rows(generation):
+        return pd.DataFrame(
+            {
+                "driver_id": driver_ids,
+                "conv_rate": [float(generation)] * len(driver_ids),
+                "avg_daily_trips": [generation] * len(driver_ids),
+                "city": [str(generation)] * len(driver_ids),
+                "event_timestamp": [datetime.now()] * len(driver_ids),
+            }
+        )
+
+    store.write_features(fv, rows(0))
+    entity_rows = [{"driver_id": i} for i in driver_ids[::7]]
+
+    # A writer holding every lock of the store does not stall readers
+    table = store._tables["driver_stats"]
+    with store._lock, table._write_lock:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            result = pool.submit(store.read_features, fv, entity_rows).result(timeout=5)
+    assert (result["avg_daily_trips"] == 0).all()
+
+    # Rows overwritten during reads are seen whole, never half-written
+    stop = threading.Event()
+
+    def write():
+        for generation in range(1, 30):
+            store.write_features(fv, rows(generation))
+        stop.set()
+
+    def read():
+        reads = 0
+        while not stop.is_set() or reads == 0:
+            values = store.read_feature_columns(fv, entity_rows)
+            trips = values["avg_daily_trips"]
+            assert (trips == values["city"].astype(np.int64)).all()
+            reads += 1
+        return reads
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        readers = [pool.submit(read) for _ in range(3)]
+        pool.submit(write).result()
+        assert all(reader.result() > 0 for reader in readers)
+
+    print("✓ Memory store reads are lock-free and consistent")
+
+
+def test_entity_key_serializer_is_typed_and_unambiguous():
+    """Test the shared binary entity key encoding"""
+    print("Testing entity key serializer...")
+
+    from my_feast.online_store import EntityKeySerializer, MemoryOnlineStore
+
+    serializer = EntityKeySerializer(
+        ["user", "device"], {"device": ValueType.INT64, "user": ValueType.STRING}
+    )
+    rows = [
+        {"device": 7, "user": "a|b"},
+        {"device": 7, "user": "a"},
+        {"device": 2**40, "user": ""},
+    ]
+    keys = serializer.encode_rows(rows)
+    assert keys == serializer.encode_columns(pd.DataFrame(rows))
+    assert keys == [serializer.encode(row) for row in rows]
+    assert len(set(keys)) == 3
+    # Fixed-width integer, then a length-prefixed string
+    assert keys[1] == (7).to_bytes(8, "little") + (1).to_bytes(4, "little") + b"a"
+    assert serializer.encode({"device": 7.0, "user": "a"}) == keys[1]
+    # Null keys encode to no key, never to the key of a string like "None"
+    assert (
+        serializer.encode_rows(
+            [{"device": 7, "user": None}, {"device": 7, "user": "None"}]
+        )[0]
+        is None
+    )
+    assert serializer.encode({"device": np.nan, "user": "nan"}) is None
+
+    # Timestamp keys agree across datetime objects and naive or tz-aware columns
+    when = EntityKeySerializer(["at"], {"at": ValueType.UNIX_TIMESTAMP})
+    naive = pd.Series(pd.to_datetime(["2024-01-01 00:00"]))
+    assert (
+        when.encode({"at": datetime(2024, 1, 1)})
+        == when.encode_columns({"at": naive})[0]
+        == when.encode_columns({"at": naive.dt.tz_localize("UTC")})[0]
+        == when.encode({"at": pd.Timestamp("2024-01-01 09:00", tz="Asia/Seoul")})
+    )
+    try:
+        serializer.encode({"device": 7.5, "user": "a"})
+        assert False, "lossy key cast was accepted"
+    except ValueError:
+        pass
+
+    # Stores with composite keys find rows through the encoded keys
+    driver = Entity(name="driver_id", value_type=ValueType.INT64)
+    city = Entity(name="city_id", value_type=ValueType.STRING)
+    fv = FeatureView(
+        name="driver_city",
+        entities=[driver, city],
+        features=[Feature(name="trips", dtype=ValueType.INT64)],
+        source=FileSource(name="unused", path="unused.parquet"),
+    )
+    store = MemoryOnlineStore()
+    store.write_features(
+        fv,
+        pd.DataFrame(
+            {"driver_id": [1, 1, 2], "city_id": ["x", "y", "x"], "trips": [10, 20, 30]}
+        ),
+    )
+    result = store.read_features(
+        fv, [{"driver_id": 1, "city_id": "y"}, {"driver_id": 2, "city_id": "x"}]
+    )
+    assert result["trips"].tolist() == [20, 30]
+
+    # A single typed join key is normalized too, as in the other stores
+    store.write_features(
+        _driver_feature_view(),
+        pd.DataFrame(
+            {
+                "driver_id": [1001],
+                "conv_rate": [0.5],
+                "avg_daily_trips": [10],
+                "city": ["seoul"],
+                "event_timestamp": [datetime.now()],
+            }
+        ),
+    )
+    result = store.read_features(
+        _driver_feature_view(), [{"driver_id": "1001"}, {"driver_id": None}]
+    )
+    assert result["avg_daily_trips"].tolist()[0] == 10
+    # Reading a null key is a miss; writing one is an error
+    assert pd.isna(result["avg_daily_trips"].tolist()[1])
+    try:
+        store.write_features(
+            _driver_feature_view(),
+            pd.DataFrame(
+                {
+                    "driver_id": [None],
+                    "conv_rate": [0.5],
+                    "avg_daily_trips": [10],
+                    "city": ["seoul"],
+                    "event_timestamp": [datetime.now()],
+                }
+            ),
+        )
+        assert False, "null join key was written"
+    except ValueError:
+        pass
+
+    print("✓ Entity keys are typed, compact and unambiguous")
+
+
+def test_retrieval_plans_are_cached_per_registry_version():
+    """Test that retrieval plans are compiled once and refreshed on apply"""
+    print("Testing retrieval plan cache...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "driver_stats.parquet")
+        pd.DataFrame({"driver_id": [1001]}).to_parquet(path)
+        driver = Entity(name="driver_id", value_type=ValueType.INT64)
+        fv = _driver_feature_view(path)
+        service = FeatureService(
+            name="driver_service",
+            features=["driver_stats:city", "driver_stats:conv_rate"],
+        )
+        store = FeatureStore(repo_path=tmp_dir)
+        store.apply([driver, fv, service])
+
+        features = ["driver_stats:avg_daily_trips", "driver_stats:city"]
+        plan = store.get_retrieval_plan(features)
+        assert store.get_retrieval_plan(list(features)) is plan
+        assert plan.output_columns == ["avg_daily_trips", "city"]
+        assert plan.views[0].feature_indices == [1, 2]
+        assert plan.join_keys == ["driver_id"]
+
+        service_plan = store.get_retrieval_plan([], feature_service=service)
+        assert store.get_retrieval_plan([], feature_service=service) is service_plan
+        assert service_plan.output_columns == ["city", "conv_rate"]
+        # An equal service rebuilt per request reuses the plan, while a
+        # service of the same name with other features gets its own
+        rebuilt = FeatureService(name="driver_service", features=list(service.features))
+        assert store.get_retrieval_plan([], feature_service=rebuilt) is service_plan
+        changed = FeatureService(name="driver_service", features=["driver_stats:city"])
+        changed_plan = store.get_retrieval_plan([], feature_service=changed)
+        assert changed_plan.output_columns == ["city"]
+
+        # A registry change invalidates cached plans
+        fv.features.append(Feature(name="rating", dtype=ValueType.DOUBLE))
+        store.apply([fv])
+        new_plan = store.get_retrieval_plan(features)
+        assert new_plan is not plan
+        assert store.get_retrieval_plan(["driver_stats:rating"]).views[
+            0
+        ].feature_indices == [3]
+
+        try:
+            store.get_retrieval_plan(["driver_stats:missing"])
+            assert False, "unknown feature was planned"
+        except ValueError:
+            pass
+        store.teardown()
+
+    print("✓ Retrieval plans are cached per registry version")
+
+
+def test_online_features_fan_out_across_views():
+    """Test concurrent feature view reads with positional assembly"""
+    print("Testing online fan-out...")
+
+    import time
+    from my_feast.config import FeatureStoreConfig
+    from my_feast.online_store import MemoryOnlineStore
+
+    class SlowStore(MemoryOnlineStore):
+        def read_feature_columns(self, *args, **kwargs):
+            time.sleep(0.2)
+            return super().read_feature_columns(*args, **kwargs)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "driver_stats.parquet")
+        pd.DataFrame({"driver_id": [1001]}).to_parquet(path)
+        driver = Entity(name="driver_id", value_type=ValueType.INT64)
+        stats = _driver_feature_view(path)
+        ratings = FeatureView(
+            name="driver_ratings",
+            entities=[driver],
+            features=[
+                Feature(name="rating", dtype=ValueType.INT64),
+                Feature(name="city", dtype=ValueType.STRING),
+            ],
+            source=FileSource(name="ratings", path=path),
+        )
+        config = FeatureStoreConfig(serving_fan_out="thread", serving_max_workers=4)
+        store = FeatureStore(repo_path=tmp_dir, config=config)
+        store.apply([driver, stats, ratings])
+        store.online_store = SlowStore()
+        store.online_store.write_features(
+            stats,
+            pd.DataFrame(
+                {
+                    "driver_id": [1001, 1002],
+                    "conv_rate": [0.5, 0.6],
+                    "avg_daily_trips": [10, 20],
+                    "city": ["seoul", "busan"],
+                    "event_timestamp": [datetime.now()] * 2,
+                }
+            ),
+        )
+        store.online_store.write_features(
+            ratings,
+            pd.DataFrame({"driver_id": [1002], "rating": [5], "city": ["ulsan"]}),
+        )
+
+        # Duplicate and unknown entities keep their positions
+        entity_rows = [{"driver_id": i} for i in (1002, 9999, 1001, 1002)]
+        features = ["driver_stats:avg_daily_trips", "driver_ratings:rating"]
+        start = time.perf_counter()
+        result = store.get_online_features(features, entity_rows)
+        elapsed = time.perf_counter() - start
+        assert elapsed < 0.35, f"views were read one after another ({elapsed:.2f}s)"
+        assert result["driver_id"].tolist() == [1002, 9999, 1001, 1002]
+        assert result["avg_daily_trips"].tolist()[2:] == [10, 20]
+        assert result["rating"].isna().tolist() == [False, True, True, False]
+
+        # Features sharing a name are kept apart by their feature view
+        result = store.get_online_features_dict(
+            ["driver_stats:city", "driver_ratings:city"], entity_rows[:1]
+        )
+        assert result["driver_stats:city"] == ["busan"]
+        assert result["driver_ratings:city"] == ["ulsan"]
+        store.teardown()
+
+    print("✓ Online reads fan out across feature views")
+
+
+def test_async_push_and_online_features():
+    """Test the async FeatureStore API over native asyncio Redis connections"""
+    print("Testing async online API...")
+
+    from my_feast.online_store import RedisOnlineStore
+
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _FakeRedisHandler)
+    server.daemon_threads = True
+    server.data, server.lock = {}, threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "driver_stats.parquet")
+            pd.DataFrame({"driver_id": [1001]}).to_parquet(path)
+            driver = Entity(name="driver_id", value_type=ValueType.INT64)
+            stats = _driver_feature_view(path)
+            store = FeatureStore(repo_path=tmp_dir)
+            store.apply([driver, stats])
+            store.online_store = RedisOnlineStore(
+                port=server.server_address[1], key_prefix="async"
+            )
+
+            async def serve():
+                await store.push_async(
+                    "driver_stats",
+                    pd.DataFrame(
+                        {
+                            "driver_id": [1001, 1002],
+                            "conv_rate": [0.5, 0.6],
+                            "avg_daily_trips": [10, 20],
+                            "city": ["seoul", "busan"],
+                            "event_timestamp": [datetime.now()] * 2,
+                        }
+                    ),
+                )
+                entity_rows = [{"driver_id": i} for i in (1002, 9999, 1001)]
+                return await asyncio.gather(
+                    *(
+                        store.get_online_features_dict_async(
+                            ["driver_stats:avg_daily_trips", "driver_stats:city"],
+                            entity_rows,
+                        )
+                        for _ in range(8)
+                    )
+                )
+
+            results = asyncio.run(serve())
+            for result in results:
+                assert result["avg_daily_trips"][::2] == [20, 10]
+                assert pd.isna(result["avg_daily_trips"][1])
+                assert result["city"] == ["busan", None, "seoul"]
+            assert store.online_store.get_metadata()["open_async_connections"] >= 1
+            # The sync and async paths share the stored layout
+            sync_result = store.get_online_features(
+                ["driver_stats:avg_daily_trips"], [{"driver_id": 1001}]
+            )
+            assert sync_result["avg_daily_trips"].tolist() == [10]
+
+            try:
+                asyncio.run(store.push_async("missing_view", pd.DataFrame()))
+                assert False, "push to an unknown view should fail"
+            except ValueError:
+                pass
+
+            # Large memory writes and registry reloads stay off the event loop
+            from my_feast.online_store import MemoryOnlineStore
+
+            store.online_store = MemoryOnlineStore()
+            blocking_threads = []
+
+            def record(method):
+                def wrapper(*args):
+                    blocking_threads.append(threading.current_thread())
+                    return method(*args)
+
+                return wrapper
+
+            store.online_store.write_features = record(
+                store.online_store.write_features
+            )
+            store.registry.get_version = record(store.registry.get_version)
+            rows = MemoryOnlineStore.ASYNC_INLINE_MAX_ROWS + 1
+
+            async def serve_cold():
+                store.registry._invalidate_cache()
+                await store.push_async(
+                    "driver_stats",
+                    pd.DataFrame(
+                        {
+                            "driver_id": range(rows),
+                            "conv_rate": [0.5] * rows,
+                            "avg_daily_trips": [10] * rows,
+                            "city": ["seoul"] * rows,
+                            "event_timestamp": [datetime.now()] * rows,
+                        }
+                    ),
+                )
+                store.registry._invalidate_cache()
+                df = await store.get_online_features_async(
+                    ["driver_stats:avg_daily_trips"], [{"driver_id": 7}]
+                )
+                return threading.current_thread(), df
+
+            loop_thread, df = asyncio.run(serve_cold())
+            assert df["avg_daily_trips"].tolist() == [10]
+            assert blocking_threads and loop_thread not in blocking_threads
+            store.teardown()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("✓ Async pushes and reads share one event loop")
+
+
+def test_online_request_coalescing():
+    """Test micro-batching of concurrent single-entity online requests"""
+    print("Testing online request coalescing...")
+
+    from my_feast.config import FeatureStoreConfig
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "driver_stats.parquet")
+        pd.DataFrame({"driver_id": [1001]}).to_parquet(path)
+        driver = Entity(name="driver_id", value_type=ValueType.INT64)
+        stats = _driver_feature_view(path)
+        config = FeatureStoreConfig(
+            serving_coalesce_window_us=50_000, serving_coalesce_max_entities=8
+        )
+        store = FeatureStore(repo_path=tmp_dir, config=config)
+        store.apply([driver, stats])
+        driver_ids = list(range(1, 17))
+        store.online_store.write_features(
+            stats,
+            pd.DataFrame(
+                {
+                    "driver_id": driver_ids,
+                    "conv_rate": [0.5] * 16,
+                    "avg_daily_trips": [i * 10 for i in driver_ids],
+                    "city": [f"city_{i}" for i in driver_ids],
+                    "event_timestamp": [datetime.now()] * 16,
+                }
+            ),
+        )
+
+        barrier = threading.Barrier(len(driver_ids))
+
+        def lookup(driver_id):
+            barrier.wait()
+            return store.get_online_features_dict(
+                ["driver_stats:avg_daily_trips", "driver_stats:city"],
+                [{"driver_id": driver_id}],
+            )
+
+        with ThreadPoolExecutor(max_workers=len(driver_ids)) as executor:
+            results = list(executor.map(lookup, driver_ids))
+
+        # Every caller gets its own entity back
+        for driver_id, result in zip(driver_ids, results):
+            assert result["driver_id"] == [driver_id]
+            assert result["avg_daily_trips"] == [driver_id * 10]
+            assert result["city"] == [f"city_{driver_id}"]
+
+        metadata = store.get_metadata()["coalescer"]
+        assert metadata["requests"] == 16
+
+        # A malformed request fails on its own, with its own row index
+        def lookup_rows(rows):
+            barrier.wait()
+            try:
+                return store.get_online_features_dict(
+                    ["driver_stats:avg_daily_trips"], rows
+                )
+            except ValueError as e:
+                return e
+
+        barrier = threading.Barrier(2)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            valid, malformed = executor.map(
+                lookup_rows, [[{"driver_id": 1}], [{"driver": 1}]]
+            )
+        assert valid["avg_daily_trips"] == [10]
+        assert str(malformed) == "Entity row 0 missing join key 'driver_id'"
+        assert metadata["batches"] < 16, metadata
+        store.teardown()
+
+    print("✓ Concurrent online requests are coalesced")
+
+
 if __name__ == "__main__":
     test_basic_functionality()
+    test_point_in_time_join_matches_reference()
+    test_historical_features_respect_ttl()
+    test_file_source_read_pushdown()
+    test_file_source_partitioned_directory()
+    test_memory_online_store_columnar_layout()
+    test_registry_cache_detects_changes()
+    test_materialize_incremental_uses_watermarks()
+    test_materialization_isolates_failures()
+    test_streaming_materialization_keeps_latest_rows()
+    test_latest_row_positions_breaks_ties()
+    test_sqlite_online_store_survives_restart()
+    test_redis_online_store_against_fake_server()
+    test_memory_online_store_snapshot_roundtrip()
+    test_memory_online_store_ttl_expiry()
+    test_memory_online_store_bounded_capacity()
+    test_tiered_online_store_reads_through()
+    test_tiered_online_store_read_through_races_write()
+    test_memory_online_store_lock_free_reads()
+    test_entity_key_serializer_is_typed_and_unambiguous()
+    test_retrieval_plans_are_cached_per_registry_version()
+    test_online_features_fan_out_across_views()
+    test_async_push_and_online_features()
+    test_online_request_coalescing()